@@ -0,0 +1,153 @@
+"""Synthetic catalog generator for benchmarks.
+
+Catalogs mimic a real modpack: a minority of library mods that many others
+depend on, with dependency targets picked by a power law so a few core
+libraries have thousands of dependents while most have a handful, and content
+mods spread over many categories. Generation is seeded, so a size and a seed
+always produce the same catalog.
+
+Run directly to write a database or a JSON export::
+
+    python benchmarks/generate.py 10000 --output catalog.db
+    python benchmarks/generate.py 10000 --output catalog.json
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+SIZES = (1_000, 10_000, 50_000)
+
+# Share of mods that are libraries other mods depend on
+LIBRARY_SHARE = 0.15
+# Share of content mods that are add-ons of another content mod
+ADDON_SHARE = 0.05
+# Exponent of the power law used to pick dependency targets
+POWER_LAW_EXPONENT = 1.2
+
+_WORDS = (
+    "iron", "quark", "create", "botania", "fabric", "sodium", "lithium", "tech", "magic", "storage",
+    "world", "biome", "ore", "farm", "craft", "mob", "sky", "nether", "end", "cave",
+    "tool", "armor", "food", "decor", "light", "map", "chat", "sound", "tweak", "core",
+)  # fmt: skip
+
+
+def _name(rng: random.Random, index: int, kind: str) -> str:
+    return f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()} {kind} {index}"
+
+
+def _power_law_cumulative(count: int) -> list[float]:
+    """Cumulative power-law weights, so a pick is one bisection."""
+    return list(itertools.accumulate(1 / (rank + 1) ** POWER_LAW_EXPONENT for rank in range(count)))
+
+
+def _pick(rng: random.Random, cumulative: list[float], limit: int) -> int:
+    """Pick an index below ``limit``, lower indexes being far more likely."""
+    return bisect.bisect_right(cumulative, rng.random() * cumulative[limit - 1], 0, limit - 1)
+
+
+def _dependency_count(rng: random.Random, mean: float) -> int:
+    # Geometric distribution: most mods need one or two libraries, a few need many
+    count = 0
+    while rng.random() < mean / (mean + 1):
+        count += 1
+    return count
+
+
+def generate_catalog(mod_count: int, seed: int = 0, category_count: int | None = None) -> dict:
+    """Return a catalog in the JSON export layout."""
+    rng = random.Random(seed)
+    category_count = category_count or max(20, mod_count // 100)
+    categories = [f"Category {index}" for index in range(category_count)]
+    category_weights = _power_law_cumulative(category_count)
+
+    library_count = max(1, int(mod_count * LIBRARY_SHARE))
+    library_weights = _power_law_cumulative(library_count)
+    mods: list[dict] = []
+    for index in range(mod_count):
+        is_library = index < library_count
+        name = _name(rng, index, "Lib" if is_library else "Mod")
+        dependencies = set()
+        if is_library:
+            # Libraries only depend on more fundamental (lower-ranked) libraries, so the graph is acyclic
+            if index:
+                for _ in range(_dependency_count(rng, 0.6)):
+                    dependencies.add(mods[_pick(rng, library_weights, index)]["name"])
+        else:
+            for _ in range(_dependency_count(rng, 1.5)):
+                dependencies.add(mods[_pick(rng, library_weights, library_count)]["name"])
+            if index > library_count and rng.random() < ADDON_SHARE:
+                dependencies.add(mods[rng.randrange(library_count, index)]["name"])
+
+        filename = name.lower().replace(" ", "-") + f"-1.{rng.randrange(20)}.{rng.randrange(10)}.jar"
+        mods.append(
+            {
+                "name": name,
+                "filename": filename,
+                "sha256": rng.randbytes(32).hex(),
+                "is_translated": rng.random() < 0.3,
+                "client_required": rng.random() < 0.9,
+                "server_required": rng.random() < 0.7,
+                "notes": rng.choice(("", "", "", "needs config", "known issue with shaders")),
+                "categories": ["Library"]
+                if is_library
+                else rng.choices(categories, cum_weights=category_weights, k=1 + (rng.random() < 0.1)),
+                "dependencies": sorted(dependencies),
+            }
+        )
+
+    rng.shuffle(mods)
+    for mod in mods:
+        mod["categories"] = sorted(set(mod["categories"]))
+    return {"categories": [{"name": name} for name in ["Library", *categories]], "mods": mods}
+
+
+def build_database(path: Path | str, mod_count: int, seed: int = 0) -> dict:
+    """Create a fresh SQLite database at ``path`` holding a generated catalog and return the catalog."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from database import Base
+    from exchange import import_catalog
+
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    catalog = generate_catalog(mod_count, seed)
+    engine = create_engine(f"sqlite:///{path.as_posix()}")
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            import_catalog(db, catalog)
+    finally:
+        engine.dispose()
+    return catalog
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog.")
+    parser.add_argument("mods", type=int, help="number of mods")
+    parser.add_argument("--output", required=True, help="a .db file or a .json export")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.output.endswith(".json"):
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(generate_catalog(args.mods, args.seed), f, ensure_ascii=False)
+    else:
+        import models  # noqa: F401 (registers the tables)
+
+        build_database(args.output, args.mods, args.seed)
+    print(f"Wrote {args.mods} mods to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
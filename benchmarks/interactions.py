@@ -0,0 +1,178 @@
+"""Interaction latency benchmarks for the main window.
+
+``MainWindow`` runs on Qt's offscreen platform against generated catalogs, and
+scripted user interactions are timed from the input event until the event
+queue is drained, which includes the repaint. Latencies are reported as p50
+and p95 per interaction::
+
+    python benchmarks/interactions.py --sizes 1000 5000
+    python benchmarks/interactions.py --compare benchmarks/results/<earlier run>.json
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import TypeVar
+
+from generate import build_database
+from run import git_commit, output_path, print_comparison, workspace, write_report
+
+SIZES = (1_000, 5_000)
+DEFAULT_ROUNDS = 5
+# Typed into the search box one key at a time, then erased with backspace
+SEARCH_TEXT = "lib 12"
+
+T = TypeVar("T")
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+class InteractionRecorder:
+    """Times interactions until the Qt event queue is idle."""
+
+    def __init__(self, app):
+        self.app = app
+        self.samples: dict[str, list[float]] = {}
+
+    def record(self, name: str, action: Callable[[], T]) -> T:
+        """Time ``action`` and return its result."""
+        self.app.processEvents()
+        start = time.perf_counter()
+        result = action()
+        self.app.processEvents()
+        self.samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        return result
+
+    def summary(self) -> dict:
+        return {name: summarize(samples) for name, samples in self.samples.items()}
+
+
+def script_interactions(rounds: int, seed: int) -> dict:
+    """Open the main window and play the scripted interactions ``rounds`` times."""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtTest import QTest
+    from PyQt6.QtWidgets import QApplication
+
+    from main import MainWindow, ModDialog
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    recorder = InteractionRecorder(app)
+    rng = random.Random(seed)
+
+    def open_window() -> MainWindow:
+        window = MainWindow()
+        window.show()
+        return window
+
+    # The stubs declare QTest's static functions as instance methods
+    key_click: Callable[..., None] = QTest.keyClick
+    mouse_click: Callable[..., None] = QTest.mouseClick
+
+    window = recorder.record("open_main_window", open_window)
+    try:
+        for _ in range(rounds):
+            window.search_edit.setFocus()
+            for char in SEARCH_TEXT:
+                recorder.record("search_keystroke", partial(key_click, window.search_edit, char))
+            for _ in SEARCH_TEXT:
+                recorder.record("search_backspace", lambda: key_click(window.search_edit, Qt.Key.Key_Backspace))
+
+            category_index = rng.randrange(1, window.category_filter.count())
+            recorder.record("select_category", partial(window.category_filter.setCurrentIndex, category_index))
+            recorder.record("select_all_categories", lambda: window.category_filter.setCurrentIndex(0))
+
+            recorder.record("expand_dependencies", lambda: mouse_click(window.expand_button, Qt.MouseButton.LeftButton))
+            # Open the dependencies of a mod near the top of the tree, then close them again
+            model = window.dependency_model
+            expandable = [
+                model.index(row, 0) for row in range(model.rowCount()) if model.hasChildren(model.index(row, 0))
+            ]
+            if expandable:
+                node = rng.choice(expandable[:20])
+                recorder.record("expand_tree_node", partial(window.dependency_tree.expand, node))
+                recorder.record("collapse_tree_node", partial(window.dependency_tree.collapse, node))
+            recorder.record(
+                "collapse_dependencies", lambda: mouse_click(window.expand_button, Qt.MouseButton.LeftButton)
+            )
+
+            item = window.mod_table.item(rng.randrange(window.mod_table.rowCount()), 0)
+            assert item is not None
+            mod_name = item.text()
+
+            def open_edit_dialog(mod_name: str = mod_name) -> ModDialog:
+                # What MainWindow.edit_mod does before the dialog's event loop starts
+                dialog = ModDialog(window, window.catalog.mod(mod_name))
+                dialog.show()
+                return dialog
+
+            def open_add_dialog() -> ModDialog:
+                dialog = ModDialog(window)
+                dialog.show()
+                return dialog
+
+            for name, action in (("open_edit_dialog", open_edit_dialog), ("open_add_dialog", open_add_dialog)):
+                dialog = recorder.record(name, action)
+                dialog.reject()
+                dialog.deleteLater()
+                app.processEvents()
+    finally:
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+    return recorder.summary()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time scripted main window interactions on generated catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="numbers of mods")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="times each interaction is played")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="result file (default: results/<date>-interactions-<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with an earlier result file")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    output = output_path(args.output, "interactions", commit)
+    baseline = Path(args.compare).resolve() if args.compare else None
+
+    results = {}
+    with workspace():
+        from database import DATABASE_PATH, engine
+
+        for size in args.sizes:
+            print(f"Generating {size} mods...", file=sys.stderr)
+            engine.dispose()
+            build_database(DATABASE_PATH, size, args.seed)
+            results[str(size)] = interactions = script_interactions(args.rounds, args.seed)
+            for name, summary in interactions.items():
+                print(
+                    f"  {name:<24} p50 {summary['p50_ms']:>10.1f} ms  p95 {summary['p95_ms']:>10.1f} ms",
+                    file=sys.stderr,
+                )
+        engine.dispose()
+
+    report = write_report(output, commit, results, rounds=args.rounds, seed=args.seed)
+    print_comparison(baseline, report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
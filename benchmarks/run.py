@@ -0,0 +1,315 @@
+"""Benchmark runner for the catalog hot paths.
+
+Every size gets a freshly generated catalog in a temporary directory. Each hot
+path is run ``--repeat`` times and its timings are written to a JSON file named
+after the current commit, so two runs can be compared::
+
+    python benchmarks/run.py --sizes 1000 10000
+    python benchmarks/run.py --compare benchmarks/results/<earlier run>.json
+
+The GUI paths run on Qt's offscreen platform and are skipped for catalogs
+larger than ``--gui-limit``.
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from generate import SIZES, build_database
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCHMARK_DIR / "results"
+DEFAULT_REPEAT = 3
+DEFAULT_GUI_LIMIT = 10_000
+# Slowdowns above this ratio are reported as regressions
+REGRESSION_RATIO = 1.10
+COMPARED_METRICS = ("median_ms", "p50_ms", "p95_ms", "peak_kb", "retained_kb")
+
+
+def measure(
+    function: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None, memory=None
+) -> dict:
+    """Run ``function`` ``repeat`` times and summarize the wall times in milliseconds.
+
+    With a ``memprofile.MemoryProfiler`` as ``memory``, one more run is made
+    under ``tracemalloc`` for the peak and retained memory; it is not timed,
+    since tracing slows everything down.
+    """
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        runs.append((time.perf_counter() - start) * 1000)
+    result = {
+        "median_ms": round(statistics.median(runs), 3),
+        "min_ms": round(min(runs), 3),
+        "max_ms": round(max(runs), 3),
+        "runs_ms": [round(run, 3) for run in runs],
+    }
+    if memory:
+        if setup:
+            setup()
+        try:
+            with memory.track("benchmark") as reports:
+                function()
+        finally:
+            memory.stop()
+        report = reports[0]
+        result["peak_kb"] = report.peak_bytes // 1024
+        result["retained_kb"] = report.retained_bytes // 1024
+        if report.rss_delta_bytes is not None:
+            result["rss_delta_kb"] = report.rss_delta_bytes // 1024
+    return result
+
+
+@contextmanager
+def workspace() -> Iterator[Path]:
+    """Run the application against a temporary working directory and database.
+
+    Must be entered before the application modules are imported, because the
+    database engine is created at import time.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="mmdm-bench-") as workdir:
+        # The application keeps its database, mods folder and config in the working directory
+        os.chdir(workdir)
+        os.environ["MMDM_DATABASE"] = str(Path(workdir) / "benchmark.db")
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        try:
+            yield Path(workdir)
+        finally:
+            os.chdir(cwd)
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def headless_cases(repeat: int, memory=None) -> dict:
+    """Time the paths shared by the GUI and the command line."""
+    from database import SessionLocal
+    from exchange import FORMAT_INDENTED, export_catalog, import_catalog_file, merge_catalog
+    from services import dependency_tree
+    from translations import TRANSLATIONS
+
+    default_category = TRANSLATIONS["en"]["label_uncategorized"]
+    results = {}
+    with SessionLocal() as db:
+        export = io.StringIO()
+
+        def export_json():
+            export.seek(0)
+            export.truncate()
+            export_catalog(db, export, default_category, FORMAT_INDENTED)
+
+        results["export_json"] = measure(export_json, repeat, memory=memory)
+        data = export.getvalue().encode("utf-8")
+        document = json.loads(data)
+
+        results["export_dependency_tree"] = measure(lambda: dependency_tree(db), repeat, memory=memory)
+        # Importing the catalog it was exported from leaves nothing to merge
+        results["merge_json"] = measure(lambda: merge_catalog(db, document), repeat, memory=memory)
+        results["import_json"] = measure(lambda: import_catalog_file(db, io.BytesIO(data)), repeat, memory=memory)
+    return results
+
+
+def gui_cases(repeat: int, memory=None) -> dict:
+    """Time the main window paths that scale with the catalog size."""
+    from PyQt6.QtWidgets import QApplication
+
+    from main import MainWindow, ModDialog
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = MainWindow()
+    try:
+        # A cold load: the window would otherwise reuse the records it cached
+        results = {"load_mods": measure(window.load_mods, repeat, setup=window.catalog.invalidate, memory=memory)}
+
+        # Changing the search text filters the table through the textChanged signal
+        results["filter_mods"] = measure(
+            lambda: window.search_edit.setText("lib"),
+            repeat,
+            setup=lambda: window.search_edit.setText(""),
+            memory=memory,
+        )
+
+        def expand_dependencies():
+            window.expand_button.setChecked(True)
+            window.toggle_dependencies()
+
+        def collapse_dependencies():
+            window.expand_button.setChecked(False)
+            window.toggle_dependencies()
+
+        results["expand_dependencies"] = measure(
+            expand_dependencies, repeat, setup=collapse_dependencies, memory=memory
+        )
+        collapse_dependencies()
+
+        def open_mod_dialog():
+            dialog = ModDialog(window)
+            dialog.deleteLater()
+
+        results["open_mod_dialog"] = measure(open_mod_dialog, repeat, memory=memory)
+    finally:
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+    return results
+
+
+def run(sizes: list[int], repeat: int, gui_limit: int, seed: int, memory: bool = False) -> dict:
+    from database import DATABASE_PATH, engine
+    from memprofile import MemoryProfiler
+
+    profiler = MemoryProfiler() if memory else None
+
+    results = {}
+    for size in sizes:
+        print(f"Generating {size} mods...", file=sys.stderr)
+        engine.dispose()
+        build_database(DATABASE_PATH, size, seed)
+        results[str(size)] = cases = headless_cases(repeat, profiler)
+        if size <= gui_limit:
+            cases.update(gui_cases(repeat, profiler))
+        for name, timing in cases.items():
+            peak = f"  peak {timing['peak_kb']:>9} KB" if "peak_kb" in timing else ""
+            print(f"  {name:<24} {timing['median_ms']:>12.1f} ms{peak}", file=sys.stderr)
+    engine.dispose()
+    return results
+
+
+def output_path(output: str | None, kind: str, commit: str | None) -> Path:
+    if output:
+        return Path(output).resolve()
+    return RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{kind}-{commit or 'unknown'}.json"
+
+
+def write_report(output: Path, commit: str | None, results: dict, **settings) -> dict:
+    """Write results with the commit and machine they were measured on."""
+    report = {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **settings,
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+    return report
+
+
+def compare(old: dict, new: dict) -> list[str]:
+    """Report the change of every summary timing present in both result files."""
+    lines = [f"{old['commit'] or '?'} -> {new['commit'] or '?'}"]
+    for size, cases in new["results"].items():
+        for name, timing in cases.items():
+            before = old["results"].get(size, {}).get(name)
+            if not before:
+                continue
+            for metric in COMPARED_METRICS:
+                if metric not in timing or metric not in before:
+                    continue
+                ratio = timing[metric] / before[metric] if before[metric] else float("inf")
+                flag = "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+                label, unit = metric.rsplit("_", 1)
+                lines.append(
+                    f"{size:>7} {name:<24} {label:<8} {before[metric]:>12.1f} ->"
+                    f" {timing[metric]:>12.1f} {unit} ({ratio:.2f}x){flag}"
+                )
+    return lines
+
+
+def parse_budgets(values: list[str]) -> dict[str, float]:
+    """Parse ``CASE=MB`` arguments."""
+    budgets = {}
+    for value in values:
+        name, _, megabytes = value.partition("=")
+        try:
+            budgets[name] = float(megabytes)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected CASE=MB, got {value!r}") from None
+    return budgets
+
+
+def check_budgets(results: dict, budgets: dict[str, float]) -> list[str]:
+    """Return a line for every case whose peak memory exceeded its budget."""
+    failures = []
+    for size, cases in results.items():
+        for name, budget in budgets.items():
+            peak_kb = cases.get(name, {}).get("peak_kb")
+            if peak_kb is not None and peak_kb > budget * 1024:
+                failures.append(f"{size:>7} {name:<24} peak {peak_kb / 1024:.1f} MB > budget {budget:g} MB")
+    return failures
+
+
+def print_comparison(baseline: Path | None, report: dict):
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            print("\n".join(compare(json.load(f), report)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the catalog hot paths on generated catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="numbers of mods")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--gui-limit", type=int, default=DEFAULT_GUI_LIMIT, help="largest size timed in the GUI")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="result file (default: results/<date>-hot-paths-<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with an earlier result file")
+    parser.add_argument("--memory", action="store_true", help="also measure peak and retained memory")
+    parser.add_argument(
+        "--memory-budget",
+        metavar="CASE=MB",
+        action="append",
+        default=[],
+        help="fail when the peak memory of a case exceeds MB (implies --memory)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        budgets = parse_budgets(args.memory_budget)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    commit = git_commit()
+    output = output_path(args.output, "hot-paths", commit)
+    baseline = Path(args.compare).resolve() if args.compare else None
+
+    with workspace():
+        results = run(args.sizes, args.repeat, args.gui_limit, args.seed, memory=args.memory or bool(budgets))
+    report = write_report(output, commit, results, repeat=args.repeat, seed=args.seed)
+    print_comparison(baseline, report)
+
+    failures = check_budgets(results, budgets)
+    if failures:
+        print("Memory budget exceeded:\n" + "\n".join(failures), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,169 @@
+import argparse
 import glob
 import os
+import pkgutil
+import re
 import shutil
+import statistics
+import subprocess
 import sys
+import tempfile
+import time
 
 import PyInstaller.__main__
 
+# Lean profile: Qt plugin folders the widgets application loads at run time
+LEAN_QT_PLUGINS = {
+    "platforms",
+    "platformthemes",
+    "platforminputcontexts",
+    "styles",
+    "iconengines",
+    "imageformats",
+    "generic",
+    "xcbglintegrations",
+    "egldeviceintegrations",
+    "wayland-decoration-client",
+    "wayland-graphics-integration-client",
+    "wayland-shell-integration",
+}
+# Only SQLite is used; PyInstaller's SQLAlchemy hook would bundle every dialect
+UNUSED_SQLALCHEMY_DIALECTS = ["mssql", "mysql", "oracle", "postgresql"]
+# Python modules that nothing in the application imports
+UNUSED_MODULES = ["tkinter", "unittest", "pydoc", "PyQt6.uic", "PyQt6.lupdate"]
 
-def build():
+# Start-up report of the application (see src/startup.py)
+STARTUP_FLAG = "--profile-startup"
+STARTUP_REPORT = "startup-profile.txt"
+STARTUP_TIMEOUT = 60
+
+
+def used_qt_modules(source_dir):
+    """Names of the PyQt6 modules imported anywhere in the sources, e.g. QtWidgets."""
+    modules = set()
+    for path in glob.glob(os.path.join(source_dir, "*.py")):
+        with open(path, encoding="utf-8") as f:
+            modules.update(re.findall(r"^\s*(?:from|import) PyQt6\.(Qt\w+)", f.read(), re.MULTILINE))
+    return modules
+
+
+def lean_args(source_dir):
+    """PyInstaller arguments that bundle only the Qt modules and SQLAlchemy dialect in use."""
+    import PyQt6
+
+    used = used_qt_modules(source_dir)
+    installed = {module.name for module in pkgutil.iter_modules(PyQt6.__path__) if module.name.startswith("Qt")}
+    args = [f"--hidden-import=PyQt6.{name}" for name in sorted(used)]
+    args += ["--hidden-import=PyQt6.sip", "--hidden-import=sqlalchemy.sql.default_comparator"]
+    args += [f"--exclude-module=PyQt6.{name}" for name in sorted(installed - used)]
+    args += [f"--exclude-module=sqlalchemy.dialects.{name}" for name in UNUSED_SQLALCHEMY_DIALECTS]
+    args += [f"--exclude-module={name}" for name in UNUSED_MODULES]
+    # Bytecode is compiled at build time with asserts stripped, and left uncompressed so it starts faster
+    args += ["--optimize=1", "--noupx"]
+    return args
+
+
+def prune_qt(dist_dir):
+    """Remove the Qt plugins and translations that the lean build does not load."""
+    removed = 0
+    for qt_dir in glob.glob(os.path.join(dist_dir, "**", "PyQt6", "Qt6"), recursive=True):
+        plugins_dir = os.path.join(qt_dir, "plugins")
+        candidates = [os.path.join(qt_dir, "translations")]
+        if os.path.isdir(plugins_dir):
+            candidates += [
+                os.path.join(plugins_dir, name) for name in os.listdir(plugins_dir) if name not in LEAN_QT_PLUGINS
+            ]
+        for path in candidates:
+            if os.path.isdir(path):
+                removed += directory_size(path)
+                shutil.rmtree(path)
+    return removed
+
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if not os.path.islink(file_path):
+                total += os.path.getsize(file_path)
+    return total
+
+
+def executable_path(dist_dir):
+    name = "manual-mmdm.exe" if sys.platform.startswith("win") else "manual-mmdm"
+    return os.path.join(dist_dir, name)
+
+
+def measure_cold_start(executable, runs=3):
+    """Seconds from launching the binary until its catalog is loaded, one per run.
+
+    Every run starts the application with an empty database in a fresh
+    directory and waits for the start-up report it writes once the catalog is
+    shown.
+    """
+    env = dict(os.environ)
+    if sys.platform.startswith("linux") and not (env.get("DISPLAY") or env.get("WAYLAND_DISPLAY")):
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as work_dir:
+            env["MMDM_DATABASE"] = os.path.join(work_dir, "manual-mmdm.db")
+            report_path = os.path.join(work_dir, STARTUP_REPORT)
+            start = time.perf_counter()
+            process = subprocess.Popen(
+                [executable, STARTUP_FLAG],
+                cwd=work_dir,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                while not os.path.exists(report_path):
+                    if process.poll() is not None:
+                        raise RuntimeError(f"{executable} exited with code {process.returncode} during start-up")
+                    if time.perf_counter() - start > STARTUP_TIMEOUT:
+                        raise RuntimeError(f"{executable} did not finish starting within {STARTUP_TIMEOUT} s")
+                    time.sleep(0.01)
+                timings.append(time.perf_counter() - start)
+            finally:
+                process.kill()
+                process.wait()
+    return timings
+
+
+def report(dist_dir, runs=3):
+    """Print the size of the bundle, its largest parts and its measured cold-start time."""
+    if not os.path.isdir(dist_dir):
+        print(f"No build found at {dist_dir}")
+        return
+    file_count = sum(len(files) for _, _, files in os.walk(dist_dir))
+    print(f"Bundle size: {directory_size(dist_dir) / 1024**2:.1f} MB in {file_count} files")
+    # Largest entries, looking inside the folder PyInstaller puts the dependencies in
+    internal_dir = os.path.join(dist_dir, "_internal")
+    top_dir = internal_dir if os.path.isdir(internal_dir) else dist_dir
+    sizes = []
+    for name in os.listdir(top_dir):
+        path = os.path.join(top_dir, name)
+        sizes.append((directory_size(path) if os.path.isdir(path) else os.path.getsize(path), name))
+    for size, name in sorted(sizes, reverse=True)[:10]:
+        print(f"  {size / 1024**2:8.1f} MB  {name}")
+
+    executable = executable_path(dist_dir)
+    if runs <= 0 or not os.path.exists(executable):
+        return
+    try:
+        timings = measure_cold_start(executable, runs)
+    except (OSError, RuntimeError) as e:
+        print(f"Cold start could not be measured: {e}")
+        return
+    print(
+        f"Cold start to loaded catalog: median {statistics.median(timings) * 1000:.0f} ms,"
+        f" min {min(timings) * 1000:.0f} ms over {len(timings)} runs"
+    )
+
+
+def build(lean=False, startup_runs=3):
     # Clean up dist and build directories
     for dir_name in ["dist", "build"]:
         if os.path.exists(dir_name):
@@ -30,26 +187,33 @@ def build():
         "--noconsole",
         "--clean",
         "-y",  # Auto-confirm removal of output directory
-        # Add hidden imports for PyQt6
-        "--hidden-import=PyQt6.QtCore",
-        "--hidden-import=PyQt6.QtGui",
-        "--hidden-import=PyQt6.QtWidgets",
-        "--hidden-import=PyQt6.sip",
-        # Add SQLAlchemy related imports
-        "--hidden-import=sqlalchemy.sql.default_comparator",
-        "--hidden-import=sqlalchemy.ext.baked",
-        # Collect all Qt plugins
-        "--collect-all=PyQt6",
-        # Output to spec file
-        f"--specpath={base_dir}",
     ]
+    if lean:
+        args.extend(lean_args(os.path.join(base_dir, "src")))
+    else:
+        args.extend(
+            [
+                # Add hidden imports for PyQt6
+                "--hidden-import=PyQt6.QtCore",
+                "--hidden-import=PyQt6.QtGui",
+                "--hidden-import=PyQt6.QtWidgets",
+                "--hidden-import=PyQt6.sip",
+                # Add SQLAlchemy related imports
+                "--hidden-import=sqlalchemy.sql.default_comparator",
+                "--hidden-import=sqlalchemy.ext.baked",
+                # Collect all Qt plugins
+                "--collect-all=PyQt6",
+            ]
+        )
+    # Output to spec file
+    args.append(f"--specpath={base_dir}")
 
     # Add data files - specify static folder explicitly
     data_args = [
         f"--add-data={static_dir}{separator}static",
     ]
 
-    if os.path.exists(".venv/Lib/site-packages/PyQt6/Qt6/plugins"):
+    if not lean and os.path.exists(".venv/Lib/site-packages/PyQt6/Qt6/plugins"):
         data_args.append(f"--add-data=.venv/Lib/site-packages/PyQt6/Qt6/plugins{separator}PyQt6/Qt6/plugins")
 
     # Add icon if it exists
@@ -86,8 +250,31 @@ def build():
     else:
         print("Warning: Static folder may not have been copied correctly")
 
+    if lean:
+        removed = prune_qt(dist_dir)
+        print(f"Removed {removed / 1024**2:.1f} MB of unused Qt plugins and translations")
+
     print("Build completed! Output can be found in the dist directory.")
+    report(dist_dir, startup_runs)
 
 
 if __name__ == "__main__":
-    build()
+    parser = argparse.ArgumentParser(description="Build the Manual-MMDM executable with PyInstaller.")
+    parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="bundle only the Qt modules, plugins and SQLAlchemy dialect the application uses",
+    )
+    parser.add_argument(
+        "--startup-runs",
+        type=int,
+        default=3,
+        metavar="N",
+        help="launches of the built binary to time its cold start (0 to skip)",
+    )
+    parser.add_argument("--report-only", action="store_true", help="report on the existing build without rebuilding")
+    args = parser.parse_args()
+    if args.report_only:
+        report(os.path.join(os.path.abspath(os.path.dirname(__file__)), "dist", "manual-mmdm"), args.startup_runs)
+    else:
+        build(args.lean, args.startup_runs)
@@ -0,0 +1,153 @@
+"""Database snapshots through the SQLite online backup API.
+
+``sqlite3.Connection.backup`` copies the database page by page in short steps,
+so a consistent snapshot can be taken while the application keeps using the
+database. Snapshots can be gzip-compressed, and only the newest ones are kept.
+"""
+
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+from collections.abc import Callable, Collection, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from database import DATABASE_PATH
+
+BACKUP_DIR = Path("backups")
+DEFAULT_KEEP = 10
+
+# Pages copied per backup step; other connections can use the database in between
+PAGES_PER_STEP = 1024
+
+SNAPSHOT_PREFIX = "manual-mmdm-"
+SNAPSHOT_SUFFIXES = (".db", ".db.gz")
+
+
+def list_snapshots(backup_dir: Path = BACKUP_DIR) -> list[Path]:
+    """Return the snapshots in ``backup_dir``, newest first."""
+    try:
+        with os.scandir(backup_dir) as entries:
+            snapshots = [
+                Path(entry.path)
+                for entry in entries
+                if entry.is_file() and entry.name.startswith(SNAPSHOT_PREFIX) and entry.name.endswith(SNAPSHOT_SUFFIXES)
+            ]
+    except FileNotFoundError:
+        return []
+    # The timestamp in the name sorts chronologically
+    return sorted(snapshots, key=lambda path: path.name, reverse=True)
+
+
+def rotate_snapshots(keep: int, backup_dir: Path = BACKUP_DIR, protect: Collection[Path] = ()) -> list[Path]:
+    """Delete all but the ``keep`` newest snapshots and return the deleted paths.
+
+    Snapshots in ``protect`` are never deleted, such as one about to be restored.
+    """
+    protected = {path.resolve() for path in protect}
+    removed = list_snapshots(backup_dir)[keep:] if keep > 0 else []
+    removed = [path for path in removed if path.resolve() not in protected]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def _copy(source: sqlite3.Connection, target: sqlite3.Connection, progress: Callable[[int, int], None] | None):
+    def on_step(_status, remaining, total):
+        if progress:
+            progress(total - remaining, total)
+
+    source.backup(target, pages=PAGES_PER_STEP, progress=on_step)
+
+
+def create_snapshot(
+    database: Path = DATABASE_PATH,
+    backup_dir: Path = BACKUP_DIR,
+    compress: bool = False,
+    keep: int = DEFAULT_KEEP,
+    progress: Callable[[int, int], None] | None = None,
+    protect: Collection[Path] = (),
+) -> Path:
+    """Copy the database into a new timestamped snapshot and return its path.
+
+    ``progress`` is called with the number of pages copied and the total after
+    each backup step. Snapshots in ``protect`` survive the rotation.
+    """
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    snapshot = backup_dir / f"{SNAPSHOT_PREFIX}{stamp}{'.db.gz' if compress else '.db'}"
+
+    # Write to a temporary file first so a failed backup never looks like a snapshot
+    fd, temp_name = tempfile.mkstemp(prefix=".incoming-", dir=backup_dir)
+    os.close(fd)
+    temp_path = Path(temp_name)
+    try:
+        source = sqlite3.connect(database)
+        target = sqlite3.connect(temp_path)
+        try:
+            _copy(source, target, progress)
+        finally:
+            target.close()
+            source.close()
+
+        if compress:
+            compressed = temp_path.with_name(temp_path.name + ".gz")
+            with open(temp_path, "rb") as f_in, gzip.open(compressed, "wb", compresslevel=6) as f_out:
+                shutil.copyfileobj(f_in, f_out, 1 << 20)
+            temp_path.unlink()
+            temp_path = compressed
+        os.replace(temp_path, snapshot)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    rotate_snapshots(keep, backup_dir, protect)
+    return snapshot
+
+
+@contextmanager
+def open_snapshot(snapshot: Path | str) -> Iterator[Path]:
+    """Yield the path of an uncompressed copy of a snapshot.
+
+    Compressed snapshots are decompressed to a temporary file that is removed
+    afterwards; plain snapshots are used in place.
+    """
+    snapshot = Path(snapshot)
+    if not snapshot.name.endswith(".gz"):
+        yield snapshot
+        return
+
+    fd, temp_name = tempfile.mkstemp(suffix=".db")
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "wb") as f_out, gzip.open(snapshot, "rb") as f_in:
+            shutil.copyfileobj(f_in, f_out, 1 << 20)
+        yield temp_path
+    except gzip.BadGzipFile as e:
+        raise sqlite3.DatabaseError(f"Snapshot is damaged: {e}") from None
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def restore_snapshot(
+    snapshot: Path | str,
+    target: sqlite3.Connection,
+    progress: Callable[[int, int], None] | None = None,
+):
+    """Replace the contents of the database behind ``target`` with a snapshot.
+
+    The snapshot is checked with ``PRAGMA quick_check`` before anything is
+    overwritten.
+    """
+    with open_snapshot(snapshot) as path:
+        source = sqlite3.connect(f"file:{path.as_posix()}?mode=ro", uri=True)
+        try:
+            result = source.execute("PRAGMA quick_check").fetchone()
+            if not result or result[0] != "ok":
+                raise sqlite3.DatabaseError(f"Snapshot is damaged: {result[0] if result else 'no result'}")
+            _copy(source, target, progress)
+        finally:
+            source.close()
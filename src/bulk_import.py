@@ -0,0 +1,120 @@
+"""Bulk import of a folder of mod jars.
+
+All jars are hashed and scanned in parallel, copied into the content store by
+a worker pool, and the mod rows, category links and detected dependency edges
+are inserted in one transaction.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+import store
+from models import Category, Mod, mod_category, mod_dependency
+from scanner import DependencyIndex, scan_jars
+
+
+@dataclass
+class FolderImportResult:
+    """Outcome of a folder import, by jar file name."""
+
+    imported: list[str] = field(default_factory=list)
+    # Jars whose mod name or file name is already in the catalog
+    skipped: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+
+def import_folder(
+    folder: Path | str, db: Session, category_name: str, max_workers: int | None = None
+) -> FolderImportResult:
+    """Import every jar in ``folder`` into ``category_name``."""
+    with os.scandir(folder) as entries:
+        jars = sorted(
+            (Path(entry.path) for entry in entries if entry.is_file() and entry.name.lower().endswith(".jar")),
+            key=lambda path: path.name.lower(),
+        )
+
+    result = FolderImportResult()
+    scanned = scan_jars(jars, db, max_workers=max_workers)
+
+    names = set(db.scalars(select(Mod.name)))
+    filenames = set(db.scalars(select(Mod.filename)))
+    planned = []
+    for path in jars:
+        sha256, metadata = scanned[path]
+        if sha256 is None:
+            result.failed.append(path.name)
+            continue
+        name = (metadata.name if metadata else None) or os.path.splitext(path.name)[0].replace("_", " ")
+        if name in names or path.name in filenames:
+            result.skipped.append(path.name)
+            continue
+        names.add(name)
+        filenames.add(path.name)
+        planned.append((path, sha256, name, metadata))
+
+    # Copy each distinct blob once
+    blobs = {sha256: path for path, sha256, _, _ in planned}
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) + 2)) as executor:
+        copies = {sha256: executor.submit(store.copy_blob, path, sha256) for sha256, path in blobs.items()}
+    failed_blobs = {sha256 for sha256, future in copies.items() if future.exception()}
+    for path, sha256, _, _ in planned:
+        if sha256 in failed_blobs:
+            result.failed.append(path.name)
+    planned = [entry for entry in planned if entry[1] not in failed_blobs]
+
+    if not planned:
+        return result
+
+    try:
+        category_id = db.scalar(select(Category.id).where(Category.name == category_name))
+        if category_id is None:
+            category_id = db.scalar(insert(Category).values(name=category_name).returning(Category.id))
+
+        db.execute(
+            insert(Mod),
+            [
+                {
+                    "name": name,
+                    "filename": path.name,
+                    "sha256": sha256,
+                    "is_translated": False,
+                    "client_required": True,
+                    "server_required": True,
+                    "notes": "",
+                }
+                for path, sha256, name, _ in planned
+            ],
+        )
+        ids = dict(db.execute(select(Mod.name, Mod.id)).all())
+
+        db.execute(
+            insert(mod_category), [{"mod_id": ids[name], "category_id": category_id} for _, _, name, _ in planned]
+        )
+
+        index = DependencyIndex(db)
+        edges: set[tuple[int, int]] = set()
+        for _, _, name, metadata in planned:
+            if metadata:
+                mod_pk = ids[name]
+                edges.update((mod_pk, dep_pk) for dep_pk, _ in index.resolve(metadata.dependencies) if dep_pk != mod_pk)
+        if edges:
+            db.execute(
+                insert(mod_dependency), [{"mod_id": mod_pk, "dependency_id": dep_pk} for mod_pk, dep_pk in edges]
+            )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        # Blobs copied by this import are not referenced by anything now
+        for sha256, future in copies.items():
+            if sha256 not in failed_blobs and future.result():
+                store.release(db, sha256)
+        raise
+
+    result.imported.extend(path.name for path, _, _, _ in planned)
+    return result
@@ -0,0 +1,145 @@
+"""Read-side cache of the catalog for a window and its dialogs.
+
+Reads go through one long-lived session instead of a new session per method,
+and their results are kept as plain projections: the mod table records, the
+mod names for the dependency picker, the category names and the edited mods
+by name, so reopening a dialog or refreshing a view reuses what is already
+loaded. Nothing returned here may be modified.
+
+Writes keep their own short sessions. Every commit through ``SessionLocal``
+drops the projections, in whichever thread it happens, and the next read
+starts a fresh session; writes that bypass the ORM, such as restoring a
+snapshot, call ``invalidate`` themselves. Changes made by another process show
+up after the next commit in this one.
+
+SQLAlchemy is imported on first use, so creating the cache is free.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, TypeVar, cast
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from services import ModRecord
+
+T = TypeVar("T")
+
+
+class CatalogCache:
+    def __init__(self):
+        self._projections: dict[tuple, object] = {}
+        # Counts invalidations, so a result read before a commit elsewhere is not kept
+        self._generation = 0
+        self._session: Session | None = None
+        self._stale = False
+        self._listening = False
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever the projections are dropped; see ``set_mod_records``."""
+        return self._generation
+
+    def listen(self):
+        """Start counting commits, before reading the catalog somewhere else."""
+        if self._listening:
+            return
+        from sqlalchemy import event
+
+        from database import SessionLocal
+
+        event.listen(SessionLocal, "after_commit", self._on_commit)
+        self._listening = True
+
+    @property
+    def session(self) -> "Session":
+        from database import SessionLocal
+
+        self.listen()
+        if self._stale and self._session is not None:
+            self._session.close()
+            self._session = None
+        self._stale = False
+        if self._session is None:
+            self._session = SessionLocal()
+        return self._session
+
+    def _on_commit(self, _session):
+        # May run on a worker thread, so the session itself is only replaced by the thread that reads
+        self._projections = {}
+        self._generation += 1
+        self._stale = True
+
+    def invalidate(self):
+        """Forget every projection and release the read session's connection."""
+        self._projections = {}
+        self._generation += 1
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self._stale = False
+
+    def close(self):
+        self.invalidate()
+        if self._listening:
+            from sqlalchemy import event
+
+            from database import SessionLocal
+
+            event.remove(SessionLocal, "after_commit", self._on_commit)
+            self._listening = False
+
+    def _cached(self, key: tuple, load: Callable[["Session"], T]) -> T:
+        if key in self._projections:
+            return cast(T, self._projections[key])
+        generation = self._generation
+        value = load(self.session)
+        if generation == self._generation:
+            self._projections[key] = value
+        return value
+
+    def set_mod_records(self, default_category: str, records: list[dict], generation: int):
+        """Keep records read elsewhere, such as by the background catalog loader.
+
+        ``generation`` is the value of ``generation`` from before the read, which
+        must have started after ``listen``; records read before a later commit
+        are dropped.
+        """
+        if generation == self._generation:
+            self._projections[("mod_records", default_category)] = records
+
+    def mod_records(self, default_category: str) -> list[dict]:
+        """Every mod as an ``exchange.iter_mods`` record, ordered by name."""
+        from exchange import iter_mods
+
+        return self._cached(("mod_records", default_category), lambda db: list(iter_mods(db, default_category)))
+
+    def mod_names(self) -> list[tuple[int, str]]:
+        """``(id, name)`` of every mod."""
+        from models import Mod
+
+        return self._cached(("mod_names",), lambda db: [(mod_id, name) for mod_id, name in db.query(Mod.id, Mod.name)])
+
+    def category_names(self, default_category: str, create_default: bool = False) -> list[str]:
+        """Category names with the default category first; ``create_default`` creates it if missing."""
+        from sqlalchemy import select
+
+        from exchange import sort_category_names
+        from models import Category
+        from services import category_names
+
+        def load(db: "Session") -> list[str]:
+            if create_default:
+                return category_names(db, default_category)
+            return sort_category_names(list(db.scalars(select(Category.name))), default_category)
+
+        return self._cached(("category_names", default_category, create_default), load)
+
+    def mod(self, name: str) -> "ModRecord | None":
+        from services import find_mod_id, get_mod
+
+        def load(db: "Session") -> "ModRecord | None":
+            mod_id = find_mod_id(db, name)
+            return get_mod(db, mod_id) if mod_id is not None else None
+
+        return self._cached(("mod", name), load)
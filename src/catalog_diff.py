@@ -0,0 +1,211 @@
+"""Differences between two catalogs.
+
+A catalog is loaded from a JSON export, a database snapshot or an open session
+into dictionaries keyed by mod name. Comparing two of them is then a handful of
+set operations, linear in the number of mods, links and edges. The module can
+also be run on its own to print the difference between two files::
+
+    python catalog_diff.py old.json new.json
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from backup import SNAPSHOT_SUFFIXES, open_snapshot
+from catalog_reader import KIND_CATEGORY, CatalogReader
+from models import Category, Mod, mod_category, mod_dependency, mod_table
+
+# Compared mod fields, in the order they are reported
+FIELDS = ("filename", "sha256", "is_translated", "client_required", "server_required", "notes")
+DEFAULTS = {"sha256": None, "is_translated": False, "client_required": True, "server_required": True, "notes": ""}
+
+
+@dataclass
+class Catalog:
+    """Categories and mods of one catalog, keyed by name."""
+
+    categories: set[str] = field(default_factory=set)
+    # {mod name: {field: value}}
+    mods: dict[str, dict] = field(default_factory=dict)
+    mod_categories: dict[str, frozenset[str]] = field(default_factory=dict)
+    dependencies: dict[str, frozenset[str]] = field(default_factory=dict)
+
+    def add_mod(self, record: dict):
+        name = record["name"]
+        values = {column: record.get(column, DEFAULTS.get(column)) for column in FIELDS}
+        values["notes"] = values["notes"] or ""
+        self.mods[name] = values
+        self.mod_categories[name] = frozenset(record.get("categories", []))
+        self.dependencies[name] = frozenset(record.get("dependencies", []))
+
+
+@dataclass
+class CatalogDiff:
+    """What changed from an old catalog to a new one, sorted by name."""
+
+    added_categories: list[str] = field(default_factory=list)
+    removed_categories: list[str] = field(default_factory=list)
+    added_mods: list[str] = field(default_factory=list)
+    removed_mods: list[str] = field(default_factory=list)
+    # (mod name, {field: (old, new)})
+    changed_mods: list[tuple[str, dict]] = field(default_factory=list)
+    # (mod name, categories left, categories joined)
+    category_moves: list[tuple[str, list[str], list[str]]] = field(default_factory=list)
+    # (mod name, dependency name)
+    added_dependencies: list[tuple[str, str]] = field(default_factory=list)
+    removed_dependencies: list[tuple[str, str]] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_categories
+            or self.removed_categories
+            or self.added_mods
+            or self.removed_mods
+            or self.changed_mods
+            or self.category_moves
+            or self.added_dependencies
+            or self.removed_dependencies
+        )
+
+
+def load_json(path: Path | str) -> Catalog:
+    """Load a JSON or JSON Lines export."""
+    catalog = Catalog()
+    with open(path, "rb") as f:
+        for kind, record in CatalogReader(f):
+            if kind == KIND_CATEGORY:
+                catalog.categories.add(record["name"])
+            else:
+                catalog.add_mod(record)
+    return catalog
+
+
+def load_session(db: Session) -> Catalog:
+    """Load the catalog behind a session with one projection query per table."""
+    catalog = Catalog()
+    catalog.categories.update(db.scalars(select(Category.name)))
+
+    # Snapshots taken before a column was added do not have it
+    existing = {column["name"] for column in inspect(db.get_bind()).get_columns(mod_table.name)}
+    columns = [mod_table.c[column] if column in existing else literal(None).label(column) for column in FIELDS]
+    for row in db.execute(select(mod_table.c.name, *columns)):
+        values = dict(zip(FIELDS, row[1:], strict=True))
+        values["notes"] = values["notes"] or ""
+        catalog.mods[row.name] = values
+
+    links: dict[str, set[str]] = {}
+    for mod_name, category_name in db.execute(
+        select(Mod.name, Category.name)
+        .join(mod_category, mod_category.c.mod_id == Mod.id)
+        .join(Category, Category.id == mod_category.c.category_id)
+    ):
+        links.setdefault(mod_name, set()).add(category_name)
+    dependency = aliased(Mod)
+    edges: dict[str, set[str]] = {}
+    for mod_name, dependency_name in db.execute(
+        select(Mod.name, dependency.name)
+        .join(mod_dependency, mod_dependency.c.mod_id == Mod.id)
+        .join(dependency, dependency.id == mod_dependency.c.dependency_id)
+    ):
+        edges.setdefault(mod_name, set()).add(dependency_name)
+
+    for name in catalog.mods:
+        catalog.mod_categories[name] = frozenset(links.get(name, ()))
+        catalog.dependencies[name] = frozenset(edges.get(name, ()))
+    return catalog
+
+
+def load_snapshot(path: Path | str) -> Catalog:
+    """Load a database file or a snapshot taken by ``backup``."""
+    with open_snapshot(path) as db_path:
+        engine = create_engine(f"sqlite:///file:{db_path.as_posix()}?mode=ro&uri=true")
+        try:
+            with Session(engine) as db:
+                return load_session(db)
+        finally:
+            engine.dispose()
+
+
+def load_catalog(path: Path | str) -> Catalog:
+    """Load a catalog from a JSON export or a database snapshot, by file name."""
+    if str(path).endswith(SNAPSHOT_SUFFIXES):
+        return load_snapshot(path)
+    return load_json(path)
+
+
+def _sorted(names) -> list[str]:
+    return sorted(names, key=str.lower)
+
+
+def diff_catalogs(old: Catalog, new: Catalog) -> CatalogDiff:
+    """Compare two catalogs."""
+    diff = CatalogDiff(
+        added_categories=_sorted(new.categories - old.categories),
+        removed_categories=_sorted(old.categories - new.categories),
+        added_mods=_sorted(new.mods.keys() - old.mods.keys()),
+        removed_mods=_sorted(old.mods.keys() - new.mods.keys()),
+    )
+
+    for name in _sorted(old.mods.keys() & new.mods.keys()):
+        old_values, new_values = old.mods[name], new.mods[name]
+        if old_values != new_values:
+            changes = {}
+            for column in FIELDS:
+                before, after = old_values[column], new_values[column]
+                # Exports from before the content store carry no hash
+                if column == "sha256" and (before is None or after is None):
+                    continue
+                if before != after:
+                    changes[column] = (before, after)
+            if changes:
+                diff.changed_mods.append((name, changes))
+
+        old_categories, new_categories = old.mod_categories[name], new.mod_categories[name]
+        if old_categories != new_categories:
+            diff.category_moves.append(
+                (name, _sorted(old_categories - new_categories), _sorted(new_categories - old_categories))
+            )
+
+        old_dependencies, new_dependencies = old.dependencies[name], new.dependencies[name]
+        diff.added_dependencies.extend((name, dep) for dep in _sorted(new_dependencies - old_dependencies))
+        diff.removed_dependencies.extend((name, dep) for dep in _sorted(old_dependencies - new_dependencies))
+    return diff
+
+
+def format_diff(diff: CatalogDiff) -> str:
+    """Render a diff as plain text, one change per line."""
+    lines: list[str] = []
+    lines.extend(f"+ category {name}" for name in diff.added_categories)
+    lines.extend(f"- category {name}" for name in diff.removed_categories)
+    lines.extend(f"+ mod {name}" for name in diff.added_mods)
+    lines.extend(f"- mod {name}" for name in diff.removed_mods)
+    for name, changes in diff.changed_mods:
+        for column, (before, after) in changes.items():
+            lines.append(f"~ mod {name}: {column} {before!r} -> {after!r}")
+    for name, left, joined in diff.category_moves:
+        lines.append(f"~ mod {name}: categories -[{', '.join(left)}] +[{', '.join(joined)}]")
+    lines.extend(f"+ dependency {name} -> {dep}" for name, dep in diff.added_dependencies)
+    lines.extend(f"- dependency {name} -> {dep}" for name, dep in diff.removed_dependencies)
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Show the differences between two catalogs.")
+    parser.add_argument("old", help="JSON export or database snapshot")
+    parser.add_argument("new", help="JSON export or database snapshot")
+    args = parser.parse_args(argv)
+
+    diff = diff_catalogs(load_catalog(args.old), load_catalog(args.new))
+    if not diff.is_empty():
+        print(format_diff(diff))
+    # Like diff(1): 1 when the catalogs differ
+    return 0 if diff.is_empty() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
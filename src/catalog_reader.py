@@ -0,0 +1,193 @@
+"""Incremental reader for catalog exports.
+
+Both the JSON document written by the export (indented or compact) and the JSON
+Lines layout are read in fixed-size chunks. Each category and mod record is
+decoded and validated on its own and handed out as soon as it is complete, so
+memory use depends on the size of one record rather than the whole file.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import Iterator
+from typing import BinaryIO
+
+CHUNK_SIZE = 1 << 16
+
+KIND_CATEGORY = "category"
+KIND_MOD = "mod"
+
+# Top-level arrays of the document layout and the kind of their records
+ARRAY_KINDS = {"categories": KIND_CATEGORY, "mods": KIND_MOD}
+
+_JSONL_START = re.compile(r'\s*\{\s*"type"\s*:')
+_WHITESPACE = " \t\n\r"
+# Longest token a decode error can point into while the rest is still unread, a "\uXXXX" escape
+_MAX_TOKEN = 6
+
+
+class CatalogFormatError(ValueError):
+    """The file is not a valid catalog export."""
+
+
+def _check_string_list(record: dict, key: str, where: str):
+    values = record.get(key, [])
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise CatalogFormatError(f"{where}: '{key}' must be a list of names")
+
+
+def validate_record(kind: str, record, index: int) -> dict:
+    """Check the fields of a category or mod record and return it."""
+    where = f"{kind} #{index + 1}"
+    if not isinstance(record, dict):
+        raise CatalogFormatError(f"{where}: expected an object")
+    if not isinstance(record.get("name"), str) or not record["name"]:
+        raise CatalogFormatError(f"{where}: missing 'name'")
+    if kind == KIND_CATEGORY:
+        return record
+
+    where = f"{kind} '{record['name']}'"
+    if not isinstance(record.get("filename"), str) or not record["filename"]:
+        raise CatalogFormatError(f"{where}: missing 'filename'")
+    for key in ("is_translated", "client_required", "server_required"):
+        if key in record and not isinstance(record[key], bool):
+            raise CatalogFormatError(f"{where}: '{key}' must be true or false")
+    for key in ("sha256", "notes"):
+        if record.get(key) is not None and not isinstance(record[key], str):
+            raise CatalogFormatError(f"{where}: '{key}' must be a string")
+    _check_string_list(record, "categories", where)
+    _check_string_list(record, "dependencies", where)
+    return record
+
+
+class CatalogReader:
+    """Iterates (kind, record) pairs from a catalog export opened in binary mode.
+
+    ``bytes_read`` tells how much of the file has been consumed, for progress
+    reporting.
+    """
+
+    def __init__(self, f: BinaryIO, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self.counts = {KIND_CATEGORY: 0, KIND_MOD: 0}
+
+    def _fill(self, size: int = 0) -> bool:
+        """Read at least ``size`` more bytes, and at least one chunk."""
+        if self.eof:
+            return False
+        data = self.f.read(max(self.chunk_size, size))
+        self.bytes_read += len(data)
+        if not data:
+            self.eof = True
+        try:
+            text = self.decoder.decode(data, final=self.eof)
+        except UnicodeDecodeError as e:
+            raise CatalogFormatError(f"Not UTF-8 text near byte {self.bytes_read - len(data) + e.start}") from None
+        # Drop what has already been parsed before growing the buffer
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at the end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            found = repr(char) if char else "end of file"
+            raise CatalogFormatError(f"Expected {' or '.join(repr(c) for c in chars)}, found {found}")
+        self.pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Only a value cut off by the end of the buffer can be completed by reading more
+                cut_off = e.pos >= len(self.buffer) - _MAX_TOKEN or e.msg.startswith("Unterminated string")
+                if cut_off and self._grow():
+                    continue
+                raise CatalogFormatError(str(e)) from None
+            # A number cut off at the end of the buffer still decodes
+            if end == len(self.buffer) and self._grow():
+                continue
+            self.pos = end
+            return value
+
+    def _grow(self) -> bool:
+        # Reading at least as much as is pending doubles the buffer, so a value spanning
+        # many chunks is decoded again a logarithmic number of times rather than once per chunk
+        return self._fill(len(self.buffer) - self.pos)
+
+    def _record(self, kind: str, record) -> tuple[str, dict]:
+        record = validate_record(kind, record, self.counts[kind])
+        self.counts[kind] += 1
+        return kind, record
+
+    def __iter__(self) -> Iterator[tuple[str, dict]]:
+        self._peek()
+        while len(self.buffer) - self.pos < 64 and self._fill():
+            pass
+        if _JSONL_START.match(self.buffer, self.pos):
+            return self._iter_lines()
+        return self._iter_document()
+
+    def _iter_lines(self) -> Iterator[tuple[str, dict]]:
+        while self._peek():
+            record = self._value()
+            if not isinstance(record, dict) or record.get("type") not in (KIND_CATEGORY, KIND_MOD):
+                raise CatalogFormatError("Each line must be an object with a 'type' of 'category' or 'mod'")
+            kind = record.pop("type")
+            yield self._record(kind, record)
+
+    def _iter_document(self) -> Iterator[tuple[str, dict]]:
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise CatalogFormatError("Expected a key")
+            self._expect(":")
+            kind = ARRAY_KINDS.get(key)
+            if kind is None:
+                # Unknown top-level values are skipped
+                self._value()
+            else:
+                self._expect("[")
+                if self._peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield self._record(kind, self._value())
+                        if self._expect(",]") == "]":
+                            break
+            if self._expect(",}") == "}":
+                break
+        if self._peek():
+            raise CatalogFormatError("Unexpected data after the catalog")
+
+
+def read_catalog(f: BinaryIO, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Read and validate a whole catalog export into the document layout."""
+    data: dict[str, list[dict]] = {"categories": [], "mods": []}
+    for kind, record in CatalogReader(f, chunk_size):
+        data["categories" if kind == KIND_CATEGORY else "mods"].append(record)
+    return data
@@ -0,0 +1,190 @@
+"""Command line interface for scripting the catalog without the GUI.
+
+Only the standard library is imported at start-up; each command imports the
+service modules it needs, and PyQt6 is never imported.
+
+Examples::
+
+    python cli.py list --category Library
+    python cli.py export server
+    python cli.py export-json catalog.jsonl
+    python cli.py import-json catalog.json --merge
+    python cli.py tree -o dependency-tree.txt
+    python cli.py validate --hashes
+"""
+
+import argparse
+import sys
+from collections.abc import Callable
+
+from config import diagnostics_enabled
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+
+def _session():
+    from database import SessionLocal, init_db
+
+    init_db()
+    return SessionLocal()
+
+
+def cmd_list(args) -> int:
+    from exchange import FALLBACK_CATEGORY, iter_mods
+
+    search = args.search.lower() if args.search else None
+    with _session() as db:
+        for record in iter_mods(db, FALLBACK_CATEGORY):
+            if args.category and args.category not in record["categories"]:
+                continue
+            if search and search not in record["name"].lower() and search not in record["filename"].lower():
+                continue
+            flags = "".join(
+                flag if record[key] else "-"
+                for flag, key in (("C", "client_required"), ("S", "server_required"), ("T", "is_translated"))
+            )
+            print(f"{flags}  {record['name']}  [{', '.join(record['categories'])}]  {record['filename']}")
+    return EXIT_OK
+
+
+def cmd_export(args) -> int:
+    from pathlib import Path
+
+    from services import export_pack
+
+    with _session() as db:
+        result = export_pack(db, args.pack, Path(args.dir) if args.dir else None)
+    if result.total == 0:
+        print(f"No {args.pack} mods found", file=sys.stderr)
+        return EXIT_FAILED
+    for path in result.missing:
+        print(f"File not found: {path}", file=sys.stderr)
+    for filename, error in result.failed:
+        print(f"Failed to copy {filename}: {error}", file=sys.stderr)
+    if result.manifest_error:
+        print(f"Failed to write manifest: {result.manifest_error}", file=sys.stderr)
+    print(f"Exported {len(result.exported)} of {result.total} mods to {result.export_dir}")
+    return EXIT_OK if result.exported and not (result.missing or result.failed) else EXIT_FAILED
+
+
+def cmd_export_json(args) -> int:
+    from exchange import FALLBACK_CATEGORY, FORMAT_INDENTED, FORMAT_JSONL, export_catalog
+
+    fmt = args.format or (FORMAT_JSONL if args.path.lower().endswith(".jsonl") else FORMAT_INDENTED)
+    with _session() as db, open(args.path, "w", encoding="utf-8") as f:
+        category_count, mod_count = export_catalog(db, f, FALLBACK_CATEGORY, fmt)
+    print(f"Exported {category_count} categories and {mod_count} mods to {args.path}")
+    return EXIT_OK
+
+
+def cmd_import_json(args) -> int:
+    from catalog_reader import read_catalog
+    from exchange import import_catalog_file, merge_catalog
+
+    with _session() as db, open(args.path, "rb") as f:
+        if args.merge:
+            report = merge_catalog(db, read_catalog(f))
+            print(
+                f"Merged {args.path}: {len(report.added)} added, {len(report.updated)} updated, "
+                f"{len(report.removed)} removed, {report.unchanged} unchanged"
+            )
+        else:
+            category_count, mod_count = import_catalog_file(db, f)
+            print(f"Imported {category_count} categories and {mod_count} mods from {args.path}")
+    return EXIT_OK
+
+
+def cmd_tree(args) -> int:
+    from services import dependency_tree
+
+    with _session() as db:
+        text = dependency_tree(db)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return EXIT_OK
+
+
+def cmd_validate(args) -> int:
+    from services import validate_catalog
+
+    with _session() as db:
+        report = validate_catalog(db, check_hashes=args.hashes or args.full, full=args.full)
+    for name in report.missing_files:
+        print(f"missing file: {name}")
+    for name in report.corrupted_files:
+        print(f"checksum mismatch: {name}")
+    for cycle in report.dependency_cycles:
+        print(f"dependency cycle: {' -> '.join(cycle)}")
+    for name in report.orphaned_files:
+        print(f"warning: orphaned file: {name}")
+    for name in report.uncategorized_mods:
+        print(f"warning: uncategorized mod: {name}")
+    return EXIT_OK if report.is_valid() else EXIT_FAILED
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="manual-mmdm", description="Manage the mod catalog from the command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="list mods")
+    list_parser.add_argument("--category", help="only mods in this category")
+    list_parser.add_argument("--search", help="only mods whose name or file name contains this text")
+    list_parser.set_defaults(handler=cmd_list)
+
+    export_parser = commands.add_parser("export", help="copy the jars of a client or server pack into a folder")
+    export_parser.add_argument("pack", choices=("client", "server"))
+    export_parser.add_argument("--dir", help="export folder (default: <pack>_mods)")
+    export_parser.set_defaults(handler=cmd_export)
+
+    export_json_parser = commands.add_parser("export-json", help="export the catalog to JSON")
+    export_json_parser.add_argument("path")
+    export_json_parser.add_argument(
+        "--format", choices=("indented", "compact", "jsonl"), help="layout (default: from the file extension)"
+    )
+    export_json_parser.set_defaults(handler=cmd_export_json)
+
+    import_json_parser = commands.add_parser("import-json", help="import a JSON or JSON Lines export")
+    import_json_parser.add_argument("path")
+    mode = import_json_parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--replace", action="store_true", help="replace the whole catalog")
+    mode.add_argument("--merge", action="store_true", help="apply only the differences")
+    import_json_parser.set_defaults(handler=cmd_import_json)
+
+    tree_parser = commands.add_parser("tree", help="print the dependency tree")
+    tree_parser.add_argument("-o", "--output", help="write to a file instead of standard output")
+    tree_parser.set_defaults(handler=cmd_tree)
+
+    validate_parser = commands.add_parser("validate", help="check files, categories and dependency cycles")
+    validate_parser.add_argument("--hashes", action="store_true", help="also verify jar checksums")
+    validate_parser.add_argument("--full", action="store_true", help="verify checksums without the hash cache")
+    validate_parser.set_defaults(handler=cmd_validate)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    profiler = None
+    if diagnostics_enabled(None, "sql_profile"):
+        from database import enable_profiling
+
+        profiler = enable_profiling()
+    try:
+        if profiler:
+            with profiler.operation(args.command):
+                return handler(args)
+        return handler(args)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    finally:
+        if profiler:
+            print(profiler.report(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,28 @@
 """Configuration management for the application."""
 
 import json
+import os
 from pathlib import Path
 
 CONFIG_FILE = Path("config.json")
-DEFAULT_CONFIG = {"language": "en"}
+DEFAULT_CONFIG = {
+    "language": "en",
+    "backup_compress": False,
+    "backup_keep": 10,
+    "sql_profile": False,
+    "slow_query_ms": 50,
+    "trace": False,
+    "memory_profile": False,
+}
+
+
+# Diagnostics modes and the environment variables that also switch them on
+DIAGNOSTICS_ENV = {"sql_profile": "MMDM_SQL_PROFILE", "trace": "MMDM_TRACE", "memory_profile": "MMDM_MEMORY_PROFILE"}
+
+
+def diagnostics_enabled(config: dict | None, key: str) -> bool:
+    """Whether a diagnostics mode is on through its environment variable or its config key."""
+    return os.environ.get(DIAGNOSTICS_ENV[key], "") not in ("", "0") or bool(config and config.get(key))
 
 
 def load_config():
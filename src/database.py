@@ -1,7 +1,27 @@
-from sqlalchemy import create_engine
+import heapq
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./manual-mmdm.db"
+# MMDM_DATABASE points the application at another database file
+DATABASE_PATH = Path(os.environ.get("MMDM_DATABASE", "manual-mmdm.db"))
+SLOW_QUERY_MS = 50.0
+SLOW_QUERY_LOG = Path("sql-slow-queries.jsonl")
+# SQLite limits the number of bound parameters per statement (999 before 3.32), so
+# statements that bind a list of ids take it in chunks of this size
+QUERY_CHUNK_SIZE = 500
+# Multi-row inserts are long; reports keep the start of each statement
+STATEMENT_PREVIEW = 160
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH.as_posix()}"
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -17,3 +37,165 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def upgrade_schema(bind=engine):
+    """Add nullable columns introduced after a database was created.
+
+    ``create_all`` only creates missing tables, so columns added to existing
+    models are appended here with ``ALTER TABLE`` together with their indexes.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in existing and column.nullable]
+            for column in missing:
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+            if missing:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+
+def init_db(bind=engine):
+    """Create missing tables and bring existing ones up to date."""
+    import models  # noqa: F401 (registers the tables on Base.metadata)
+
+    Base.metadata.create_all(bind=bind)
+    upgrade_schema(bind)
+
+
+@dataclass
+class OperationStats:
+    """Statements issued while one named operation was running."""
+
+    name: str
+    count: int = 0
+    total_ms: float = 0.0
+    # Min-heap of (duration in ms, statement) holding the slowest statements
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+
+
+class QueryProfiler:
+    """Counts and times the statements of an engine, grouped by operation.
+
+    Statements are attributed to the innermost ``operation`` running on the
+    same thread, or to "other". Statements slower than ``slow_query_ms`` are
+    appended to ``slow_log`` as JSON lines together with their
+    ``EXPLAIN QUERY PLAN``.
+    """
+
+    OTHER = "other"
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS, slow_log: Path | None = SLOW_QUERY_LOG, keep: int = 5):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log = slow_log
+        self.keep = keep
+        self.stats: dict[str, OperationStats] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def attach(self, bind):
+        event.listen(bind, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(bind, "after_cursor_execute", self._after_cursor_execute)
+
+    def detach(self, bind):
+        event.remove(bind, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(bind, "after_cursor_execute", self._after_cursor_execute)
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        stack = self._local.__dict__.setdefault("operations", [])
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+    def _before_cursor_execute(self, conn, *_args):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, _context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        stack = self._local.__dict__.get("operations")
+        name = stack[-1] if stack else self.OTHER
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = OperationStats(name)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            if len(stats.slowest) < self.keep:
+                heapq.heappush(stats.slowest, (elapsed_ms, statement))
+            elif elapsed_ms > stats.slowest[0][0]:
+                heapq.heapreplace(stats.slowest, (elapsed_ms, statement))
+        if elapsed_ms >= self.slow_query_ms and self.slow_log:
+            self._log_slow_query(cursor, name, statement, parameters, executemany, elapsed_ms)
+
+    def _log_slow_query(self, cursor, name, statement, parameters, executemany, elapsed_ms):
+        slow_log = self.slow_log
+        if slow_log is None:
+            return
+        plan = None
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            try:
+                # A separate cursor on the same DBAPI connection leaves the pending result alone
+                rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+                plan = [row[-1] for row in rows]
+            except Exception as e:
+                plan = [f"unavailable: {e}"]
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "operation": name,
+            "duration_ms": round(elapsed_ms, 3),
+            "statement": statement,
+            "plan": plan,
+        }
+        try:
+            with open(slow_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # Profiling must never break the operation being profiled
+
+    def report(self) -> str:
+        """Summarize the operations, busiest first, with their slowest statements."""
+        with self._lock:
+            operations = sorted(self.stats.values(), key=lambda stats: stats.total_ms, reverse=True)
+            lines = []
+            for stats in operations:
+                lines.append(f"{stats.name}: {stats.count} statements, {stats.total_ms:.1f} ms")
+                for elapsed_ms, statement in sorted(stats.slowest, reverse=True):
+                    statement = " ".join(statement.split())
+                    if len(statement) > STATEMENT_PREVIEW:
+                        statement = statement[:STATEMENT_PREVIEW] + "..."
+                    lines.append(f"  {elapsed_ms:9.2f} ms  {statement}")
+        return "\n".join(lines)
+
+    def dump(self, path: Path | str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report() + "\n")
+
+
+# Set by enable_profiling
+profiler: QueryProfiler | None = None
+
+
+def enable_profiling(slow_query_ms: float = SLOW_QUERY_MS, bind=engine) -> QueryProfiler:
+    """Start counting and timing the statements issued through ``bind``."""
+    global profiler
+    if profiler is None:
+        profiler = QueryProfiler(slow_query_ms)
+        profiler.attach(bind)
+    return profiler
+
+
+def profile_operation(name: str):
+    """Attribute the statements of a block to ``name`` when profiling is enabled."""
+    return profiler.operation(name) if profiler else nullcontext()
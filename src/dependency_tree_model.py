@@ -0,0 +1,174 @@
+"""Lazy tree model of the mods and their dependencies.
+
+The top level holds one row per mod shown in the mod table, in the same
+order. Rows are created through ``canFetchMore``/``fetchMore`` only as the
+view needs them: the top level a batch at a time as it is scrolled, and a
+mod's dependencies when its node is expanded. ``QTreeView`` lays out every
+created row on each expansion, so the cost follows what the user has seen
+rather than the size of the catalog. The rows are built from the catalog
+records the main window already loaded; nothing is queried here.
+"""
+
+from typing import overload
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, QObject, Qt
+
+# Record fields shown in each column; the header translation keys match the mod table's
+COLUMNS = ("name", "categories", "is_translated", "client_required", "server_required", "filename", "notes")
+HEADERS = (
+    "header_module_name",
+    "header_category",
+    "header_translated",
+    "header_client",
+    "header_server",
+    "header_filename",
+    "header_notes",
+)
+# Top-level rows created per fetch
+FETCH_BATCH = 200
+
+
+class _Node:
+    __slots__ = ("name", "parent", "row", "children", "expandable")
+
+    def __init__(self, name: str, parent: "_Node | None", row: int, expandable: bool):
+        self.name = name
+        self.parent = parent
+        self.row = row
+        # None until the node is expanded for the first time
+        self.children: list[_Node] | None = None
+        self.expandable = expandable
+
+    def ancestors(self) -> set[str]:
+        names = set()
+        node = self
+        while node is not None:
+            names.add(node.name)
+            node = node.parent
+        return names
+
+
+class DependencyTreeModel(QAbstractItemModel):
+    def __init__(self, translations: dict, parent: QObject | None = None):
+        super().__init__(parent)
+        self.translations = translations
+        self.records: dict[str, dict] = {}
+        # Names of every record in table order, and of the mods on the top level
+        self.names: list[str] = []
+        self.top_level: list[str] = []
+        self.root = _Node("", None, 0, False)
+        self.root.children = []
+
+    def set_records(self, records: list[dict]):
+        """Show ``records`` on the top level; expanded nodes are collapsed again."""
+        self.records = {record["name"]: record for record in records}
+        self.names = [record["name"] for record in records]
+        self._reset(self.names)
+
+    def set_visible_rows(self, rows: list[int]):
+        """Keep only the records at ``rows`` of the list given to ``set_records`` on the top level."""
+        self._reset([self.names[row] for row in rows])
+
+    def _reset(self, top_level: list[str]):
+        self.beginResetModel()
+        self.top_level = top_level
+        self.root.children = []
+        self.endResetModel()
+
+    def _new_node(self, name: str, parent: _Node, row: int, seen: set[str]) -> _Node:
+        # A dependency that is also an ancestor closes a cycle and is not expanded again
+        record = self.records.get(name)
+        return _Node(name, parent, row, name not in seen and record is not None and bool(record["dependencies"]))
+
+    def set_translations(self, translations: dict):
+        # The rows follow with the reload that comes after a language change
+        self.translations = translations
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(COLUMNS) - 1)
+
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self.root
+
+    def mod_name(self, index: QModelIndex) -> str:
+        return self._node(index).name
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:  # noqa: B008
+        children = self._node(parent).children
+        if children is None or not 0 <= row < len(children) or not 0 <= column < len(COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    @overload
+    def parent(self, child: QModelIndex) -> QModelIndex: ...
+
+    @overload
+    def parent(self) -> QObject | None: ...
+
+    def parent(self, child: QModelIndex | None = None) -> QModelIndex | QObject | None:
+        # Without an index this is QObject.parent
+        if child is None:
+            return super().parent()
+        if not child.isValid():
+            return QModelIndex()
+        parent = child.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: B008, N802
+        if parent.column() > 0:
+            return 0
+        children = self._node(parent).children
+        return len(children) if children is not None else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: B008, N802, ARG002
+        return len(COLUMNS)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:  # noqa: B008, N802
+        node = self._node(parent)
+        if node is self.root:
+            return bool(self.top_level)
+        return parent.column() <= 0 and node.expandable
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # noqa: N802
+        node = self._node(parent)
+        if node is self.root:
+            assert node.children is not None  # The root's children always exist
+            return len(node.children) < len(self.top_level)
+        return node.expandable and node.children is None
+
+    def fetchMore(self, parent: QModelIndex):  # noqa: N802
+        if not self.canFetchMore(parent):
+            return
+        node = self._node(parent)
+        if node.children is None:
+            node.children = []
+        if node is self.root:
+            start = len(node.children)
+            names = self.top_level[start : start + FETCH_BATCH]
+            seen = set()
+        else:
+            start = 0
+            names = self.records[node.name]["dependencies"]
+            seen = node.ancestors()
+        children = node.children
+        self.beginInsertRows(parent, start, start + len(names) - 1)
+        children.extend(self._new_node(name, node, start + row, seen) for row, name in enumerate(names))
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        record = self.records.get(index.internalPointer().name)
+        if record is None:
+            return index.internalPointer().name if index.column() == 0 else None
+        value = record[COLUMNS[index.column()]]
+        if isinstance(value, bool):
+            return self.translations["msg_yes"] if value else self.translations["msg_no"]
+        if isinstance(value, list):
+            return ", ".join(value)
+        return value or ""
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):  # noqa: N802
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.translations[HEADERS[section]]
+        return None
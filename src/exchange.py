@@ -0,0 +1,469 @@
+"""JSON export and import of the catalog.
+
+Exports stream rows in batches with ``yield_per`` and write each record as soon
+as it is built, so memory use does not grow with the size of the catalog.
+Three layouts are supported: the indented document the application has always
+written, the same document without indentation, and JSON Lines with one
+category or mod per line.
+
+Imports go through ``CatalogImporter``, which inserts categories, mods and both
+association tables with Core ``insert()`` executemany statements and resolves
+names to ids in memory, all in a single transaction. ``import_catalog_file``
+feeds it batches straight from ``CatalogReader``. ``merge_catalog`` instead
+diffs the document against the current catalog and writes only the changes.
+"""
+
+import json
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import BinaryIO, TextIO
+
+from sqlalchemy import and_, bindparam, delete, insert, or_, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import func
+
+from catalog_reader import KIND_CATEGORY, KIND_MOD, CatalogReader
+from database import QUERY_CHUNK_SIZE
+from models import Category, Mod, category_table, mod_category, mod_dependency, mod_table
+
+BATCH_SIZE = 1000
+
+FORMAT_INDENTED = "indented"
+FORMAT_COMPACT = "compact"
+FORMAT_JSONL = "jsonl"
+
+# Category given to imported mods that reference no known category
+FALLBACK_CATEGORY = "Uncategorized"
+
+# Mod columns compared and written by imports, in table order
+MOD_FIELDS = ("filename", "sha256", "is_translated", "client_required", "server_required", "notes")
+
+
+def _mod_values(record: dict) -> dict:
+    return {
+        "name": record["name"],
+        "filename": record["filename"],
+        "sha256": record.get("sha256"),
+        "is_translated": record.get("is_translated", False),
+        "client_required": record.get("client_required", True),
+        "server_required": record.get("server_required", True),
+        "notes": record.get("notes", ""),
+    }
+
+
+def sort_category_names(names: list[str], default_name: str) -> list[str]:
+    """Sort category names alphabetically with the default category first."""
+    if default_name in names:
+        others = [name for name in names if name != default_name]
+        return [default_name] + sorted(others, key=str.lower)
+    return sorted(names, key=str.lower)
+
+
+def iter_categories(db: Session) -> Iterator[dict]:
+    """Yield category records ordered by name (case-insensitive)."""
+    query = select(Category.name).order_by(func.lower(Category.name)).execution_options(yield_per=BATCH_SIZE)
+    for name in db.scalars(query):
+        yield {"name": name}
+
+
+def iter_mods(db: Session, default_category: str) -> Iterator[dict]:
+    """Yield mod records ordered by name (case-insensitive).
+
+    Categories and dependencies are fetched once per batch of mods instead of
+    once per mod.
+    """
+    query = (
+        select(
+            Mod.id,
+            Mod.name,
+            Mod.filename,
+            Mod.sha256,
+            Mod.is_translated,
+            Mod.client_required,
+            Mod.server_required,
+            Mod.notes,
+        )
+        .order_by(func.lower(Mod.name))
+        .execution_options(yield_per=BATCH_SIZE)
+    )
+    dependency = aliased(Mod)
+    for batch in db.execute(query).partitions():
+        ids = [row.id for row in batch]
+        categories: defaultdict[int, list[str]] = defaultdict(list)
+        dependencies: defaultdict[int, list[str]] = defaultdict(list)
+        # A batch holds more ids than a statement may bind
+        for start in range(0, len(ids), QUERY_CHUNK_SIZE):
+            chunk = ids[start : start + QUERY_CHUNK_SIZE]
+            for mod_id, name in db.execute(
+                select(mod_category.c.mod_id, Category.name)
+                .join(Category, Category.id == mod_category.c.category_id)
+                .where(mod_category.c.mod_id.in_(chunk))
+            ):
+                categories[mod_id].append(name)
+            for mod_id, name in db.execute(
+                select(mod_dependency.c.mod_id, dependency.name)
+                .join(dependency, dependency.id == mod_dependency.c.dependency_id)
+                .where(mod_dependency.c.mod_id.in_(chunk))
+            ):
+                dependencies[mod_id].append(name)
+
+        for row in batch:
+            yield {
+                "name": row.name,
+                "filename": row.filename,
+                "sha256": row.sha256,
+                "is_translated": row.is_translated,
+                "client_required": row.client_required,
+                "server_required": row.server_required,
+                "notes": row.notes,
+                "categories": sort_category_names(categories[row.id], default_category),
+                "dependencies": sorted(dependencies[row.id], key=str.lower),
+            }
+
+
+def _write_array(f: TextIO, key: str, records: Iterator[dict], indent: int | None) -> int:
+    count = 0
+    if indent is None:
+        f.write(f'"{key}":[')
+        for record in records:
+            if count:
+                f.write(",")
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            count += 1
+        f.write("]")
+        return count
+
+    pad = " " * indent
+    f.write(f'{pad}"{key}": [')
+    for record in records:
+        f.write(",\n" if count else "\n")
+        text = json.dumps(record, ensure_ascii=False, indent=indent)
+        f.write("\n".join(pad * 2 + line for line in text.split("\n")))
+        count += 1
+    f.write(f"\n{pad}]" if count else "]")
+    return count
+
+
+def export_catalog(db: Session, f: TextIO, default_category: str, fmt: str = FORMAT_INDENTED) -> tuple[int, int]:
+    """Stream the catalog to ``f`` and return the number of categories and mods written."""
+    if fmt == FORMAT_JSONL:
+        category_count = mod_count = 0
+        for record in iter_categories(db):
+            f.write(json.dumps({"type": "category", **record}, ensure_ascii=False) + "\n")
+            category_count += 1
+        for record in iter_mods(db, default_category):
+            f.write(json.dumps({"type": "mod", **record}, ensure_ascii=False) + "\n")
+            mod_count += 1
+        return category_count, mod_count
+
+    indent = 4 if fmt == FORMAT_INDENTED else None
+    separator = ",\n" if indent else ","
+    f.write("{\n" if indent else "{")
+    category_count = _write_array(f, "categories", iter_categories(db), indent)
+    f.write(separator)
+    mod_count = _write_array(f, "mods", iter_mods(db, default_category), indent)
+    f.write("\n}" if indent else "}")
+    return category_count, mod_count
+
+
+class CatalogImporter:
+    """Bulk-inserts catalog records into an empty catalog.
+
+    Records can be added in several batches. Dependencies on mods that have
+    not been inserted yet are kept until ``finish``, which inserts them and
+    commits the transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.category_ids: dict[str, int] = {}
+        self.mod_ids: dict[str, int] = {}
+        self.pending_dependencies: list[tuple[int, str]] = []
+        self.category_count = 0
+        self.mod_count = 0
+
+    def clear(self):
+        """Delete all mods, categories and their links."""
+        self.db.execute(delete(mod_dependency))
+        self.db.execute(delete(mod_category))
+        self.db.execute(delete(mod_table))
+        self.db.execute(delete(category_table))
+
+    def _insert_categories(self, names: list[str]):
+        names = [name for name in dict.fromkeys(names) if name not in self.category_ids]
+        if names:
+            rows = self.db.execute(
+                insert(category_table).returning(category_table.c.name, category_table.c.id),
+                [{"name": name} for name in names],
+            )
+            self.category_ids.update(rows.all())
+
+    def add_categories(self, records: list[dict]):
+        self._insert_categories([record["name"] for record in records])
+        self.category_count += len(records)
+
+    def add_mods(self, records: list[dict]):
+        if not records:
+            return
+        if FALLBACK_CATEGORY not in self.category_ids:
+            self._insert_categories([FALLBACK_CATEGORY])
+
+        rows = self.db.execute(
+            insert(mod_table).returning(mod_table.c.name, mod_table.c.id), [_mod_values(record) for record in records]
+        )
+        self.mod_ids.update(rows.all())
+
+        category_links = []
+        dependency_links = []
+        for record in records:
+            mod_id = self.mod_ids[record["name"]]
+            category_ids = [
+                self.category_ids[name] for name in record.get("categories", []) if name in self.category_ids
+            ]
+            for category_id in category_ids or [self.category_ids[FALLBACK_CATEGORY]]:
+                category_links.append({"mod_id": mod_id, "category_id": category_id})
+            for dependency_name in record.get("dependencies", []):
+                dependency_id = self.mod_ids.get(dependency_name)
+                if dependency_id is None:
+                    self.pending_dependencies.append((mod_id, dependency_name))
+                else:
+                    dependency_links.append({"mod_id": mod_id, "dependency_id": dependency_id})
+
+        self.db.execute(insert(mod_category), category_links)
+        if dependency_links:
+            self.db.execute(insert(mod_dependency), dependency_links)
+        self.mod_count += len(records)
+
+    def finish(self):
+        """Insert dependencies on mods added in later batches and commit."""
+        if FALLBACK_CATEGORY not in self.category_ids:
+            self._insert_categories([FALLBACK_CATEGORY])
+        # Dependencies on mods missing from the import are dropped
+        dependency_links = [
+            {"mod_id": mod_id, "dependency_id": self.mod_ids[name]}
+            for mod_id, name in self.pending_dependencies
+            if name in self.mod_ids
+        ]
+        if dependency_links:
+            self.db.execute(insert(mod_dependency), dependency_links)
+        self.pending_dependencies.clear()
+        self.db.commit()
+
+
+def import_catalog(db: Session, data: dict) -> tuple[int, int]:
+    """Replace the catalog with an exported document and return the number of categories and mods."""
+    importer = CatalogImporter(db)
+    try:
+        importer.clear()
+        importer.add_categories(data.get("categories", []))
+        importer.add_mods(data.get("mods", []))
+        importer.finish()
+    except Exception:
+        db.rollback()
+        raise
+    return importer.category_count, importer.mod_count
+
+
+def import_catalog_file(db: Session, f: BinaryIO, progress: Callable[[int], None] | None = None) -> tuple[int, int]:
+    """Replace the catalog with an export read incrementally from ``f``.
+
+    Records are validated and inserted in batches of ``BATCH_SIZE`` as they are
+    read. ``progress`` is called with the number of bytes read after each batch.
+    """
+    importer = CatalogImporter(db)
+    reader = CatalogReader(f)
+    batches: dict[str, list[dict]] = {KIND_CATEGORY: [], KIND_MOD: []}
+
+    def flush():
+        # Categories go first so the mods in the same batch can link to them
+        importer.add_categories(batches[KIND_CATEGORY])
+        importer.add_mods(batches[KIND_MOD])
+        batches[KIND_CATEGORY].clear()
+        batches[KIND_MOD].clear()
+        if progress:
+            progress(reader.bytes_read)
+
+    try:
+        importer.clear()
+        for kind, record in reader:
+            batches[kind].append(record)
+            if len(batches[kind]) >= BATCH_SIZE:
+                flush()
+        flush()
+        importer.finish()
+    except Exception:
+        db.rollback()
+        raise
+    return importer.category_count, importer.mod_count
+
+
+def delete_mod_rows(db: Session, mod_ids: list[int]):
+    """Delete mods together with their category links and dependency edges, without committing."""
+    for start in range(0, len(mod_ids), QUERY_CHUNK_SIZE):
+        chunk = mod_ids[start : start + QUERY_CHUNK_SIZE]
+        db.execute(delete(mod_category).where(mod_category.c.mod_id.in_(chunk)))
+        db.execute(
+            delete(mod_dependency).where(
+                or_(mod_dependency.c.mod_id.in_(chunk), mod_dependency.c.dependency_id.in_(chunk))
+            )
+        )
+        db.execute(delete(mod_table).where(mod_table.c.id.in_(chunk)))
+
+
+@dataclass
+class MergeReport:
+    """Changes applied by a merge import, by name."""
+
+    added_categories: list[str] = field(default_factory=list)
+    removed_categories: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def _links(db: Session, table, column) -> dict[int, set[int]]:
+    links: dict[int, set[int]] = defaultdict(set)
+    for mod_id, target_id in db.execute(select(table.c.mod_id, column)):
+        links[mod_id].add(target_id)
+    return links
+
+
+def merge_catalog(db: Session, data: dict, delete_missing: bool = True) -> MergeReport:
+    """Sync the catalog with an exported document by name.
+
+    Only mods, categories, category links and dependency edges that differ
+    are written, so repeated syncs cost time proportional to the number of
+    changes. Local jar hashes are kept when the document has none.
+    """
+    report = MergeReport()
+    try:
+        # Current state, one projection query per table
+        category_ids = dict(db.execute(select(Category.name, Category.id)).all())
+        current = {row.name: row for row in db.execute(select(mod_table))}
+
+        incoming = {record["name"]: record for record in data.get("mods", [])}
+        incoming_categories = [record["name"] for record in data.get("categories", [])]
+
+        # Categories
+        new_categories = [name for name in dict.fromkeys(incoming_categories) if name not in category_ids]
+        if FALLBACK_CATEGORY not in category_ids and FALLBACK_CATEGORY not in new_categories:
+            new_categories.append(FALLBACK_CATEGORY)
+        if new_categories:
+            rows = db.execute(
+                insert(category_table).returning(category_table.c.name, category_table.c.id),
+                [{"name": name} for name in new_categories],
+            )
+            category_ids.update(rows.all())
+            report.added_categories = sorted(set(new_categories) & set(incoming_categories), key=str.lower)
+
+        # Mods
+        removed_ids = []
+        if delete_missing:
+            removed_ids = [row.id for name, row in current.items() if name not in incoming]
+            report.removed = sorted((name for name in current if name not in incoming), key=str.lower)
+            delete_mod_rows(db, removed_ids)
+        # Read after the delete: SQLite may give a new mod the id of a removed one, and its old links are gone by now
+        current_categories = _links(db, mod_category, mod_category.c.category_id)
+        current_dependencies = _links(db, mod_dependency, mod_dependency.c.dependency_id)
+
+        to_insert = []
+        to_update = []
+        for name, record in incoming.items():
+            values = _mod_values(record)
+            row = current.get(name)
+            if row is None:
+                to_insert.append(values)
+                continue
+            if values["sha256"] is None:
+                values["sha256"] = row.sha256
+            if values["notes"] is None:
+                values["notes"] = ""
+            existing = {column: getattr(row, column) for column in MOD_FIELDS}
+            existing["notes"] = existing["notes"] or ""
+            if any(values[column] != existing[column] for column in MOD_FIELDS):
+                report.updated.append(name)
+                to_update.append({"b_id": row.id, **{column: values[column] for column in MOD_FIELDS}})
+
+        mod_ids = {name: row.id for name, row in current.items() if name in incoming or not delete_missing}
+        if to_insert:
+            rows = db.execute(insert(mod_table).returning(mod_table.c.name, mod_table.c.id), to_insert)
+            mod_ids.update(rows.all())
+        if to_update:
+            db.execute(
+                update(mod_table)
+                .where(mod_table.c.id == bindparam("b_id"))
+                .values({column: bindparam(column) for column in MOD_FIELDS}),
+                to_update,
+            )
+
+        # Category links and dependency edges, as set differences per mod
+        touched = set()
+        link_changes: dict[str, list[dict]] = {"add_category": [], "drop_category": [], "add_dep": [], "drop_dep": []}
+        for name, record in incoming.items():
+            mod_id = mod_ids[name]
+            wanted_categories = {category_ids[c] for c in record.get("categories", []) if c in category_ids}
+            wanted_categories = wanted_categories or {category_ids[FALLBACK_CATEGORY]}
+            wanted_dependencies = {mod_ids[d] for d in record.get("dependencies", []) if d in mod_ids}
+            # Mods inserted by this merge start without links
+            have_categories = current_categories.get(mod_id, set()) if name in current else set()
+            have_dependencies = current_dependencies.get(mod_id, set()) if name in current else set()
+
+            for category_id in wanted_categories - have_categories:
+                link_changes["add_category"].append({"mod_id": mod_id, "category_id": category_id})
+            for category_id in have_categories - wanted_categories:
+                link_changes["drop_category"].append({"b_mod": mod_id, "b_target": category_id})
+            for dependency_id in wanted_dependencies - have_dependencies:
+                link_changes["add_dep"].append({"mod_id": mod_id, "dependency_id": dependency_id})
+            for dependency_id in have_dependencies - wanted_dependencies:
+                link_changes["drop_dep"].append({"b_mod": mod_id, "b_target": dependency_id})
+            if name in current and (wanted_categories != have_categories or wanted_dependencies != have_dependencies):
+                touched.add(name)
+
+        if link_changes["add_category"]:
+            db.execute(insert(mod_category), link_changes["add_category"])
+        if link_changes["drop_category"]:
+            db.execute(
+                delete(mod_category).where(
+                    and_(
+                        mod_category.c.mod_id == bindparam("b_mod"),
+                        mod_category.c.category_id == bindparam("b_target"),
+                    )
+                ),
+                link_changes["drop_category"],
+            )
+        if link_changes["add_dep"]:
+            db.execute(insert(mod_dependency), link_changes["add_dep"])
+        if link_changes["drop_dep"]:
+            db.execute(
+                delete(mod_dependency).where(
+                    and_(
+                        mod_dependency.c.mod_id == bindparam("b_mod"),
+                        mod_dependency.c.dependency_id == bindparam("b_target"),
+                    )
+                ),
+                link_changes["drop_dep"],
+            )
+
+        # Categories absent from the document are removed once no mod uses them
+        if delete_missing and incoming_categories:
+            keep = set(incoming_categories) | {FALLBACK_CATEGORY}
+            used = set(db.scalars(select(mod_category.c.category_id).distinct()))
+            stale = {name: category_id for name, category_id in category_ids.items() if name not in keep}
+            stale_ids = [category_id for category_id in stale.values() if category_id not in used]
+            if stale_ids:
+                db.execute(delete(category_table).where(category_table.c.id.in_(stale_ids)))
+                report.removed_categories = sorted(
+                    (name for name, category_id in stale.items() if category_id in stale_ids), key=str.lower
+                )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    report.added = sorted((values["name"] for values in to_insert), key=str.lower)
+    report.updated = sorted(touched.union(report.updated), key=str.lower)
+    report.unchanged = len(incoming) - len(report.added) - len(report.updated)
+    return report
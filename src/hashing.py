@@ -0,0 +1,135 @@
+"""File hashing helpers."""
+
+import hashlib
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+# Annotations only; see the note on lazy imports in store.py
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def sha256_file(path: Path | str) -> str:
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb", buffering=0) as f:
+        # Small jars do not need a full-size buffer
+        buffer = bytearray(max(1, min(BUFFER_SIZE, os.fstat(f.fileno()).st_size)))
+        view = memoryview(buffer)
+        while size := f.readinto(buffer):
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+
+class HashCache:
+    """Persistent hash cache keyed by (path, size, mtime).
+
+    Entries are loaded in one query and written back on ``save``, so checking
+    an unchanged library only costs one ``stat`` per file. With ``root`` set,
+    only files under it are cached and entries for other paths, such as jars
+    picked from a downloads folder, are dropped on ``save``.
+    """
+
+    def __init__(self, db: "Session", root: Path | None = None):
+        from models import FileHash
+
+        self.db = db
+        self.root = os.path.join(os.path.abspath(root), "") if root else None
+        self.entries = {}
+        for entry in db.query(FileHash):
+            if self.covers(entry.path):
+                self.entries[entry.path] = entry
+            else:
+                db.delete(entry)
+
+    def covers(self, path: Path | str) -> bool:
+        return self.root is None or os.path.abspath(path).startswith(self.root)
+
+    def get(self, path: Path | str, stat: os.stat_result) -> str | None:
+        entry = self.entries.get(str(path))
+        if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            return entry.sha256
+        return None
+
+    def put(self, path: Path | str, stat: os.stat_result, sha256: str) -> None:
+        if not self.covers(path):
+            return
+        key = str(path)
+        entry = self.entries.get(key)
+        if entry is None:
+            from models import FileHash
+
+            entry = FileHash(path=key)
+            self.db.add(entry)
+            self.entries[key] = entry
+        entry.size = stat.st_size
+        entry.mtime_ns = stat.st_mtime_ns
+        entry.sha256 = sha256
+
+    def discard(self, path: Path | str) -> None:
+        entry = self.entries.pop(str(path), None)
+        if entry is not None:
+            self.db.delete(entry)
+
+    def save(self) -> None:
+        self.db.commit()
+
+
+def hash_files(
+    paths: Iterable[Path],
+    cache: HashCache | None = None,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict[Path, str | None]:
+    """Hash files in parallel and return a mapping of path to digest.
+
+    Files whose size and modification time match the cache are not read.
+    Missing files map to None. hashlib releases the GIL while digesting, so a
+    thread pool keeps several disks or cores busy. ``progress`` is called from
+    the calling thread with (done, total) as files finish.
+    """
+    results: dict[Path, str | None] = {}
+    pending: list[tuple[Path, os.stat_result]] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            results[path] = None
+            if cache:
+                cache.discard(path)
+            continue
+        cached = cache.get(path, stat) if cache else None
+        if cached:
+            results[path] = cached
+        else:
+            pending.append((path, stat))
+
+    total = len(results) + len(pending)
+    done = len(results)
+    if progress:
+        progress(done, total)
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) + 2)) as executor:
+        futures = {executor.submit(sha256_file, path): (path, stat) for path, stat in pending}
+        for future in as_completed(futures):
+            path, stat = futures[future]
+            try:
+                sha256 = future.result()
+            except FileNotFoundError:
+                results[path] = None
+            else:
+                results[path] = sha256
+                if cache:
+                    cache.put(path, stat, sha256)
+            done += 1
+            if progress:
+                progress(done, total)
+
+    if cache:
+        cache.save()
+    return results
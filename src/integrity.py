@@ -0,0 +1,56 @@
+"""Integrity verification of stored mod jars."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+import store
+from hashing import HashCache, hash_files
+from models import Mod
+
+
+@dataclass
+class VerificationReport:
+    """Mod names grouped by verification outcome."""
+
+    ok: list[str] = field(default_factory=list)
+    corrupted: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    # Legacy rows stored as mods/<filename> have no checksum to compare against
+    unchecked: list[str] = field(default_factory=list)
+
+
+def verify_mods(
+    db: Session,
+    full: bool = False,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> VerificationReport:
+    """Check every stored jar against the SHA-256 recorded on its mod.
+
+    Blobs shared by several mods are hashed once. Unless ``full`` is set, the
+    persistent hash cache is used so unchanged files are only stat'ed.
+    """
+    rows = db.query(Mod.name, Mod.filename, Mod.sha256).order_by(func.lower(Mod.name)).all()
+    paths = {store.blob_path(sha256) for _, _, sha256 in rows if sha256}
+    cache = None if full else HashCache(db, store.MODS_DIR)
+    digests = hash_files(paths, cache, max_workers=max_workers, progress=progress)
+
+    report = VerificationReport()
+    for name, filename, sha256 in rows:
+        if not sha256:
+            if (store.MODS_DIR / filename).exists():
+                report.unchecked.append(name)
+            else:
+                report.missing.append(name)
+            continue
+        digest = digests[store.blob_path(sha256)]
+        if digest is None:
+            report.missing.append(name)
+        elif digest != sha256:
+            report.corrupted.append(name)
+        else:
+            report.ok.append(name)
+    return report
@@ -1,10 +1,12 @@
 import os
-import shutil
 import sys
+import time
+from collections import defaultdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QAction, QIcon, QResizeEvent
+from PyQt6.QtCore import QSortFilterProxyModel, Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QAction, QBrush, QColor, QIcon, QResizeEvent
 from PyQt6.QtWidgets import (
     QApplication,
     QCheckBox,
@@ -15,57 +17,67 @@ from PyQt6.QtWidgets import (
     QHeaderView,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
     QMainWindow,
     QMenu,
     QMenuBar,
     QMessageBox,
+    QPlainTextEdit,
+    QProgressDialog,
     QPushButton,
     QStatusBar,
     QTableWidget,
     QTableWidgetItem,
+    QTreeView,
     QVBoxLayout,
     QWidget,
 )
 
-from config import load_config, save_config
-from database import SessionLocal, engine
-from models import Base, Category, Mod
+import store
+from catalog_cache import CatalogCache
+from config import diagnostics_enabled, load_config, save_config
+from dependency_tree_model import DependencyTreeModel
+from mod_list_model import ModListModel, filtered
+from startup import PROFILE_STARTUP_FLAG, StartupProfiler
+from tracing import enable_tracing, format_summary, record_span, span, tracer
 from translations import TRANSLATIONS
+from watcher import ModsWatcher
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+if TYPE_CHECKING:
+    from services import ModRecord
 
 
 class ModDialog(QDialog):
-    def __init__(self, parent=None, mod=None):
+    def __init__(self, parent=None, mod: "ModRecord | None" = None):
         super().__init__(parent)
-        # If editing an existing mod, ensure dependencies are loaded before UI setup
+        # If editing an existing mod, keep its fields for the UI setup
+        self.mod = mod
         if mod:
-            with SessionLocal() as db:
-                # Make sure mod is attached to the current session and dependencies are loaded
-                self.mod = db.merge(mod)
-                # Force loading of all relationships to avoid detached instance errors
-                _ = self.mod.dependencies
-                _ = self.mod.categories
-                # Store necessary attributes to avoid detached instance issues
-                self.mod_name = self.mod.name
-                self.mod_filename = self.mod.filename
-                self.mod_is_translated = self.mod.is_translated
-                self.mod_client_required = self.mod.client_required
-                self.mod_server_required = self.mod.server_required
-                self.mod_notes = self.mod.notes
-                self.mod_id = self.mod.id
-                # Store dependencies and categories for later use
-                self.mod_dependencies = [d.name for d in self.mod.dependencies]
-                self.mod_categories = [c.name for c in self.mod.categories] if self.mod.categories else []
+            self.mod_name = mod.name
+            self.mod_filename = mod.filename
+            self.mod_is_translated = mod.is_translated
+            self.mod_client_required = mod.client_required
+            self.mod_server_required = mod.server_required
+            self.mod_notes = mod.notes
+            self.mod_id = mod.mod_id
+            self.mod_dependency_ids = mod.dependency_ids
+            self.mod_categories = mod.categories
         else:
-            self.mod = None
-            self.mod_dependencies = []
+            self.mod_dependency_ids = []
             self.mod_categories = []
 
-        self.last_selected_file = None
+        self.last_selected_file: str | None = None
+        # SHA-256 of the selected jar and the (size, mtime) it was computed for
+        self.last_selected_sha256: str | None = None
+        self.last_selected_stat: tuple[int, int] | None = None
+        # Dependencies moved to the selected list from the metadata of the selected jar
+        self.auto_dependencies: set[int] = set()
         self.translations = parent.translations if parent else TRANSLATIONS["en"]
+        # Reads share the main window's cache, so reopening the dialog does not query again
+        # A dialog without a window has a cache of its own, closed with the dialog
+        self.owns_catalog = parent is None
+        self.catalog = CatalogCache() if self.owns_catalog else parent.catalog
         self.setWindowTitle(self.translations["add_edit_mod_title"])
         self.setup_ui()
 
@@ -124,32 +136,47 @@ class ModDialog(QDialog):
         dependency_label = QLabel(self.translations["label_dependencies"])
         layout.addWidget(dependency_label)
 
+        # Filter applied to both lists
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel(self.translations["label_search"]))
+        self.dependency_filter = QLineEdit()
+        self.dependency_filter.textChanged.connect(self.filter_dependencies)
+        filter_layout.addWidget(self.dependency_filter)
+        layout.addLayout(filter_layout)
+
         # Create horizontal layout for lists and buttons
         lists_layout = QHBoxLayout()
 
+        # Both lists are views over sorted models of (id, name), so large catalogs open and move quickly
+        self.available_model = ModListModel(self)
+        self.selected_model = ModListModel(self)
+
         # Available modules list
         available_layout = QVBoxLayout()
         available_layout.addWidget(QLabel(self.translations["label_available_modules"]))
-        self.available_list = QListWidget()
-        self.available_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        self.available_list = QListView()
+        self.available_proxy = filtered(self.available_model, self)
+        self.available_list.setModel(self.available_proxy)
+        self.available_list.setUniformItemSizes(True)
+        self.available_list.setSelectionMode(QListView.SelectionMode.MultiSelection)
         self.available_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: 1px solid #BDBDBD;
                 border-radius: 4px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 4px;
                 border-radius: 2px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #1976D2;  /* Use dark blue for selection background */
                 color: white;
             }
-            QListWidget::item:selected:!active {
+            QListView::item:selected:!active {
                 background-color: #42A5F5;  /* Use medium blue when not active */
                 color: white;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #E3F2FD;  /* Use very light blue for hover */
                 color: black;  /* Use black text for hover */
             }
@@ -194,26 +221,29 @@ class ModDialog(QDialog):
         # Selected modules list
         selected_layout = QVBoxLayout()
         selected_layout.addWidget(QLabel(self.translations["label_selected"]))
-        self.selected_list = QListWidget()
-        self.selected_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        self.selected_list = QListView()
+        self.selected_proxy = filtered(self.selected_model, self)
+        self.selected_list.setModel(self.selected_proxy)
+        self.selected_list.setUniformItemSizes(True)
+        self.selected_list.setSelectionMode(QListView.SelectionMode.MultiSelection)
         self.selected_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: 1px solid #BDBDBD;
                 border-radius: 4px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 4px;
                 border-radius: 2px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #1976D2;  /* Use dark blue for selection background */
                 color: white;
             }
-            QListWidget::item:selected:!active {
+            QListView::item:selected:!active {
                 background-color: #42A5F5;  /* Use medium blue when not active */
                 color: white;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #E3F2FD;  /* Use very light blue for hover */
                 color: black;  /* Use black text for hover */
             }
@@ -255,6 +285,9 @@ class ModDialog(QDialog):
         self.load_mods()
 
     def browse_file(self):
+        from database import SessionLocal
+        from scanner import resolve_dependencies, scan_jars
+
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             self.translations["dialog_choose_mod"],
@@ -271,70 +304,107 @@ class ModDialog(QDialog):
             # Always update module name when file is changed
             # This allows the name to be updated even when switching between different files
             name = os.path.splitext(filename)[0].replace("_", " ")
+
+            # Dependencies picked from the previous jar do not apply to this one
+            self.available_model.add(self.selected_model.take(self.auto_dependencies))
+            self.auto_dependencies = set()
+
+            # Prefer the name and dependencies declared in the jar's loader metadata
+            with SessionLocal() as db:
+                try:
+                    # Taken first, so a change while the jar is hashed makes the hash stale
+                    stat = os.stat(file_path)
+                    sha256, metadata = scan_jars([Path(file_path)], db)[Path(file_path)]
+                except Exception:
+                    sha256, metadata = None, None
+                # Saving reuses the hash while the file is unchanged
+                self.last_selected_sha256 = sha256
+                self.last_selected_stat = (stat.st_size, stat.st_mtime_ns) if sha256 else None
+                if metadata:
+                    name = metadata.name or name
+                    self.auto_dependencies = self.select_dependencies(resolve_dependencies(db, metadata.dependencies))
+
             self.name_edit.setText(name)
 
     def load_categories(self):
-        with SessionLocal() as db:
-            # Ensure "Uncategorized" category exists
-            uncategorized = db.query(Category).filter(Category.name == self.translations["label_uncategorized"]).first()
-            if not uncategorized:
-                uncategorized = Category(name=self.translations["label_uncategorized"])
-                db.add(uncategorized)
-                db.commit()
-
-            # Load all categories ordered by name (case-insensitive)
-            from sqlalchemy.sql import func
-
-            categories = db.query(Category).order_by(func.lower(Category.name)).all()
-            self.category_combo.clear()
-            for category in categories:
-                self.category_combo.addItem(category.name)
-
-            # If no category is selected, default to "Uncategorized"
-            if self.category_combo.count() > 0 and not self.mod:
-                uncategorized_index = self.category_combo.findText(self.translations["label_uncategorized"])
-                if uncategorized_index >= 0:
-                    self.category_combo.setCurrentIndex(uncategorized_index)
+        # The "Uncategorized" category is created if missing
+        names = self.catalog.category_names(self.translations["label_uncategorized"], create_default=True)
+        self.category_combo.clear()
+        names = sorted(names, key=str.lower)
+        self.category_combo.addItems(names)
+
+        # If no category is selected, default to "Uncategorized"
+        if self.category_combo.count() > 0 and not self.mod:
+            uncategorized_index = self.category_combo.findText(self.translations["label_uncategorized"])
+            if uncategorized_index >= 0:
+                self.category_combo.setCurrentIndex(uncategorized_index)
 
     def load_mods(self):
-        with SessionLocal() as db:
-            # Get all mods ordered by name (case-insensitive)
-            from sqlalchemy.sql import func
-
-            mods = db.query(Mod).order_by(func.lower(Mod.name)).all()
-            self.available_list.clear()
-            self.selected_list.clear()
+        # The list models sort by name themselves
+        mods = self.catalog.mod_names()
 
-            for mod in mods:
-                # Don't show self as dependency option
-                if self.mod and mod.id == self.mod_id:
-                    continue
-
-                # If in edit mode and module is a dependency, add to selected list
-                if self.mod and mod.name in self.mod_dependencies:
-                    self.selected_list.addItem(mod.name)
-                else:
-                    # Otherwise add to available list
-                    self.available_list.addItem(mod.name)
+        # Don't show self as dependency option
+        if self.mod:
+            mods = [(mod_pk, name) for mod_pk, name in mods if mod_pk != self.mod_id]
+
+        # If in edit mode, the mod's dependencies start in the selected list
+        selected = set(self.mod_dependency_ids)
+        self.available_model.set_items((mod_pk, name) for mod_pk, name in mods if mod_pk not in selected)
+        self.selected_model.set_items((mod_pk, name) for mod_pk, name in mods if mod_pk in selected)
+
+    def filter_dependencies(self, text: str):
+        for proxy in (self.available_proxy, self.selected_proxy):
+            proxy.setFilterFixedString(text)
+
+    def select_dependencies(self, ids: set[int]) -> set[int]:
+        """Move the mods with the given ids from the available list to the selected list and return those moved."""
+        moved = self.available_model.take(ids)
+        self.selected_model.add(moved)
+        return {mod_pk for mod_pk, _ in moved}
+
+    def move_selection(self, view: QListView, proxy: QSortFilterProxyModel, source: ModListModel, target: ModListModel):
+        """Move the mods selected in ``view``, shown through ``proxy``, from ``source`` to ``target`` in one batch."""
+        selection = view.selectionModel()
+        if not selection:
+            return
+        # Ranges rather than single indexes, so selecting everything stays cheap
+        ranges = proxy.mapSelectionToSource(selection.selection())
+        ids = {
+            source.items[row][0]
+            for selected in (ranges[i] for i in range(len(ranges)))
+            for row in range(selected.top(), selected.bottom() + 1)
+        }
+        target.add(source.take(ids))
 
     def add_dependencies(self):
         # Move selected items from available list to selected list
-        for item in self.available_list.selectedItems():
-            self.available_list.takeItem(self.available_list.row(item))
-            self.selected_list.addItem(item.text())
+        self.move_selection(self.available_list, self.available_proxy, self.available_model, self.selected_model)
 
     def remove_dependencies(self):
         # Move selected items from selected list back to available list
-        for item in self.selected_list.selectedItems():
-            self.selected_list.takeItem(self.selected_list.row(item))
-            self.available_list.addItem(item.text())
+        self.move_selection(self.selected_list, self.selected_proxy, self.selected_model, self.available_model)
 
     def manage_categories(self):
         dialog = CategoryManagerDialog(self)
         if dialog.exec():
             self.load_categories()  # Reload category list
 
+    def selected_file_sha256(self) -> str | None:
+        """The hash from browsing, if the selected jar has not changed since."""
+        if not self.last_selected_file or not self.last_selected_stat:
+            return None
+        try:
+            stat = os.stat(self.last_selected_file)
+        except OSError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != self.last_selected_stat:
+            return None
+        return self.last_selected_sha256
+
     def accept(self):
+        from database import SessionLocal, profile_operation
+        from services import DuplicateNameError, ModRecord, NotFoundError, save_mod
+
         name = self.name_edit.text()
         filename = self.filename_edit.text()
         notes = self.notes_edit.text()
@@ -352,120 +422,59 @@ class ModDialog(QDialog):
             filename = filename + ".jar"
             self.filename_edit.setText(filename)
 
-        # Create mods directory (if not exists)
-        mods_dir = Path("mods")
-        mods_dir.mkdir(exist_ok=True)
-
-        with SessionLocal() as db:
-            if self.mod:
-                # Update existing module
-                mod = db.query(Mod).filter(Mod.id == self.mod_id).first()
-                if not mod:
-                    QMessageBox.critical(
-                        self, self.translations["title_error"], self.translations["msg_module_not_found"]
-                    )
-                    return
-
-                mod.name = name
-                mod.filename = filename
-                mod.is_translated = self.is_translated.isChecked()
-                mod.client_required = self.client_required.isChecked()
-                mod.server_required = self.server_required.isChecked()
-                mod.notes = notes
-
-                # Update categories
-                selected_category = self.category_combo.currentText()
-                if selected_category:
-                    category = db.query(Category).filter(Category.name == selected_category).first()
-                    if category:
-                        mod.categories = [category]
-
-                # Update dependencies
-                dependencies = []
-                for i in range(self.selected_list.count()):
-                    item = self.selected_list.item(i)
-                    if item:  # Ensure item is not None
-                        dependency = db.query(Mod).filter(Mod.name == item.text()).first()
-                        if dependency:
-                            dependencies.append(dependency)
-                mod.dependencies = dependencies
-
-                # Rename file
-                old_path = mods_dir / self.mod_filename
-                new_path = mods_dir / filename
-                try:
-                    if old_path != new_path:  # Only rename when filename actually changes
-                        if new_path.exists():
-                            QMessageBox.warning(
-                                self,
-                                self.translations["title_error"],
-                                self.translations["msg_file_exists"].format(filename),
-                            )
-                            return
-                        old_path.rename(new_path)
-                except Exception as e:
-                    QMessageBox.critical(
-                        self,
-                        self.translations["title_error"],
-                        self.translations["msg_error_rename_file"].format(str(e)),
-                    )
-                    return
-
-            else:
-                target_path = mods_dir / filename
-                try:
-                    source_path = self.last_selected_file
-                    if not source_path:
-                        QMessageBox.warning(
-                            self,
-                            self.translations["title_warning"],
-                            self.translations["msg_choose_module_file"],
-                        )
-                        return
-                    shutil.copy2(source_path, target_path)
-                except Exception as e:
-                    QMessageBox.critical(
-                        self,
-                        self.translations["title_error"],
-                        self.translations["msg_error_copy_file"].format(str(e)),
-                    )
-                    return
-
-                # Add module
-                mod = Mod(
-                    name=name,
-                    filename=filename,
-                    is_translated=self.is_translated.isChecked(),
-                    client_required=self.client_required.isChecked(),
-                    server_required=self.server_required.isChecked(),
-                    notes=notes,
-                )
+        if not self.mod and not self.last_selected_file:
+            QMessageBox.warning(
+                self,
+                self.translations["title_warning"],
+                self.translations["msg_choose_module_file"],
+            )
+            return
 
-                # Set categories
-                selected_category = self.category_combo.currentText()
-                if selected_category:
-                    category = db.query(Category).filter(Category.name == selected_category).first()
-                    if category:
-                        mod.categories = [category]
+        # Create mods directory (if not exists)
+        store.MODS_DIR.mkdir(exist_ok=True)
+
+        selected_category = self.category_combo.currentText()
+        dependencies = self.selected_model.names()
+
+        record = ModRecord(
+            name=name,
+            filename=filename,
+            is_translated=self.is_translated.isChecked(),
+            client_required=self.client_required.isChecked(),
+            server_required=self.server_required.isChecked(),
+            notes=notes,
+            categories=[selected_category] if selected_category else [],
+            dependencies=dependencies,
+            mod_id=self.mod_id if self.mod else None,
+        )
 
-                # Set dependencies
-                dependencies = []
-                for i in range(self.selected_list.count()):
-                    item = self.selected_list.item(i)
-                    if item:  # Ensure item is not None
-                        dependency = db.query(Mod).filter(Mod.name == item.text()).first()
-                        if dependency:
-                            dependencies.append(dependency)
-                mod.dependencies = dependencies
+        try:
+            with span("save_mod", new=not self.mod), profile_operation("save"), SessionLocal() as db:
+                save_mod(db, record, source_path=self.last_selected_file, source_sha256=self.selected_file_sha256())
+        except DuplicateNameError as e:
+            message_key = "msg_file_exists" if e.field_name == "filename" else "msg_mod_exists"
+            QMessageBox.warning(self, self.translations["title_error"], self.translations[message_key].format(e.value))
+            return
+        except NotFoundError:
+            QMessageBox.critical(self, self.translations["title_error"], self.translations["msg_module_not_found"])
+            return
+        except OSError as e:
+            # Copying a new jar or moving a legacy one into the content store failed
+            message_key = "msg_error_rename_file" if self.mod else "msg_error_copy_file"
+            QMessageBox.critical(self, self.translations["title_error"], self.translations[message_key].format(str(e)))
+            return
 
-                db.add(mod)
+        super().accept()
 
-            db.commit()
-            super().accept()
+    def done(self, result: int):
+        # Accepting, rejecting and closing all end here
+        if self.owns_catalog:
+            self.catalog.close()
+        super().done(result)
 
 
 class CategoryDialog(QDialog):
-    def __init__(self, parent=None, category=None):
+    def __init__(self, parent=None, category: str | None = None):
         super().__init__(parent)
         self.category = category
         self.translations = parent.translations if parent else TRANSLATIONS["en"]
@@ -497,7 +506,7 @@ class CategoryDialog(QDialog):
         self.setLayout(layout)
 
         if self.category:
-            self.name_edit.setText(self.category.name)
+            self.name_edit.setText(self.category)
 
     def get_category_name(self):
         return self.name_edit.text()
@@ -543,45 +552,36 @@ class CategoryManagerDialog(QDialog):
 
     def load_categories(self):
         """Load categories from database"""
+        from database import SessionLocal
+        from services import category_names
+
         self.category_list.clear()
         with SessionLocal() as db:
-            # Ensure default category exists
-            default_category = (
-                db.query(Category).filter(Category.name == self.translations["label_uncategorized"]).first()
-            )
-            if not default_category:
-                default_category = Category(name=self.translations["label_uncategorized"])
-                db.add(default_category)
-                db.commit()
-
-            # Load all categories ordered by name (case-insensitive)
-            from sqlalchemy.sql import func
-
-            categories = db.query(Category).order_by(func.lower(Category.name)).all()
-
-            # First add Default category
-            for category in categories:
-                if category.name == self.translations["label_uncategorized"]:
-                    self.category_list.addItem(category.name)
-                    break
-
-            # Then add all other categories
-            for category in categories:
-                if category.name != self.translations["label_uncategorized"]:
-                    self.category_list.addItem(category.name)
+            # Default category first, created if missing
+            self.category_list.addItems(category_names(db, self.translations["label_uncategorized"]))
 
     def add_category(self):
+        from database import SessionLocal
+        from services import DuplicateNameError, add_category
+
         dialog = CategoryDialog(self)
         if dialog.exec():
             name = dialog.get_category_name()
             if name:
-                with SessionLocal() as db:
-                    category = Category(name=name)
-                    db.add(category)
-                    db.commit()
+                try:
+                    with SessionLocal() as db:
+                        add_category(db, name)
+                except DuplicateNameError:
+                    QMessageBox.warning(
+                        self, self.translations["title_error"], self.translations["msg_category_exists"].format(name)
+                    )
+                    return
                 self.load_categories()
 
     def edit_category(self):
+        from database import SessionLocal
+        from services import DuplicateNameError, NotFoundError, rename_category
+
         current_item = self.category_list.currentItem()
         if not current_item:
             QMessageBox.warning(
@@ -600,46 +600,44 @@ class CategoryManagerDialog(QDialog):
             )
             return
 
-        with SessionLocal() as db:
-            # Get the category to edit
-            category = db.query(Category).filter(Category.name == current_item.text()).first()
-            if not category:
-                QMessageBox.warning(self, self.translations["title_error"], self.translations["msg_module_not_found"])
-                return
+        # Create dialog with the category name
+        dialog = CategoryDialog(self, current_item.text())
+        if dialog.exec():
+            new_name = dialog.get_category_name()
+            if new_name and new_name != current_item.text():
+                try:
+                    with SessionLocal() as db:
+                        rename_category(db, current_item.text(), new_name)
+                except NotFoundError:
+                    QMessageBox.warning(
+                        self, self.translations["title_error"], self.translations["msg_module_not_found"]
+                    )
+                    return
+                except DuplicateNameError:
+                    QMessageBox.warning(
+                        self,
+                        self.translations["title_error"],
+                        self.translations["msg_category_exists"].format(new_name),
+                    )
+                    return
+
+                # Reload categories
+                self.load_categories()
 
-            # Create dialog with the category
-            dialog = CategoryDialog(self, category)
-            if dialog.exec():
-                new_name = dialog.get_category_name()
-                if new_name and new_name != category.name:
-                    # Check if the new name already exists
-                    existing = db.query(Category).filter(Category.name == new_name).first()
-                    if existing:
-                        QMessageBox.warning(
-                            self,
-                            self.translations["title_error"],
-                            self.translations["msg_category_exists"].format(new_name),
-                        )
-                        return
-
-                    # Update category name
-                    category.name = new_name
-                    db.commit()
-
-                    # Reload categories
-                    self.load_categories()
-
-                    # Signal that changes were made
-                    self.accept()
-
-                    # Reload mods in the main window to show updated category names
-                    from typing import cast
-
-                    parent = cast(MainWindow, self.parent())
-                    if isinstance(parent, MainWindow):
-                        parent.load_mods()
+                # Signal that changes were made
+                self.accept()
+
+                # Reload mods in the main window to show updated category names
+                from typing import cast
+
+                parent = cast(MainWindow, self.parent())
+                if isinstance(parent, MainWindow):
+                    parent.load_mods()
 
     def delete_category(self):
+        from database import SessionLocal
+        from services import NotFoundError, delete_category
+
         current_item = self.category_list.currentItem()
         if not current_item:
             QMessageBox.warning(
@@ -666,45 +664,25 @@ class CategoryManagerDialog(QDialog):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            with SessionLocal() as db:
-                # Get the category to delete
-                category = db.query(Category).filter(Category.name == current_item.text()).first()
-                if category:
-                    # Get the "Default" category
-                    default_category = (
-                        db.query(Category).filter(Category.name == self.translations["label_uncategorized"]).first()
-                    )
-
-                    if default_category:
-                        # Get all mods in this category
-                        mods_to_update = db.query(Mod).filter(Mod.categories.any(id=category.id)).all()
-
-                        # Move all mods to "Default"
-                        for mod in mods_to_update:
-                            # Remove all existing categories
-                            mod.categories.clear()
-                            # Add default category
-                            mod.categories.append(default_category)
-
-                        # Commit the changes to mods
-                        db.commit()
-
-                    # Delete the category
-                    db.delete(category)
-                    db.commit()
+            try:
+                with SessionLocal() as db:
+                    # Mods left without a category move to "Uncategorized"
+                    delete_category(db, current_item.text(), self.translations["label_uncategorized"])
+            except NotFoundError:
+                return
 
-                    # Reload categories
-                    self.load_categories()
+            # Reload categories
+            self.load_categories()
 
-                    # Signal that changes were made by accepting the dialog
-                    self.accept()
+            # Signal that changes were made by accepting the dialog
+            self.accept()
 
-                    # Reload mods in the main window
-                    from typing import cast
+            # Reload mods in the main window
+            from typing import cast
 
-                    parent = cast(MainWindow, self.parent())
-                    if isinstance(parent, MainWindow):
-                        parent.load_mods()
+            parent = cast(MainWindow, self.parent())
+            if isinstance(parent, MainWindow):
+                parent.load_mods()
 
     def closeEvent(self, event):  # noqa: N802
         """Override close event to notify parent to reload mods"""
@@ -742,13 +720,240 @@ class AboutDialog(QDialog):
         self.setLayout(layout)
 
 
+class ReconcileDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.translations = parent.translations if parent else TRANSLATIONS["en"]
+        self.setWindowTitle(self.translations["reconcile_title"])
+        # Whether mods were removed and the main window has to reload
+        self.mods_changed = False
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        # Files in the mods folder that no mod points at
+        layout.addWidget(QLabel(self.translations["label_orphaned_files"]))
+        self.orphan_list = QListWidget()
+        layout.addWidget(self.orphan_list)
+        delete_orphans_button = QPushButton(self.translations["button_delete_orphans"])
+        delete_orphans_button.clicked.connect(self.delete_orphans)
+        layout.addWidget(delete_orphans_button)
+
+        # Mods whose jar is not in the mods folder
+        layout.addWidget(QLabel(self.translations["label_missing_mods"]))
+        self.missing_list = QListWidget()
+        layout.addWidget(self.missing_list)
+        remove_missing_button = QPushButton(self.translations["button_remove_missing"])
+        remove_missing_button.clicked.connect(self.remove_missing)
+        layout.addWidget(remove_missing_button)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        close_button = QPushButton(self.translations["button_close"])
+        close_button.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.load_report()
+
+    def load_report(self):
+        """Scan the mods folder and list orphaned files and missing mods"""
+        from database import SessionLocal
+        from reconcile import build_report
+
+        with SessionLocal() as db:
+            self.report = build_report(db)
+        self.orphan_list.clear()
+        self.orphan_list.addItems(self.report.orphaned_files)
+        self.missing_list.clear()
+        self.missing_list.addItems([name for _, name in self.report.missing_mods])
+
+    def delete_orphans(self):
+        from reconcile import delete_orphaned_files
+
+        if not self.report.orphaned_files:
+            return
+        reply = QMessageBox.question(
+            self,
+            self.translations["title_confirm_delete"],
+            self.translations["msg_confirm_delete_orphans"].format(len(self.report.orphaned_files)),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        errors = delete_orphaned_files(self.report.orphaned_files)
+        if errors:
+            QMessageBox.warning(
+                self,
+                self.translations["title_error"],
+                self.translations["msg_error_delete_file"].format("\n".join(errors)),
+            )
+        self.load_report()
+
+    def remove_missing(self):
+        from database import SessionLocal
+        from reconcile import delete_mods
+
+        if not self.report.missing_mods:
+            return
+        reply = QMessageBox.question(
+            self,
+            self.translations["title_confirm_delete"],
+            self.translations["msg_confirm_remove_missing"].format(len(self.report.missing_mods)),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        with SessionLocal() as db:
+            kept = delete_mods(db, [mod_id for mod_id, _ in self.report.missing_mods])
+        self.mods_changed = True
+        self.load_report()
+        if kept:
+            QMessageBox.warning(
+                self,
+                self.translations["title_unable_delete"],
+                self.translations["msg_missing_kept"].format(
+                    len(kept), "\n".join(f"{name}: {', '.join(required_by)}" for name, required_by in kept.items())
+                ),
+            )
+
+
+class ReportDialog(QDialog):
+    """Read-only diagnostics report, such as the SQL profile or the memory report."""
+
+    def __init__(self, title: str, build_report, reset, default_file: str, parent=None):
+        super().__init__(parent)
+        self.build_report = build_report
+        self.reset_report = reset
+        self.default_file = default_file
+        self.translations = parent.translations if parent else TRANSLATIONS["en"]
+        self.setWindowTitle(title)
+        self.resize(900, 500)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        self.report_edit = QPlainTextEdit()
+        self.report_edit.setReadOnly(True)
+        self.report_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.report_edit)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton(self.translations["button_refresh"])
+        refresh_button.clicked.connect(self.load_report)
+        reset_button = QPushButton(self.translations["button_reset"])
+        reset_button.clicked.connect(self.reset)
+        save_button = QPushButton(self.translations["button_save_report"])
+        save_button.clicked.connect(self.save_report)
+        close_button = QPushButton(self.translations["button_close"])
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(save_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.load_report()
+
+    def load_report(self):
+        self.report_edit.setPlainText(self.build_report())
+
+    def reset(self):
+        self.reset_report()
+        self.load_report()
+
+    def save_report(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            self.translations["button_save_report"],
+            self.default_file,
+            self.translations["dialog_txt_filter"],
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(self.build_report() + "\n")
+        except OSError as e:
+            QMessageBox.critical(self, self.translations["title_error"], str(e))
+
+
+def query_mods(default_category: str) -> list[dict]:
+    """Catalog rows for the mod table, as records rather than ORM objects."""
+    from database import SessionLocal, profile_operation
+    from exchange import iter_mods
+
+    with profile_operation("load"), SessionLocal() as db:
+        return list(iter_mods(db, default_category))
+
+
+class CatalogLoader(QThread):
+    """Prepares the database and reads the catalog away from the GUI thread.
+
+    No span is opened here: the listeners of a finished span update widgets, so
+    the read is timed by hand and recorded by the GUI thread when it arrives.
+    """
+
+    # The records, how long preparing and reading them took in milliseconds, and the cache generation
+    loaded = pyqtSignal(list, float, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, default_category: str, catalog: CatalogCache, parent=None):
+        super().__init__(parent)
+        self.default_category = default_category
+        self.catalog = catalog
+        # The records are only cached if nothing was committed while they were read
+        self.generation = catalog.generation
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            # SQLAlchemy and the models are imported here for the first time
+            from database import init_db
+
+            init_db()
+            self.catalog.listen()
+            records = query_mods(self.default_category)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.loaded.emit(records, (time.perf_counter() - start) * 1000, self.generation)
+
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted when a catalog load started by load_mods_async finishes or fails
+    catalog_ready = pyqtSignal()
+
+    def __init__(self, load_async: bool = False):
+        """With ``load_async`` the caller shows the window and then calls ``load_mods_async``."""
         super().__init__()
         # Load saved language from config
         self.config = load_config()
         self.current_language = self.config.get("language", "en")
         self.translations = TRANSLATIONS[self.current_language]  # Translation dictionary
+        # Diagnostics, opt-in through MMDM_* environment variables or the config (see config.DIAGNOSTICS_ENV)
+        self.query_profiler = None
+        if diagnostics_enabled(self.config, "sql_profile"):
+            from database import SLOW_QUERY_MS, enable_profiling
+
+            self.query_profiler = enable_profiling(self.config.get("slow_query_ms", SLOW_QUERY_MS))
+        if diagnostics_enabled(self.config, "trace"):
+            enable_tracing()
+        # tracemalloc snapshots around the heaviest spans; slows them down considerably
+        self.memory_profiler = None
+        if diagnostics_enabled(self.config, "memory_profile"):
+            from memprofile import enable_memory_profiling
+
+            self.memory_profiler = enable_memory_profiling()
         self.setWindowTitle(self.translations["main_window_title"])
         # Set window icon
         icon_path = Path(__file__).parent.parent / "static" / "mmdm-icon.png"
@@ -761,8 +966,40 @@ class MainWindow(QMainWindow):
             static_dir.mkdir(exist_ok=True)
         # Set default window size
         self.resize(800, 600)
+        # Table rows by mod name and by jar name inside the mods folder
+        self.mod_rows: dict[str, int] = {}
+        self.rows_by_disk_name: dict[str, list[int]] = defaultdict(list)
+        # Catalog reads of this window and its dialogs; dropped whenever something is committed
+        self.catalog = CatalogCache()
+        # Reconcile jars added or removed outside the application
+        self.mods_watcher = ModsWatcher(parent=self)
+        self.mods_watcher.changed.connect(self.on_mods_changed)
         self.setup_ui()
-        self.load_mods()
+        # Duration of the last traced action, kept beside the status messages
+        self.trace_label = QLabel()
+        if tracer.enabled:
+            status_bar = self.statusBar()
+            if status_bar:
+                status_bar.addPermanentWidget(self.trace_label)
+            tracer.listeners.append(self.show_trace_summary)
+        self.catalog_loader: CatalogLoader | None = None
+        if not load_async:
+            from database import init_db
+
+            init_db()
+            self.load_mods()
+
+    def show_trace_summary(self, root):
+        self.trace_label.setText(self.translations["msg_last_action"].format(format_summary(root)))
+
+    def closeEvent(self, event):  # noqa: N802
+        if self.show_trace_summary in tracer.listeners:
+            tracer.listeners.remove(self.show_trace_summary)
+        # A running QThread must not be destroyed with the window
+        if self.catalog_loader:
+            self.catalog_loader.wait()
+        self.catalog.close()
+        super().closeEvent(event)
 
     def setup_ui(self):
         # Set menu bar
@@ -783,6 +1020,21 @@ class MainWindow(QMainWindow):
         delete_mod_action: QAction | None = file_menu.addAction(self.translations["menu_delete_mod"])
         if delete_mod_action:
             delete_mod_action.triggered.connect(self.delete_mod)
+        import_folder_action: QAction | None = file_menu.addAction(self.translations["menu_import_folder"])
+        if import_folder_action:
+            import_folder_action.triggered.connect(self.import_mods_folder)
+        file_menu.addSeparator()
+        create_snapshot_action: QAction | None = file_menu.addAction(self.translations["menu_create_snapshot"])
+        if create_snapshot_action:
+            create_snapshot_action.triggered.connect(self.create_snapshot)
+        restore_snapshot_action: QAction | None = file_menu.addAction(self.translations["menu_restore_snapshot"])
+        if restore_snapshot_action:
+            restore_snapshot_action.triggered.connect(self.restore_snapshot)
+        compress_snapshots_action: QAction | None = file_menu.addAction(self.translations["menu_compress_snapshots"])
+        if compress_snapshots_action:
+            compress_snapshots_action.setCheckable(True)
+            compress_snapshots_action.setChecked(self.config.get("backup_compress", False))
+            compress_snapshots_action.toggled.connect(self.set_snapshot_compression)
         file_menu.addSeparator()
         exit_action: QAction | None = file_menu.addAction(self.translations["menu_exit"])
         if exit_action:
@@ -798,6 +1050,21 @@ class MainWindow(QMainWindow):
         manage_categories_action: QAction | None = manage_menu.addAction(self.translations["menu_manage_categories"])
         if manage_categories_action:
             manage_categories_action.triggered.connect(self.manage_categories)
+        manage_menu.addSeparator()
+        verify_files_action: QAction | None = manage_menu.addAction(self.translations["menu_verify_files"])
+        if verify_files_action:
+            verify_files_action.triggered.connect(self.verify_files)
+        reconcile_action: QAction | None = manage_menu.addAction(self.translations["menu_reconcile"])
+        if reconcile_action:
+            reconcile_action.triggered.connect(self.reconcile_mods_folder)
+        if self.query_profiler:
+            sql_profile_action: QAction | None = manage_menu.addAction(self.translations["menu_sql_profile"])
+            if sql_profile_action:
+                sql_profile_action.triggered.connect(self.show_sql_profile)
+        if self.memory_profiler:
+            memory_report_action: QAction | None = manage_menu.addAction(self.translations["menu_memory_report"])
+            if memory_report_action:
+                memory_report_action.triggered.connect(self.show_memory_report)
 
         # Export menu
         export_menu: QMenu | None = menubar.addMenu(self.translations["menu_export"])
@@ -810,6 +1077,18 @@ class MainWindow(QMainWindow):
             if export_server_action:
                 export_server_action.triggered.connect(lambda: self.export_mods("server"))
 
+            export_client_delta_action: QAction | None = export_menu.addAction(
+                self.translations["menu_export_client_delta"]
+            )
+            if export_client_delta_action:
+                export_client_delta_action.triggered.connect(lambda: self.export_delta_pack("client"))
+
+            export_server_delta_action: QAction | None = export_menu.addAction(
+                self.translations["menu_export_server_delta"]
+            )
+            if export_server_delta_action:
+                export_server_delta_action.triggered.connect(lambda: self.export_delta_pack("server"))
+
             export_menu.addSeparator()
 
             export_json_action: QAction | None = export_menu.addAction(self.translations["menu_export_json"])
@@ -824,6 +1103,10 @@ class MainWindow(QMainWindow):
             if import_json_action:
                 import_json_action.triggered.connect(self.import_json)
 
+            compare_catalogs_action: QAction | None = export_menu.addAction(self.translations["menu_compare_catalogs"])
+            if compare_catalogs_action:
+                compare_catalogs_action.triggered.connect(self.compare_catalogs)
+
         # Language menu
         language_menu: QMenu | None = menubar.addMenu(self.translations["menu_language"])
         if language_menu:
@@ -906,6 +1189,7 @@ class MainWindow(QMainWindow):
         layout.addLayout(search_layout)
 
         # Module list
+        self.dependency_model = DependencyTreeModel(self.translations, self)
         self.mod_table = QTableWidget()
         self.mod_table.setColumnCount(8)
         self.update_table_headers()
@@ -945,6 +1229,14 @@ class MainWindow(QMainWindow):
         """)
         layout.addWidget(self.mod_table)
 
+        # Shown instead of the table while dependencies are expanded; each node loads its dependencies when opened
+        self.dependency_tree = QTreeView()
+        self.dependency_tree.setModel(self.dependency_model)
+        self.dependency_tree.setUniformRowHeights(True)
+        self.dependency_tree.doubleClicked.connect(self.edit_mod)
+        self.dependency_tree.hide()
+        layout.addWidget(self.dependency_tree)
+
         # Status bar
         status_bar: QStatusBar | None = self.statusBar()
         if status_bar:
@@ -964,6 +1256,7 @@ class MainWindow(QMainWindow):
                 self.translations["header_notes"],
             ]
         )
+        self.dependency_model.set_translations(self.translations)
 
     def update_language_menu(self, triggered_action: QAction, actions: list[QAction]) -> None:
         """Update language menu checkmarks"""
@@ -1009,20 +1302,42 @@ class MainWindow(QMainWindow):
                         action.setText(self.translations["menu_edit_mod"])
                     elif action.text() in ["Delete Module", "刪除模組"]:
                         action.setText(self.translations["menu_delete_mod"])
+                    elif action.text() in ["Import Mods Folder", "匯入模組資料夾"]:
+                        action.setText(self.translations["menu_import_folder"])
+                    elif action.text() in ["Create Snapshot", "建立快照"]:
+                        action.setText(self.translations["menu_create_snapshot"])
+                    elif action.text() in ["Restore Snapshot...", "還原快照..."]:
+                        action.setText(self.translations["menu_restore_snapshot"])
+                    elif action.text() in ["Compress Snapshots", "壓縮快照"]:
+                        action.setText(self.translations["menu_compress_snapshots"])
                     elif action.text() in ["Add Category", "新增分類"]:
                         action.setText(self.translations["menu_add_category"])
                     elif action.text() in ["Manage Categories", "管理分類"]:
                         action.setText(self.translations["menu_manage_categories"])
+                    elif action.text() in ["Verify Mod Files", "驗證模組檔案"]:
+                        action.setText(self.translations["menu_verify_files"])
+                    elif action.text() in ["Reconcile Mods Folder", "核對模組資料夾"]:
+                        action.setText(self.translations["menu_reconcile"])
+                    elif action.text() in ["SQL Profile", "SQL 分析"]:
+                        action.setText(self.translations["menu_sql_profile"])
+                    elif action.text() in ["Memory Report", "記憶體報告"]:
+                        action.setText(self.translations["menu_memory_report"])
                     elif action.text() in ["Export Client Mods", "匯出客戶端模組"]:
                         action.setText(self.translations["menu_export_client"])
                     elif action.text() in ["Export Server Mods", "匯出伺服端模組"]:
                         action.setText(self.translations["menu_export_server"])
+                    elif action.text() in ["Export Client Delta Pack", "匯出客戶端差異更新包"]:
+                        action.setText(self.translations["menu_export_client_delta"])
+                    elif action.text() in ["Export Server Delta Pack", "匯出伺服端差異更新包"]:
+                        action.setText(self.translations["menu_export_server_delta"])
                     elif action.text() in ["Export to JSON", "匯出至JSON"]:
                         action.setText(self.translations["menu_export_json"])
                     elif action.text() in ["Export Dependency Tree", "匯出依賴樹"]:
                         action.setText(self.translations["menu_export_dep_tree"])
                     elif action.text() in ["Import from JSON", "從JSON匯入"]:
                         action.setText(self.translations["menu_import_json"])
+                    elif action.text() in ["Compare Catalogs...", "比較目錄..."]:
+                        action.setText(self.translations["menu_compare_catalogs"])
 
             # Update About action
             for action in menubar.actions():
@@ -1105,13 +1420,11 @@ class MainWindow(QMainWindow):
 
     def update_category_filter(self):
         """Update the category filter dropdown with all available categories."""
-        current_selection = self.category_filter.currentText()
+        with span("update_category_filter"):
+            current_selection = self.category_filter.currentText()
 
-        with SessionLocal() as db:
-            # Get all categories ordered by name (case-insensitive)
-            from sqlalchemy.sql import func
-
-            categories = db.query(Category).order_by(func.lower(Category.name)).all()
+            # Default first if it exists, then the others alphabetically
+            names = self.catalog.category_names(self.translations["label_uncategorized"])
 
             # Temporarily block signals to avoid triggering filter_mods
             self.category_filter.blockSignals(True)
@@ -1119,24 +1432,7 @@ class MainWindow(QMainWindow):
             # Clear and add "All Categories" option
             self.category_filter.clear()
             self.category_filter.addItem(self.translations["label_all_categories"])
-
-            # First add "Default" category if it exists
-            default_category_name = self.translations["label_uncategorized"]
-            default_category = None
-
-            # Find and remove the Default category from the list to add it separately
-            for i, category in enumerate(categories):
-                if category.name == default_category_name:
-                    default_category = categories.pop(i)
-                    break
-
-            # Add Default category first
-            if default_category:
-                self.category_filter.addItem(default_category.name)
-
-            # Add all other categories
-            for category in categories:
-                self.category_filter.addItem(category.name)
+            self.category_filter.addItems(names)
 
             # Restore previous selection if it exists
             if current_selection:
@@ -1149,41 +1445,48 @@ class MainWindow(QMainWindow):
 
     def filter_mods(self, update_status=True):
         """Filter mods based on search text and selected category."""
-        search_text = self.search_edit.text().lower()
-        selected_category = self.category_filter.currentText()
-        show_all_categories = selected_category == self.translations["label_all_categories"]
+        with span("filter_mods") as trace:
+            search_text = self.search_edit.text().lower()
+            selected_category = self.category_filter.currentText()
+            show_all_categories = selected_category == self.translations["label_all_categories"]
 
-        for row in range(self.mod_table.rowCount()):
-            # Check if mod matches search text
-            text_match = False
-            if search_text:
-                for col in range(self.mod_table.columnCount()):
-                    item = self.mod_table.item(row, col)
-                    if item and search_text in item.text().lower():
-                        text_match = True
-                        break
-            else:
-                text_match = True  # Empty search shows all
-
-            # Check if mod matches selected category
-            category_match = True
-            if not show_all_categories:
-                category_item = self.mod_table.item(row, 1)  # Category column
-                if category_item:
-                    # Check if selected category is in the mod's categories
-                    category_match = selected_category in category_item.text().split(", ")
+            visible_rows = []
+            for row in range(self.mod_table.rowCount()):
+                # Check if mod matches search text
+                text_match = False
+                if search_text:
+                    for col in range(self.mod_table.columnCount()):
+                        item = self.mod_table.item(row, col)
+                        if item and search_text in item.text().lower():
+                            text_match = True
+                            break
                 else:
-                    category_match = False
+                    text_match = True  # Empty search shows all
+
+                # Check if mod matches selected category
+                category_match = True
+                if not show_all_categories:
+                    category_item = self.mod_table.item(row, 1)  # Category column
+                    if category_item:
+                        # Check if selected category is in the mod's categories
+                        category_match = selected_category in category_item.text().split(", ")
+                    else:
+                        category_match = False
 
-            # Show row only if both conditions match
-            self.mod_table.setRowHidden(row, not (text_match and category_match))
+                # Show row only if both conditions match
+                self.mod_table.setRowHidden(row, not (text_match and category_match))
+                if text_match and category_match:
+                    visible_rows.append(row)
 
-        # Update status bar with filtered count
-        if update_status:
-            status_bar = self.statusBar()
-            if status_bar:
-                visible_count = len([i for i in range(self.mod_table.rowCount()) if not self.mod_table.isRowHidden(i)])
-                status_bar.showMessage(self.translations["msg_filtered_mods"].format(visible_count))
+            # The dependency tree lists the same mods
+            self.dependency_model.set_visible_rows(visible_rows)
+
+            # Update status bar with filtered count
+            trace.set(visible=len(visible_rows))
+            if update_status:
+                status_bar = self.statusBar()
+                if status_bar:
+                    status_bar.showMessage(self.translations["msg_filtered_mods"].format(len(visible_rows)))
 
     def manage_categories(self):
         # Remember the current filter settings
@@ -1217,104 +1520,165 @@ class MainWindow(QMainWindow):
         self.expand_button.setText(
             self.translations["button_collapse_deps"] if is_expanded else self.translations["button_expand_deps"]
         )
-        self.load_mods()  # Reload module list to update display
+        with span("toggle_dependencies", expanded=is_expanded):
+            self.mod_table.setVisible(not is_expanded)
+            self.dependency_tree.setVisible(is_expanded)
 
     def load_mods(self):
-        with SessionLocal() as db:
-            # Get all mods ordered by name (case-insensitive)
-            from sqlalchemy.sql import func
-
-            mods = db.query(Mod).order_by(func.lower(Mod.name)).all()
-            self.mod_table.setRowCount(len(mods))
-            is_expanded = self.expand_button.isChecked()
-
-            # Update category filter dropdown
-            self.update_category_filter()
+        from database import profile_operation
+
+        # The rows are filled in a separate frame, so its locals are gone when the span ends
+        with span("load_mods") as trace:
+            with span("query"), profile_operation("load"):
+                records = self.catalog.mod_records(self.translations["label_uncategorized"])
+            self.fill_mod_table(records, trace)
+
+    def load_mods_async(self):
+        """Load the catalog on a worker thread so the window can paint meanwhile."""
+        central_widget = self.centralWidget()
+        if central_widget:
+            central_widget.setEnabled(False)
+        status_bar = self.statusBar()
+        if status_bar:
+            status_bar.showMessage(self.translations["msg_loading_catalog"])
+        self.catalog_loader = CatalogLoader(self.translations["label_uncategorized"], self.catalog, self)
+        self.catalog_loader.loaded.connect(self.on_catalog_loaded)
+        self.catalog_loader.failed.connect(self.on_catalog_failed)
+        self.catalog_loader.start()
+
+    def on_catalog_loaded(self, records: list[dict], load_ms: float, generation: int):
+        self.catalog.set_mod_records(self.translations["label_uncategorized"], records, generation)
+        with span("load_mods") as trace:
+            record_span("load_catalog", load_ms)
+            self.fill_mod_table(records, trace)
+        self.finish_catalog_load()
+
+    def on_catalog_failed(self, message: str):
+        self.finish_catalog_load()
+        QMessageBox.critical(self, self.translations["title_error"], message)
+
+    def finish_catalog_load(self):
+        self.catalog_loader = None
+        central_widget = self.centralWidget()
+        if central_widget:
+            central_widget.setEnabled(True)
+        self.catalog_ready.emit()
+
+    def fill_mod_table(self, records: list[dict], trace):
+        trace.set(mods=len(records))
+        self.mod_table.setRowCount(len(records))
+        self.dependency_model.set_records(records)
+
+        # One directory scan tells which jars are present
+        jars_on_disk = self.mods_watcher.refresh()
+        self.mod_rows.clear()
+        self.rows_by_disk_name.clear()
+
+        # Update category filter dropdown
+        self.update_category_filter()
 
-            for i, mod in enumerate(mods):
+        with span("populate_rows"):
+            for i, mod in enumerate(records):
                 # Create table items and set them as non-editable
-                name_item = QTableWidgetItem(mod.name)
+                name_item = QTableWidgetItem(mod["name"])
                 name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.mod_table.setItem(i, 0, name_item)
 
-                # Sort categories with Default first, then others alphabetically
-                default_category_name = self.translations["label_uncategorized"]
-                categories_list = [c.name for c in mod.categories]
-
-                # Check if Default category exists in this mod's categories
-                if default_category_name in categories_list:
-                    # Remove Default and add it to the beginning
-                    categories_list.remove(default_category_name)
-                    sorted_categories = [default_category_name] + sorted(categories_list, key=str.lower)
-                else:
-                    # Just sort alphabetically if no Default
-                    sorted_categories = sorted(categories_list, key=str.lower)
-
-                category_item = QTableWidgetItem(", ".join(sorted_categories))
+                # Categories come sorted with Default first, then others alphabetically
+                category_item = QTableWidgetItem(", ".join(mod["categories"]))
                 category_item.setFlags(category_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.mod_table.setItem(i, 1, category_item)
 
                 translated_item = QTableWidgetItem(
-                    self.translations["msg_yes"] if mod.is_translated else self.translations["msg_no"]
+                    self.translations["msg_yes"] if mod["is_translated"] else self.translations["msg_no"]
                 )
                 translated_item.setFlags(translated_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.mod_table.setItem(i, 2, translated_item)
 
                 client_item = QTableWidgetItem(
-                    self.translations["msg_yes"] if mod.client_required else self.translations["msg_no"]
+                    self.translations["msg_yes"] if mod["client_required"] else self.translations["msg_no"]
                 )
                 client_item.setFlags(client_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.mod_table.setItem(i, 3, client_item)
 
                 server_item = QTableWidgetItem(
-                    self.translations["msg_yes"] if mod.server_required else self.translations["msg_no"]
+                    self.translations["msg_yes"] if mod["server_required"] else self.translations["msg_no"]
                 )
                 server_item.setFlags(server_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.mod_table.setItem(i, 4, server_item)
 
-                # Show dependencies based on expand state
-                if is_expanded:
-                    # Sort dependencies by name (case-insensitive) and format with bullet points
-                    dependencies_text = (
-                        "\n".join(f"• {d.name}" for d in sorted(mod.dependencies, key=lambda x: x.name.lower()))
-                        if mod.dependencies
-                        else ""
-                    )
-                else:
-                    # Sort dependencies by name (case-insensitive) and join with commas
-                    dependencies_text = ", ".join(
-                        d.name for d in sorted(mod.dependencies, key=lambda x: x.name.lower())
-                    )
-
-                dependency_item = QTableWidgetItem(dependencies_text)
+                # Dependencies come sorted by name (case-insensitive)
+                dependency_item = QTableWidgetItem(", ".join(mod["dependencies"]))
                 dependency_item.setFlags(dependency_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 # Set text alignment to left and vertically top
                 dependency_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
                 self.mod_table.setItem(i, 5, dependency_item)
 
-                filename_item = QTableWidgetItem(mod.filename)
+                filename_item = QTableWidgetItem(mod["filename"])
                 filename_item.setFlags(filename_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.mod_table.setItem(i, 6, filename_item)
+                disk_name = store.disk_name(mod["filename"], mod["sha256"])
+                self.mod_rows[mod["name"]] = i
+                self.rows_by_disk_name[disk_name].append(i)
+                if disk_name not in jars_on_disk:
+                    self.set_file_state(i, self.translations["msg_file_missing"])
 
-                notes_item = QTableWidgetItem(mod.notes or "")
+                notes_item = QTableWidgetItem(mod["notes"] or "")
                 notes_item.setFlags(notes_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.mod_table.setItem(i, 7, notes_item)
 
-                # Adjust row height
-                if is_expanded and mod.dependencies:
-                    # Each dependency item should be at least 30 pixels high
-                    row_height = 30 * len(mod.dependencies)
-                    self.mod_table.setRowHeight(i, max(30, row_height))
-                else:
-                    self.mod_table.setRowHeight(i, 30)
+                self.mod_table.setRowHeight(i, 30)
 
-            # Update status bar
-            status_bar: QStatusBar | None = self.statusBar()
-            if status_bar:
-                status_bar.showMessage(self.translations["msg_total_mods"].format(len(mods)))
+        # Update status bar
+        status_bar: QStatusBar | None = self.statusBar()
+        if status_bar:
+            status_bar.showMessage(self.translations["msg_total_mods"].format(len(records)))
+
+    def selected_mod_name(self) -> str | None:
+        """Name of the mod selected in the table or, while it is shown, the dependency tree."""
+        if self.expand_button.isChecked():
+            index = self.dependency_tree.currentIndex()
+            return self.dependency_model.mod_name(index) if index.isValid() else None
+        current_row = self.mod_table.currentRow()
+        if current_row < 0:
+            return None
+        name_item = self.mod_table.item(current_row, 0)
+        return name_item.text() if name_item else ""
+
+    def set_file_state(self, row: int, problem: str | None):
+        """Highlight the file name cell of a row whose jar is missing or changed."""
+        item = self.mod_table.item(row, 6)
+        if not item:
+            return
+        item.setForeground(QBrush(QColor("#D32F2F")) if problem else QBrush())
+        item.setToolTip(problem or "")
+
+    def on_mods_changed(self, added: list[str], removed: list[str], modified: list[str]):
+        """Update only the rows whose jars changed in the mods folder."""
+        for name in removed:
+            for row in self.rows_by_disk_name.get(name, []):
+                self.set_file_state(row, self.translations["msg_file_missing"])
+        for name in modified:
+            for row in self.rows_by_disk_name.get(name, []):
+                self.set_file_state(row, self.translations["msg_file_modified"])
+        untracked = 0
+        for name in added:
+            rows = self.rows_by_disk_name.get(name)
+            if rows:
+                for row in rows:
+                    self.set_file_state(row, None)
+            else:
+                untracked += 1
+
+        status_bar = self.statusBar()
+        if status_bar:
+            status_bar.showMessage(
+                self.translations["msg_mods_folder_changed"].format(len(added), len(removed), len(modified), untracked)
+            )
 
     def add_mod(self):
-        dialog = ModDialog(self)
+        with span("open_mod_dialog", new=True):
+            dialog = ModDialog(self)
         if dialog.exec():
             # Remember the current filter settings
             search_text = self.search_edit.text()
@@ -1334,22 +1698,175 @@ class MainWindow(QMainWindow):
             # Reapply filters
             self.filter_mods()
 
-    def add_category(self):
-        dialog = CategoryDialog(self)
-        if dialog.exec():
-            category_name = dialog.get_category_name()
-            if category_name:
-                with SessionLocal() as db:
-                    category = Category(name=category_name)
-                    db.add(category)
-                    db.commit()
-                    db.refresh(category)
-
-                # Remember the current filter settings
-                search_text = self.search_edit.text()
-                selected_category = self.category_filter.currentText()
+    def set_snapshot_compression(self, enabled: bool):
+        self.config["backup_compress"] = enabled
+        save_config(self.config)
+
+    def _snapshot_progress_dialog(self, label_key: str) -> QProgressDialog:
+        progress_dialog = QProgressDialog(self.translations[label_key], "", 0, 0, self)
+        progress_dialog.setWindowTitle(self.translations["title_snapshot"])
+        progress_dialog.setCancelButton(None)
+        progress_dialog.setMinimumDuration(500)
+        return progress_dialog
+
+    def _take_snapshot(self, progress_dialog: QProgressDialog, protect: tuple[Path, ...] = ()) -> Path:
+        from backup import DEFAULT_KEEP, create_snapshot
+
+        def update_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+            QApplication.processEvents()
+
+        return create_snapshot(
+            compress=self.config.get("backup_compress", False),
+            keep=self.config.get("backup_keep", DEFAULT_KEEP),
+            progress=update_progress,
+            protect=protect,
+        )
 
-                # Reload module list and update category filter
+    def create_snapshot(self):
+        """Snapshot the database into the backups folder."""
+        progress_dialog = self._snapshot_progress_dialog("msg_creating_snapshot")
+        try:
+            snapshot = self._take_snapshot(progress_dialog)
+        except Exception as e:
+            QMessageBox.critical(
+                self, self.translations["title_error"], self.translations["msg_snapshot_failed"].format(str(e))
+            )
+            return
+        finally:
+            progress_dialog.close()
+
+        QMessageBox.information(
+            self, self.translations["title_snapshot"], self.translations["msg_snapshot_created"].format(snapshot)
+        )
+
+    def restore_snapshot(self):
+        """Replace the database with a snapshot, after snapshotting the current state."""
+        from backup import BACKUP_DIR, restore_snapshot
+        from database import engine, init_db
+
+        BACKUP_DIR.mkdir(exist_ok=True)
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            self.translations["dialog_choose_snapshot"],
+            str(BACKUP_DIR),
+            self.translations["dialog_snapshot_filter"],
+        )
+        if not file_path:
+            return
+
+        confirm = QMessageBox.question(
+            self,
+            self.translations["title_snapshot"],
+            self.translations["msg_confirm_restore_snapshot"],
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        progress_dialog = self._snapshot_progress_dialog("msg_restoring_snapshot")
+
+        def update_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+            QApplication.processEvents()
+
+        try:
+            # Keep the current state so the restore can be undone, without rotating away the chosen snapshot
+            self._take_snapshot(progress_dialog, protect=(Path(file_path),))
+            # Pooled connections may hold pages of the old database
+            # The restore bypasses the ORM, so nothing read before it may be reused
+            self.catalog.invalidate()
+            engine.dispose()
+            connection = engine.raw_connection()
+            try:
+                driver_connection = connection.driver_connection
+                assert driver_connection is not None  # The connection was just checked out
+                restore_snapshot(file_path, driver_connection, progress=update_progress)
+            finally:
+                connection.close()
+            engine.dispose()
+            # Older snapshots may lack tables added since, such as the hash and scan caches
+            init_db()
+        except Exception as e:
+            QMessageBox.critical(
+                self, self.translations["title_error"], self.translations["msg_restore_failed"].format(str(e))
+            )
+            return
+        finally:
+            progress_dialog.close()
+
+        self.load_mods()
+        QMessageBox.information(self, self.translations["title_snapshot"], self.translations["msg_snapshot_restored"])
+
+    def import_mods_folder(self):
+        """Import every jar in a folder, such as an existing instance's mods folder."""
+        from bulk_import import import_folder
+        from database import SessionLocal
+
+        folder = QFileDialog.getExistingDirectory(self, self.translations["dialog_choose_mods_folder"])
+        if not folder:
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            with span("import_folder"), SessionLocal() as db:
+                result = import_folder(folder, db, self.translations["label_uncategorized"])
+        except Exception as e:
+            QMessageBox.critical(
+                self, self.translations["title_error"], self.translations["msg_folder_import_failed"].format(str(e))
+            )
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        # Remember the current filter settings
+        search_text = self.search_edit.text()
+        selected_category = self.category_filter.currentText()
+
+        # Reload module list
+        self.load_mods()
+
+        # Restore filter settings
+        self.search_edit.setText(search_text)
+        index = self.category_filter.findText(selected_category)
+        if index >= 0:
+            self.category_filter.setCurrentIndex(index)
+        self.filter_mods()
+
+        message = self.translations["msg_folder_import_summary"].format(
+            len(result.imported), len(result.skipped), len(result.failed)
+        )
+        if result.failed:
+            message += "\n\n" + self.translations["msg_folder_import_errors"].format(", ".join(result.failed))
+        QMessageBox.information(self, self.translations["title_import_success"], message)
+
+    def add_category(self):
+        from database import SessionLocal
+        from services import DuplicateNameError, add_category
+
+        dialog = CategoryDialog(self)
+        if dialog.exec():
+            category_name = dialog.get_category_name()
+            if category_name:
+                try:
+                    with SessionLocal() as db:
+                        add_category(db, category_name)
+                except DuplicateNameError:
+                    QMessageBox.warning(
+                        self,
+                        self.translations["title_error"],
+                        self.translations["msg_category_exists"].format(category_name),
+                    )
+                    return
+
+                # Remember the current filter settings
+                search_text = self.search_edit.text()
+                selected_category = self.category_filter.currentText()
+
+                # Reload module list and update category filter
                 self.load_mods()
 
                 # Restore filter settings
@@ -1364,9 +1881,8 @@ class MainWindow(QMainWindow):
                 self.filter_mods()
 
     def edit_mod(self):
-        # Get selected row
-        current_row = self.mod_table.currentRow()
-        if current_row < 0:
+        mod_name = self.selected_mod_name()
+        if mod_name is None:
             QMessageBox.warning(
                 self,
                 self.translations["title_warning"],
@@ -1374,61 +1890,52 @@ class MainWindow(QMainWindow):
             )
             return
 
-        # Get module name
-        name_item = self.mod_table.item(current_row, 0)
-        if not name_item:
+        if not mod_name:
             QMessageBox.warning(
                 self,
                 self.translations["title_error"],
-                self.translations["msg_unable_get_name"],
+                self.translations["msg_name_empty"],
             )
             return
 
-        mod_name = name_item.text()
-        if not mod_name:
+        mod = self.catalog.mod(mod_name)
+        if not mod:
             QMessageBox.warning(
                 self,
                 self.translations["title_error"],
-                self.translations["msg_name_empty"],
+                self.translations["msg_module_not_found"],
             )
             return
 
-        # Get module from database
-        with SessionLocal() as db:
-            mod = db.query(Mod).filter(Mod.name == mod_name).first()
-            if not mod:
-                QMessageBox.warning(
-                    self,
-                    self.translations["title_error"],
-                    self.translations["msg_module_not_found"],
-                )
-                return
-
-            # Open edit dialog
+        # Open edit dialog
+        with span("open_mod_dialog", new=False):
             dialog = ModDialog(self, mod)
-            if dialog.exec():
-                # Remember the current filter settings
-                search_text = self.search_edit.text()
-                selected_category = self.category_filter.currentText()
+        if dialog.exec():
+            # Remember the current filter settings
+            search_text = self.search_edit.text()
+            selected_category = self.category_filter.currentText()
 
-                # Reload module list
-                self.load_mods()
+            # Reload module list
+            self.load_mods()
 
-                # Restore filter settings
-                self.search_edit.setText(search_text)
+            # Restore filter settings
+            self.search_edit.setText(search_text)
 
-                # Find and set the category if it still exists
-                index = self.category_filter.findText(selected_category)
-                if index >= 0:
-                    self.category_filter.setCurrentIndex(index)
+            # Find and set the category if it still exists
+            index = self.category_filter.findText(selected_category)
+            if index >= 0:
+                self.category_filter.setCurrentIndex(index)
 
-                # Reapply filters
-                self.filter_mods()
+            # Reapply filters
+            self.filter_mods()
 
     def delete_mod(self):
         # Get selected row
-        current_row = self.mod_table.currentRow()
-        if current_row < 0:
+        from database import SessionLocal
+        from services import HasDependentsError, delete_mod, dependents, find_mod_id
+
+        mod_name = self.selected_mod_name()
+        if mod_name is None:
             QMessageBox.warning(
                 self,
                 self.translations["title_warning"],
@@ -1436,204 +1943,243 @@ class MainWindow(QMainWindow):
             )
             return
 
-        # Get module name
-        name_item = self.mod_table.item(current_row, 0)
-        if not name_item:
+        if not mod_name:
             QMessageBox.warning(
                 self,
                 self.translations["title_error"],
-                self.translations["msg_unable_get_name"],
+                self.translations["msg_name_empty"],
             )
             return
 
-        mod_name = name_item.text()
-        if not mod_name:
+        with SessionLocal() as db:
+            mod_pk = find_mod_id(db, mod_name)
+            # Check if other modules depend on this module
+            dependent_names = dependents(db, mod_pk) if mod_pk is not None else []
+        if mod_pk is None:
             QMessageBox.warning(
                 self,
                 self.translations["title_error"],
-                self.translations["msg_name_empty"],
+                self.translations["msg_module_not_found"],
             )
             return
 
-        with SessionLocal() as db:
-            mod = db.query(Mod).filter(Mod.name == mod_name).first()
-            if not mod:
+        if dependent_names:
+            # If there are dependencies, show warning message and list modules that depend on this one
+            QMessageBox.warning(
+                self,
+                self.translations["title_unable_delete"],
+                self.translations["msg_unable_delete"].format(mod_name, ", ".join(dependent_names)),
+            )
+            return
+
+        # Confirm whether to delete
+        reply = QMessageBox.question(
+            self,
+            self.translations["title_confirm_delete"],
+            self.translations["msg_confirm_delete_mod"].format(mod_name),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+
+        if reply == QMessageBox.StandardButton.Yes:
+            try:
+                with span("delete_mod"), SessionLocal() as db:
+                    delete_mod(db, mod_pk)
+            except HasDependentsError as e:
                 QMessageBox.warning(
                     self,
-                    self.translations["title_error"],
-                    self.translations["msg_module_not_found"],
+                    self.translations["title_unable_delete"],
+                    self.translations["msg_unable_delete"].format(mod_name, ", ".join(e.dependents)),
                 )
                 return
-
-            # Check if other modules depend on this module
-            dependent_mods = db.query(Mod).filter(Mod.dependencies.any(id=mod.id)).all()
-            if dependent_mods:
-                # If there are dependencies, show warning message and list modules that depend on this one
-                dependent_names = ", ".join([m.name for m in dependent_mods])
-                QMessageBox.warning(
+            except Exception as e:
+                QMessageBox.critical(
                     self,
-                    self.translations["title_unable_delete"],
-                    self.translations["msg_unable_delete"].format(mod_name, dependent_names),
+                    self.translations["title_error"],
+                    self.translations["msg_error_delete_file"].format(str(e)),
                 )
                 return
 
-            # Confirm whether to delete
-            reply = QMessageBox.question(
-                self,
-                self.translations["title_confirm_delete"],
-                self.translations["msg_confirm_delete_mod"].format(mod_name),
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            self.load_mods()  # Reload module list
+
+    def verify_files(self):
+        """Verify that every stored jar still matches its recorded checksum."""
+        from database import SessionLocal
+        from integrity import verify_mods
+
+        progress_dialog = QProgressDialog(self.translations["msg_verifying_files"], "", 0, 0, self)
+        progress_dialog.setWindowTitle(self.translations["menu_verify_files"])
+        progress_dialog.setCancelButton(None)
+        progress_dialog.setMinimumDuration(500)
+
+        def update_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+            QApplication.processEvents()
+
+        try:
+            with span("verify_files"), SessionLocal() as db:
+                report = verify_mods(db, progress=update_progress)
+        except Exception as e:
+            QMessageBox.critical(
+                self, self.translations["title_error"], self.translations["msg_verify_failed"].format(str(e))
             )
+            return
+        finally:
+            progress_dialog.close()
 
-            if reply == QMessageBox.StandardButton.Yes:
-                # Delete file
-                try:
-                    file_path = Path("mods") / mod.filename
-                    if file_path.exists():
-                        file_path.unlink()
-                except Exception as e:
-                    QMessageBox.critical(
-                        self,
-                        self.translations["title_error"],
-                        self.translations["msg_error_delete_file"].format(str(e)),
-                    )
-                    return
+        message = self.translations["msg_verify_summary"].format(
+            len(report.ok), len(report.corrupted), len(report.missing), len(report.unchecked)
+        )
+        if report.corrupted:
+            message += "\n\n" + self.translations["msg_verify_corrupted"].format(", ".join(report.corrupted))
+        if report.missing:
+            message += "\n\n" + self.translations["msg_verify_missing"].format(", ".join(report.missing))
 
-                # Delete from database
-                db.delete(mod)
-                db.commit()
-                self.load_mods()  # Reload module list
+        if report.corrupted or report.missing:
+            QMessageBox.warning(self, self.translations["menu_verify_files"], message)
+        else:
+            QMessageBox.information(self, self.translations["menu_verify_files"], message)
 
-    def export_mods(self, mod_type: str):
-        """Export mods to client_mods or server_mods folder based on type."""
-        import shutil
-        from pathlib import Path
+    def reconcile_mods_folder(self):
+        """Report orphaned jars and mods without files, and offer to clean them up."""
+        dialog = ReconcileDialog(self)
+        dialog.exec()
 
-        # Create export directory if it doesn't exist
-        export_dir = Path(f"{mod_type}_mods")
-        export_dir.mkdir(exist_ok=True)
+        if dialog.mods_changed:
+            # Remember the current filter settings
+            search_text = self.search_edit.text()
+            selected_category = self.category_filter.currentText()
 
-        # Clear the existing directory first
-        for item in export_dir.glob("*"):
-            if item.is_file():
-                item.unlink()  # Delete file
+            # Reload module list
+            self.load_mods()
 
-        # Get mods based on type
-        with SessionLocal() as db:
-            if mod_type == "client":
-                mods = db.query(Mod).filter(Mod.client_required.is_(True)).all()
-            else:  # server
-                mods = db.query(Mod).filter(Mod.server_required.is_(True)).all()
+            # Restore filter settings
+            self.search_edit.setText(search_text)
+            index = self.category_filter.findText(selected_category)
+            if index >= 0:
+                self.category_filter.setCurrentIndex(index)
+            self.filter_mods()
 
-            if not mods:
-                QMessageBox.information(
-                    self, self.translations["title_error"], self.translations["msg_no_mods_found"].format(mod_type)
-                )
-                return
+    def export_mods(self, mod_type: str):
+        """Export mods to client_mods or server_mods folder based on type."""
+        from database import SessionLocal, profile_operation
+        from services import export_pack
 
-            # Copy mod files to export directory
-            success_count = 0
-            errors = []
+        with span("export_pack", pack=mod_type) as trace, profile_operation("export"), SessionLocal() as db:
+            result = export_pack(db, mod_type)
+            trace.set(exported=len(result.exported), missing=len(result.missing), failed=len(result.failed))
 
-            for mod in mods:
-                source_path = Path("mods") / mod.filename
-                if not source_path.exists():
-                    errors.append(f"File not found: {source_path}")
-                    continue
+        if not result.total:
+            QMessageBox.information(
+                self, self.translations["title_error"], self.translations["msg_no_mods_found"].format(mod_type)
+            )
+            return
 
-                try:
-                    # Copy the file to the export directory
-                    shutil.copy2(source_path, export_dir / source_path.name)
-                    success_count += 1
-                except Exception as e:
-                    errors.append(self.translations["msg_error_copy_file"].format(str(e)))
-
-            # Show result message
-            if success_count > 0:
-                success_msg = self.translations["msg_export_success"].format(success_count, export_dir)
-                if errors:
-                    success_msg += "\n\n" + "\n".join(errors)
-                QMessageBox.information(self, self.translations["title_export_success"], success_msg)
-            else:
-                error_msg = self.translations["msg_export_failed"].format("\n".join(errors))
-                QMessageBox.critical(self, self.translations["title_error"], error_msg)
+        errors = [f"File not found: {path}" for path in result.missing]
+        errors.extend(self.translations["msg_error_copy_file"].format(error) for _, error in result.failed)
+        if result.manifest_error:
+            errors.append(self.translations["msg_manifest_failed"].format(result.manifest_error))
+
+        # Show result message
+        if result.exported:
+            success_msg = self.translations["msg_export_success"].format(len(result.exported), result.export_dir)
+            if errors:
+                success_msg += "\n\n" + "\n".join(errors)
+            QMessageBox.information(self, self.translations["title_export_success"], success_msg)
+        else:
+            error_msg = self.translations["msg_export_failed"].format("\n".join(errors))
+            QMessageBox.critical(self, self.translations["title_error"], error_msg)
 
-    def export_json(self):
-        """Export all categories and mods data to a JSON file."""
-        import json
+    def export_delta_pack(self, mod_type: str):
+        """Export a delta archive between a previous pack manifest and the current catalog."""
+        from database import SessionLocal
+        from packs import MANIFEST_NAME
+        from services import export_delta
+
+        # Ask for the manifest of the previous release
+        manifest_path, _ = QFileDialog.getOpenFileName(
+            self,
+            self.translations["dialog_choose_manifest"],
+            str(Path(f"{mod_type}_mods") / MANIFEST_NAME),
+            self.translations["dialog_json_filter"],
+        )
+
+        if not manifest_path:
+            return
 
         # Ask for save location
         file_path, _ = QFileDialog.getSaveFileName(
             self,
-            self.translations["dialog_json_export"],
-            "manual-mmdm.json",
-            self.translations["dialog_json_filter"],
+            self.translations["dialog_delta_export"],
+            f"{mod_type}-update.zip",
+            self.translations["dialog_zip_filter"],
         )
 
         if not file_path:
             return
 
-        # Add .json extension if not present
-        if not file_path.lower().endswith(".json"):
-            file_path += ".json"
+        # Add .zip extension if not present
+        if not file_path.lower().endswith(".zip"):
+            file_path += ".zip"
 
         try:
-            with SessionLocal() as db:
-                # Get all categories ordered by name (case-insensitive)
-                from sqlalchemy.sql import func
+            with span("export_delta", pack=mod_type), SessionLocal() as db:
+                added, changed, removed = export_delta(db, mod_type, manifest_path, file_path)
 
-                categories = db.query(Category).order_by(func.lower(Category.name)).all()
-                categories_data = []
+            QMessageBox.information(
+                self,
+                self.translations["title_export_success"],
+                self.translations["msg_delta_export_success"].format(file_path, added, changed, removed),
+            )
 
-                for category in categories:
-                    categories_data.append({"name": category.name})
+        except Exception as e:
+            QMessageBox.critical(
+                self, self.translations["title_error"], self.translations["msg_delta_export_failed"].format(str(e))
+            )
 
-                # Get all mods ordered by name (case-insensitive)
-                mods = db.query(Mod).order_by(func.lower(Mod.name)).all()
-                mods_data = []
+    def export_json(self):
+        """Export all categories and mods data to a JSON file."""
+        from database import SessionLocal, profile_operation
+        from exchange import FORMAT_COMPACT, FORMAT_INDENTED, FORMAT_JSONL, export_catalog
 
-                for mod in mods:
-                    # Get category names with Default first, then others alphabetically
-                    default_category_name = self.translations["label_uncategorized"]
-                    category_names = [c.name for c in mod.categories]
+        # Ask for save location and layout
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            self.translations["dialog_json_export"],
+            "manual-mmdm.json",
+            self.translations["dialog_json_export_filter"],
+        )
 
-                    # Check if Default category exists in this mod's categories
-                    if default_category_name in category_names:
-                        # Remove Default and add it to the beginning
-                        category_names.remove(default_category_name)
-                        sorted_category_names = [default_category_name] + sorted(category_names, key=str.lower)
-                    else:
-                        # Just sort alphabetically if no Default
-                        sorted_category_names = sorted(category_names, key=str.lower)
-
-                    # Get dependency names (sorted case-insensitive)
-                    dependency_names = sorted([d.name for d in mod.dependencies], key=str.lower)
-
-                    mods_data.append(
-                        {
-                            "name": mod.name,
-                            "filename": mod.filename,
-                            "is_translated": mod.is_translated,
-                            "client_required": mod.client_required,
-                            "server_required": mod.server_required,
-                            "notes": mod.notes,
-                            "categories": sorted_category_names,
-                            "dependencies": dependency_names,
-                        }
-                    )
+        if not file_path:
+            return
 
-                # Create export data
-                export_data = {"categories": categories_data, "mods": mods_data}
+        # Pick the layout from the chosen filter or extension
+        filters = self.translations["dialog_json_export_filter"].split(";;")
+        if file_path.lower().endswith(".jsonl") or selected_filter == filters[2]:
+            fmt = FORMAT_JSONL
+            extension = ".jsonl"
+        else:
+            fmt = FORMAT_COMPACT if selected_filter == filters[1] else FORMAT_INDENTED
+            extension = ".json"
 
-                # Save to file
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(export_data, f, ensure_ascii=False, indent=4)
+        # Add extension if not present
+        if not file_path.lower().endswith(extension):
+            file_path += extension
 
-                QMessageBox.information(
-                    self,
-                    self.translations["title_export_success"],
-                    self.translations["msg_json_export_success"].format(file_path),
-                )
+        try:
+            with (
+                span("export_json", format=fmt),
+                profile_operation("export"),
+                SessionLocal() as db,
+                open(file_path, "w", encoding="utf-8") as f,
+            ):
+                export_catalog(db, f, self.translations["label_uncategorized"], fmt)
+
+            QMessageBox.information(
+                self,
+                self.translations["title_export_success"],
+                self.translations["msg_json_export_success"].format(file_path),
+            )
 
         except Exception as e:
             QMessageBox.critical(
@@ -1642,6 +2188,9 @@ class MainWindow(QMainWindow):
 
     def export_dependency_tree(self):
         """Export mods dependency tree in formats similar to Python package managers."""
+        from database import SessionLocal, profile_operation
+        from services import dependency_tree
+
         # Ask for save location
         file_path, _ = QFileDialog.getSaveFileName(
             self,
@@ -1658,236 +2207,224 @@ class MainWindow(QMainWindow):
             file_path += ".txt"
 
         try:
-            with SessionLocal() as db:
-                # Get all mods ordered by name (case-insensitive)
-                from sqlalchemy.sql import func
-
-                mods = db.query(Mod).order_by(func.lower(Mod.name)).all()
-
-                # Build dependency tree
-                output_text = ""
-
-                # Header
-                output_text += "Dependency Tree:\n"
-                output_text += "=" * 50 + "\n\n"
-
-                # Hierarchical dependency tree section
-                output_text += "# Hierarchical Dependencies\n"
-
-                # Find root mods (not dependencies of any other mod)
-                all_dependencies = set()
-                for mod in mods:
-                    for dep in mod.dependencies:
-                        all_dependencies.add(dep.name)
-
-                root_mods = []
-                for mod in mods:
-                    if mod.name not in all_dependencies:
-                        root_mods.append(mod)
-
-                # If no root mods found, use all mods
-                if not root_mods:
-                    root_mods = mods
-
-                # Sort root mods by name
-                root_mods = sorted(root_mods, key=lambda x: x.name.lower())
-
-                # Generate tree for each root mod
-                for mod in root_mods:
-                    output_text += f"{mod.name}\n"
-                    for i, dep in enumerate(sorted(mod.dependencies, key=lambda x: x.name.lower())):
-                        is_last = i == len(mod.dependencies) - 1
-                        prefix = "└── " if is_last else "├── "
-                        output_text += f"  {prefix}{dep.name}\n"
-
-                        # Generate full tree for each dependency
-                        tree_output = ""
-                        tree_output = self._generate_dependency_tree(dep, tree_output, [mod.name], 1)
-                        output_text += tree_output
-
-                # Add flat dependencies list section
-                output_text += "\n\n# Flat Dependencies List\n"
-                for mod in sorted(mods, key=lambda x: x.name.lower()):
-                    deps = sorted([d.name for d in mod.dependencies], key=str.lower)
-                    output_text += f"{mod.name}"
-                    if deps:
-                        output_text += f" (dependencies: {', '.join(deps)})"
-                    output_text += "\n"
-
-                # Save to file
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(output_text)
+            with span("export_dependency_tree"), profile_operation("export"), SessionLocal() as db:
+                output_text = dependency_tree(db)
 
-                QMessageBox.information(
-                    self,
-                    self.translations["title_export_success"],
-                    self.translations["msg_dep_tree_export_success"].format(file_path),
-                )
+            # Save to file
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(output_text)
+
+            QMessageBox.information(
+                self,
+                self.translations["title_export_success"],
+                self.translations["msg_dep_tree_export_success"].format(file_path),
+            )
 
         except Exception as e:
             QMessageBox.critical(
                 self, self.translations["title_error"], self.translations["msg_dep_tree_export_failed"].format(str(e))
             )
 
-    def _generate_dependency_tree(self, mod, output, visited, level):
-        """Recursively generate dependency tree for a mod."""
-        # Prevent circular dependencies
-        if mod.name in visited:
-            indent = "  " * (level + 1)
-            output += f"{indent}└── {mod.name} (circular dependency)\n"
-            return output
-
-        # Add this mod to visited list
-        visited = visited + [mod.name]
-
-        # Sort dependencies by name (case-insensitive)
-        dependencies = sorted(mod.dependencies, key=lambda x: x.name.lower())
-
-        for i, dep in enumerate(dependencies):
-            indent = "  " * (level + 1)
-            is_last = i == len(dependencies) - 1
-
-            if is_last:
-                prefix = "└── "
-            else:
-                prefix = "├── "
-
-            output += f"{indent}{prefix}{dep.name}\n"
-
-            # Recursively process dependencies
-            with SessionLocal() as db:
-                # Ensure dependency is attached to session
-                dep = db.merge(dep)
-                # Force loading dependencies to avoid detached instance errors
-                _ = dep.dependencies
-                # Call recursively with the updated visited list
-                self._generate_dependency_tree(dep, output, visited, level + 1)
-
-        return output
-
     def import_json(self):
-        """Import categories and mods data from a JSON file."""
-        import json
+        """Import categories and mods data from a JSON or JSON Lines file."""
         from pathlib import Path
 
+        from catalog_reader import read_catalog
+        from database import SessionLocal, profile_operation
+        from exchange import import_catalog_file, merge_catalog
+
         # Ask for file location
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             self.translations["dialog_json_import"],
             "",
-            self.translations["dialog_json_filter"],
+            self.translations["dialog_json_import_filter"],
         )
 
         if not file_path:
             return
 
-        # Confirm import
-        confirm = QMessageBox.question(
-            self,
-            self.translations["title_confirm_import"],
-            self.translations["msg_json_import_confirm"],
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No,
-        )
-
-        if confirm != QMessageBox.StandardButton.Yes:
+        # Choose between replacing the catalog and merging the differences
+        confirm = QMessageBox(self)
+        confirm.setIcon(QMessageBox.Icon.Question)
+        confirm.setWindowTitle(self.translations["title_confirm_import"])
+        confirm.setText(self.translations["msg_json_import_confirm"])
+        replace_button = confirm.addButton(self.translations["button_replace"], QMessageBox.ButtonRole.DestructiveRole)
+        merge_button = confirm.addButton(self.translations["button_merge"], QMessageBox.ButtonRole.AcceptRole)
+        confirm.addButton(QMessageBox.StandardButton.Cancel)
+        confirm.setDefaultButton(merge_button)
+        confirm.exec()
+
+        clicked = confirm.clickedButton()
+        if clicked not in (replace_button, merge_button):
             return
 
-        try:
-            # Load JSON data
-            with open(file_path, encoding="utf-8") as f:
-                import_data = json.load(f)
+        progress_dialog = QProgressDialog(self.translations["msg_importing_json"], "", 0, 0, self)
+        progress_dialog.setWindowTitle(self.translations["title_confirm_import"])
+        progress_dialog.setCancelButton(None)
+        progress_dialog.setMinimumDuration(500)
 
+        def update_progress(bytes_read):
+            progress_dialog.setValue(bytes_read // 1024)
+            QApplication.processEvents()
+
+        try:
             # Create mods directory if it doesn't exist
             mods_dir = Path("mods")
             mods_dir.mkdir(exist_ok=True)
 
-            with SessionLocal() as db:
-                # Clear existing data
-                db.query(Mod).delete()
-                db.query(Category).delete()
-                db.commit()
-
-                # Import categories
-                categories = {}
-                for category_data in import_data.get("categories", []):
-                    category = Category(name=category_data["name"])
-                    db.add(category)
-                    db.flush()  # Flush to get ID
-                    categories[category.name] = category
-
-                # Ensure "Uncategorized" category exists
-                if "Uncategorized" not in categories:
-                    uncategorized = Category(name="Uncategorized")
-                    db.add(uncategorized)
-                    db.flush()
-                    categories["Uncategorized"] = uncategorized
-
-                # Import mods
-                mods = {}
-                for mod_data in import_data.get("mods", []):
-                    mod = Mod(
-                        name=mod_data["name"],
-                        filename=mod_data["filename"],
-                        is_translated=mod_data.get("is_translated", False),
-                        client_required=mod_data.get("client_required", True),
-                        server_required=mod_data.get("server_required", True),
-                        notes=mod_data.get("notes", ""),
-                    )
-
-                    # Add categories
-                    mod_categories = []
-                    for category_name in mod_data.get("categories", []):
-                        if category_name in categories:
-                            mod_categories.append(categories[category_name])
+            # The file is read incrementally, so large exports are not loaded at once
+            progress_dialog.setMaximum(os.path.getsize(file_path) // 1024)
+            with (
+                span("import_json", merge=clicked is merge_button),
+                profile_operation("import"),
+                open(file_path, "rb") as f,
+                SessionLocal() as db,
+            ):
+                if clicked is merge_button:
+                    report = merge_catalog(db, read_catalog(f))
+                else:
+                    category_count, mod_count = import_catalog_file(db, f, progress=update_progress)
+            progress_dialog.close()
 
-                    if mod_categories:
-                        mod.categories = mod_categories
-                    else:
-                        # If no categories, add to Uncategorized
-                        mod.categories = [categories["Uncategorized"]]
-
-                    db.add(mod)
-                    db.flush()  # Flush to get ID
-                    mods[mod.name] = mod
-
-                # Set dependencies
-                for mod_data in import_data.get("mods", []):
-                    mod = mods.get(mod_data["name"])  # type: ignore
-                    if mod:
-                        dependencies = []
-                        for dep_name in mod_data.get("dependencies", []):
-                            if dep_name in mods:
-                                dependencies.append(mods[dep_name])
-                        mod.dependencies = dependencies
-
-                db.commit()
-
-                # Remember the current filter settings (if any)
-                search_text = self.search_edit.text()
+            # Remember the current filter settings (if any)
+            search_text = self.search_edit.text()
 
-                # Reload mods
-                self.load_mods()
+            # Reload mods
+            self.load_mods()
 
-                # Restore search text (category will be reset during load_mods)
-                if search_text:
-                    self.search_edit.setText(search_text)
-                    # Reapply filters
-                    self.filter_mods()
+            # Restore search text (category will be reset during load_mods)
+            if search_text:
+                self.search_edit.setText(search_text)
+                # Reapply filters
+                self.filter_mods()
 
+            if clicked is merge_button:
+                self.show_merge_report(report)
+            else:
                 QMessageBox.information(
                     self,
                     self.translations["title_import_success"],
-                    self.translations["msg_json_import_success"].format(
-                        len(import_data.get("categories", [])), len(import_data.get("mods", []))
-                    ),
+                    self.translations["msg_json_import_success"].format(category_count, mod_count),
                 )
 
         except Exception as e:
+            progress_dialog.close()
             QMessageBox.critical(
                 self, self.translations["title_error"], self.translations["msg_json_import_failed"].format(str(e))
             )
 
+    def compare_catalogs(self):
+        """Show the differences between two exports or snapshots, or between one and the current catalog."""
+        from catalog_diff import diff_catalogs, format_diff, load_catalog, load_session
+        from database import SessionLocal
+
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            self.translations["dialog_choose_catalogs"],
+            "",
+            self.translations["dialog_catalog_filter"],
+        )
+        if not file_paths:
+            return
+        if len(file_paths) > 2:
+            QMessageBox.warning(
+                self, self.translations["title_warning"], self.translations["msg_choose_one_or_two_catalogs"]
+            )
+            return
+
+        try:
+            # The older file is the base of the comparison
+            file_paths.sort(key=os.path.getmtime)
+            old = load_catalog(file_paths[0])
+            if len(file_paths) == 2:
+                new = load_catalog(file_paths[1])
+                new_label = os.path.basename(file_paths[1])
+            else:
+                with SessionLocal() as db:
+                    new = load_session(db)
+                new_label = self.translations["label_current_catalog"]
+            diff = diff_catalogs(old, new)
+        except Exception as e:
+            QMessageBox.critical(
+                self, self.translations["title_error"], self.translations["msg_compare_failed"].format(str(e))
+            )
+            return
+
+        message = QMessageBox(self)
+        message.setIcon(QMessageBox.Icon.Information)
+        message.setWindowTitle(self.translations["menu_compare_catalogs"])
+        if diff.is_empty():
+            message.setText(self.translations["msg_catalogs_identical"])
+        else:
+            message.setText(
+                self.translations["msg_compare_summary"].format(
+                    os.path.basename(file_paths[0]),
+                    new_label,
+                    len(diff.added_mods),
+                    len(diff.removed_mods),
+                    len(diff.changed_mods),
+                    len(diff.category_moves),
+                    len(diff.added_dependencies) + len(diff.removed_dependencies),
+                )
+            )
+            message.setDetailedText(format_diff(diff))
+        message.exec()
+
+    def show_merge_report(self, report):
+        """Summarize a merge import, listing the affected names in the details."""
+        message = QMessageBox(self)
+        message.setIcon(QMessageBox.Icon.Information)
+        message.setWindowTitle(self.translations["title_import_success"])
+        message.setText(
+            self.translations["msg_merge_summary"].format(
+                len(report.added), len(report.updated), len(report.removed), report.unchanged
+            )
+        )
+        details = []
+        for key, names in (
+            ("label_merge_added", report.added),
+            ("label_merge_updated", report.updated),
+            ("label_merge_removed", report.removed),
+            ("label_merge_added_categories", report.added_categories),
+            ("label_merge_removed_categories", report.removed_categories),
+        ):
+            if names:
+                details.append(self.translations[key] + "\n" + "\n".join(f"  {name}" for name in names))
+        if details:
+            message.setDetailedText("\n\n".join(details))
+        message.exec()
+
+    def show_sql_profile(self):
+        profiler = self.query_profiler
+        if not profiler:
+            return
+
+        def build_report():
+            return (
+                (profiler.report() or self.translations["msg_sql_profile_empty"])
+                + "\n\n"
+                + self.translations["msg_slow_query_log"].format(profiler.slow_query_ms, profiler.slow_log)
+            )
+
+        ReportDialog(
+            self.translations["title_sql_profile"], build_report, profiler.reset, "sql-profile.txt", self
+        ).exec()
+
+    def show_memory_report(self):
+        profiler = self.memory_profiler
+        if not profiler:
+            return
+
+        def build_report():
+            return (profiler.format_history() or self.translations["msg_memory_report_empty"]) + (
+                "\n\n" + self.translations["msg_memory_report_note"]
+            )
+
+        ReportDialog(
+            self.translations["title_memory_report"], build_report, profiler.history.clear, "memory-report.txt", self
+        ).exec()
+
     def show_about(self):
         """Show about dialog"""
         dialog = AboutDialog(self)
@@ -1909,9 +2446,20 @@ class MainWindow(QMainWindow):
 
 
 def main():
+    profiler = StartupProfiler() if PROFILE_STARTUP_FLAG in sys.argv else None
     app = QApplication(sys.argv)
-    window = MainWindow()
+    if profiler:
+        profiler.mark("QApplication")
+    # The window is shown before SQLAlchemy is imported; the catalog follows from a worker thread
+    window = MainWindow(load_async=True)
+    if profiler:
+        profiler.mark("main window")
     window.show()
+    if profiler:
+        profiler.mark("show")
+        QTimer.singleShot(0, lambda: profiler.mark("first paint"))
+        window.catalog_ready.connect(lambda: profiler.finish("catalog loaded"))
+    window.load_mods_async()
     sys.exit(app.exec())
 
 
@@ -0,0 +1,172 @@
+"""Memory diagnostics with ``tracemalloc`` snapshots around operations.
+
+While memory profiling is on, every watched tracing span takes a snapshot
+before and after its block, both after a garbage collection, so the difference
+is what the operation left behind rather than what it allocated on the way.
+The retained bytes, the peak and the top allocation sites are attached to the
+span and kept in a short history.
+
+Qt allocates widgets and table items outside the Python heap, which
+``tracemalloc`` cannot see, so the change in resident memory is recorded as
+well where the platform reports it.
+
+Memory profiling is off unless ``MMDM_MEMORY_PROFILE=1`` is set or
+``"memory_profile"`` is true in the config. It slows every watched operation
+down considerably.
+"""
+
+import gc
+import os
+import tracemalloc
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import tracing
+from tracing import Span, tracer
+
+# Spans that take snapshots
+WATCHED_SPANS = ("load_mods", "open_mod_dialog", "import_json", "import_folder")
+TRACEBACK_FRAMES = 10
+TOP_SITES = 10
+HISTORY = 50
+
+# Allocations of the profiler and the spans are not the application's
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracing.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass
+class MemoryReport:
+    """Memory use of one run of an operation."""
+
+    name: str
+    retained_bytes: int = 0
+    peak_bytes: int = 0
+    # None where the resident set size is not available
+    rss_delta_bytes: int | None = None
+    # (file:line, bytes retained, blocks retained), largest first
+    top_sites: list[tuple[str, int, int]] = field(default_factory=list)
+
+    def to_attrs(self) -> dict:
+        attrs: dict[str, object] = {"retained_kb": self.retained_bytes // 1024, "peak_kb": self.peak_bytes // 1024}
+        if self.rss_delta_bytes is not None:
+            attrs["rss_delta_kb"] = self.rss_delta_bytes // 1024
+        attrs["top_allocations"] = [
+            f"{site} {size // 1024} KB in {count} blocks" for site, size, count in self.top_sites
+        ]
+        return attrs
+
+
+def current_rss() -> int | None:
+    """Resident set size of this process in bytes, on systems with ``/proc``."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class MemoryProfiler:
+    def __init__(self, watched: tuple[str, ...] = WATCHED_SPANS, top: int = TOP_SITES):
+        self.watched = set(watched)
+        self.top = top
+        self.history: deque[MemoryReport] = deque(maxlen=HISTORY)
+        # Open measurements of the watched spans, innermost last
+        self._open: list[tuple[Span, tuple]] = []
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def begin(self) -> tuple:
+        """Take the starting snapshot; the result is passed on to ``end``."""
+        before = self._snapshot()
+        rss = current_rss()
+        tracemalloc.reset_peak()
+        traced, _ = tracemalloc.get_traced_memory()
+        return before, rss, traced
+
+    def end(self, name: str, state: tuple) -> MemoryReport:
+        _, peak = tracemalloc.get_traced_memory()
+        before, rss_before, traced_before = state
+        after = self._snapshot()
+        rss_after = current_rss()
+        differences = after.compare_to(before, "lineno")
+        report = MemoryReport(
+            name,
+            retained_bytes=sum(stat.size_diff for stat in differences),
+            peak_bytes=peak - traced_before,
+            rss_delta_bytes=rss_after - rss_before if rss_after is not None and rss_before is not None else None,
+            top_sites=[
+                (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff)
+                for stat in differences[: self.top]
+                if stat.size_diff > 0
+            ],
+        )
+        self.history.append(report)
+        return report
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[list[MemoryReport]]:
+        """Measure a block directly; the report is appended to the yielded list."""
+        self.start()
+        reports: list[MemoryReport] = []
+        state = self.begin()
+        try:
+            yield reports
+        finally:
+            reports.append(self.end(name, state))
+
+    # Tracing hooks, called as watched spans open and close
+
+    def on_span_enter(self, span: Span):
+        if span.name in self.watched:
+            self._open.append((span, self.begin()))
+
+    def on_span_exit(self, span: Span):
+        if self._open and self._open[-1][0] is span:
+            _, state = self._open.pop()
+            span.set(**self.end(span.name, state).to_attrs())
+
+    def format_history(self) -> str:
+        lines = []
+        for report in reversed(self.history):
+            rss = f", RSS {report.rss_delta_bytes / 1024:+.0f} KB" if report.rss_delta_bytes is not None else ""
+            lines.append(
+                f"{report.name}: {report.retained_bytes / 1024:+.0f} KB retained,"
+                f" peak {report.peak_bytes / 1024:.0f} KB{rss}"
+            )
+            lines.extend(
+                f"  {size / 1024:+9.0f} KB {count:+7d} blocks  {site}" for site, size, count in report.top_sites
+            )
+        return "\n".join(lines)
+
+
+# Set by enable_memory_profiling
+profiler: MemoryProfiler | None = None
+
+
+def enable_memory_profiling(watched: tuple[str, ...] = WATCHED_SPANS) -> MemoryProfiler:
+    """Start ``tracemalloc`` and snapshot the watched spans; tracing is enabled too."""
+    global profiler
+    if profiler is None:
+        profiler = MemoryProfiler(watched)
+        profiler.start()
+        tracer.enable()
+        tracer.hooks.append(profiler)
+    return profiler
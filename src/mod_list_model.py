@@ -0,0 +1,93 @@
+"""List model of mods for the dependency picker in the mod dialog.
+
+Each list keeps ``(id, name)`` pairs sorted by name (case-insensitive). Mods
+move between the available and the selected list in batches: the rows leaving
+a list are removed one contiguous range at a time, and the rows arriving are
+inserted in blocks at their sorted positions, so moving many mods at once
+costs about one pass over the list instead of one pass per mod.
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, QSortFilterProxyModel, Qt
+
+# Above this many insert positions the whole list is rebuilt instead
+MAX_INSERT_BLOCKS = 64
+
+
+def _key(item: tuple[int, str]) -> tuple[str, int]:
+    return item[1].lower(), item[0]
+
+
+class ModListModel(QAbstractListModel):
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self.items: list[tuple[int, str]] = []
+        self.keys: list[tuple[str, int]] = []
+
+    def set_items(self, items: Iterable[tuple[int, str]]):
+        decorated = sorted((_key(item), item) for item in items)
+        self.beginResetModel()
+        self.keys = [key for key, _ in decorated]
+        self.items = [item for _, item in decorated]
+        self.endResetModel()
+
+    def names(self) -> list[str]:
+        return [name for _, name in self.items]
+
+    def take(self, ids: set[int]) -> list[tuple[int, str]]:
+        """Remove the mods with the given ids and return them, in list order."""
+        rows = [row for row, (mod_id, _) in enumerate(self.items) if mod_id in ids]
+        taken = [self.items[row] for row in rows]
+        # Contiguous runs of rows, removed from the end so earlier rows keep their numbers
+        end = len(rows)
+        while end:
+            start = end - 1
+            while start and rows[start - 1] == rows[start] - 1:
+                start -= 1
+            first, last = rows[start], rows[end - 1]
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.items[first : last + 1]
+            del self.keys[first : last + 1]
+            self.endRemoveRows()
+            end = start
+        return taken
+
+    def add(self, items: list[tuple[int, str]]):
+        """Insert mods at their sorted positions."""
+        if not items:
+            return
+        items = sorted(items, key=_key)
+        # New mods grouped by the position they go to in the current list
+        blocks: list[tuple[int, list[tuple[int, str]]]] = []
+        for item in items:
+            position = bisect_left(self.keys, _key(item))
+            if blocks and blocks[-1][0] == position:
+                blocks[-1][1].append(item)
+            else:
+                blocks.append((position, [item]))
+        if len(blocks) > MAX_INSERT_BLOCKS:
+            self.set_items(self.items + items)
+            return
+        for position, block in reversed(blocks):
+            self.beginInsertRows(QModelIndex(), position, position + len(block) - 1)
+            self.items[position:position] = block
+            self.keys[position:position] = [_key(item) for item in block]
+            self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: B008, N802
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self.items[index.row()][1]
+        return None
+
+
+def filtered(model: ModListModel, parent: QObject | None = None) -> QSortFilterProxyModel:
+    """A proxy that shows the mods of ``model`` whose name contains the filter text, ignoring case."""
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(model)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
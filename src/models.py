@@ -1,4 +1,6 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Table
+from typing import cast
+
+from sqlalchemy import JSON, BigInteger, Boolean, Column, ForeignKey, Integer, String, Table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
@@ -37,6 +39,8 @@ class Mod(Base):
     client_required: Mapped[bool] = mapped_column(Boolean, default=True)
     server_required: Mapped[bool] = mapped_column(Boolean, default=True)
     filename: Mapped[str] = mapped_column(String)
+    # SHA-256 of the jar in the content-addressed store (None for legacy rows stored as mods/<filename>)
+    sha256: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
     notes: Mapped[str | None] = mapped_column(String, nullable=True)
 
     # Relationships
@@ -47,3 +51,33 @@ class Mod(Base):
         secondaryjoin=(id == mod_dependency.c.dependency_id),
         backref="dependent_mods",
     )
+
+
+# The tables behind the mapped classes, for Core insert/update/delete statements
+# (``__table__`` is declared as a FromClause, which those statements do not accept)
+mod_table = cast(Table, Mod.__table__)
+category_table = cast(Table, Category.__table__)
+
+
+class FileHash(Base):
+    """Cached SHA-256 of a file, valid while its size and modification time are unchanged."""
+
+    __tablename__ = "file_hashes"
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger)
+    sha256: Mapped[str] = mapped_column(String)
+
+
+class JarScan(Base):
+    """Loader metadata read from a jar, keyed by the jar's SHA-256."""
+
+    __tablename__ = "jar_scans"
+
+    sha256: Mapped[str] = mapped_column(String, primary_key=True)
+    # None when the jar has no loader metadata
+    mod_id: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+    version: Mapped[str | None] = mapped_column(String, nullable=True)
+    dependencies: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
@@ -0,0 +1,95 @@
+"""Pack manifests and delta update archives.
+
+A manifest records the SHA-256, size and modification time of every jar in an
+exported pack. Comparing the manifest of the previous release with the current
+catalog yields the jars that have to be shipped and the ones clients should
+remove, so an update only carries what actually changed.
+"""
+
+import json
+import zipfile
+from collections.abc import Iterable
+from pathlib import Path
+
+import store
+from hashing import sha256_file
+from models import Mod
+
+MANIFEST_NAME = "manifest.json"
+REMOVED_NAME = "removed.txt"
+MANIFEST_VERSION = 1
+
+
+def load_manifest(path: Path | str) -> dict:
+    """Load a manifest from disk."""
+    with open(path, encoding="utf-8") as f:
+        manifest: dict = json.load(f)
+    if "files" not in manifest:
+        raise ValueError(f"{path} is not a pack manifest")
+    return manifest
+
+
+def save_manifest(manifest: dict, path: Path | str) -> None:
+    """Write a manifest to disk."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+
+
+def build_manifest(mods: Iterable[Mod], mods_dir: Path = Path("mods"), previous: dict | None = None) -> dict:
+    """Build a manifest for the given mods.
+
+    Mods in the content store already carry their hash. For legacy files,
+    hashes recorded in ``previous`` are reused when the size and modification
+    time of the source file are unchanged, so only new or modified jars are
+    read.
+    """
+    previous_files = previous.get("files", {}) if previous else {}
+    files = {}
+    for mod in mods:
+        source_path = store.mod_path(mod, mods_dir)
+        stat = source_path.stat()
+        known = previous_files.get(mod.filename)
+        if mod.sha256:
+            sha256 = mod.sha256
+        elif known and known.get("size") == stat.st_size and known.get("mtime_ns") == stat.st_mtime_ns:
+            sha256 = known["sha256"]
+        else:
+            sha256 = sha256_file(source_path)
+        files[mod.filename] = {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return {"version": MANIFEST_VERSION, "files": files}
+
+
+def diff_manifests(previous: dict, current: dict) -> tuple[list[str], list[str], list[str]]:
+    """Return the added, changed and removed filenames between two manifests."""
+    previous_files = previous["files"]
+    current_files = current["files"]
+    added = sorted((name for name in current_files if name not in previous_files), key=str.lower)
+    changed = sorted(
+        (
+            name
+            for name, entry in current_files.items()
+            if name in previous_files and previous_files[name]["sha256"] != entry["sha256"]
+        ),
+        key=str.lower,
+    )
+    removed = sorted((name for name in previous_files if name not in current_files), key=str.lower)
+    return added, changed, removed
+
+
+def write_delta_pack(
+    previous: dict, current: dict, archive_path: Path | str, sources: dict[str, Path]
+) -> tuple[int, int, int]:
+    """Write a delta archive from ``previous`` to ``current``.
+
+    ``sources`` maps each exported filename to the jar on disk. The archive
+    contains the added and changed jars, a ``removed.txt`` listing the jars to
+    delete and the new manifest. Jars are stored without recompression since
+    they are already zip files.
+    """
+    added, changed, removed = diff_manifests(previous, current)
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for filename in added + changed:
+            archive.write(sources[filename], filename, compress_type=zipfile.ZIP_STORED)
+        archive.writestr(REMOVED_NAME, "".join(f"{filename}\n" for filename in removed))
+        archive.writestr(MANIFEST_NAME, json.dumps(current, ensure_ascii=False, indent=4))
+    return len(added), len(changed), len(removed)
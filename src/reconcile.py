@@ -0,0 +1,110 @@
+"""Reconciliation between the mods folder and the catalog.
+
+One ``os.scandir`` of the mods folder and one projection query of the mod
+table are set-diffed, so building the report is linear in the number of files
+and rows and never reads jar contents.
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import store
+from database import QUERY_CHUNK_SIZE
+from exchange import delete_mod_rows
+from models import Mod, mod_dependency
+
+
+@dataclass
+class ReconciliationReport:
+    """Files without rows and rows without files."""
+
+    # File names in the mods folder that no mod points at
+    orphaned_files: list[str] = field(default_factory=list)
+    # (id, name) of mods whose jar is not in the mods folder
+    missing_mods: list[tuple[int, str]] = field(default_factory=list)
+
+
+def list_files(mods_dir: Path = store.MODS_DIR) -> set[str]:
+    """Return the names of the jars in the mods folder.
+
+    Partial ``.incoming-*`` copies are left out: they may belong to a copy
+    that is still running.
+    """
+    try:
+        with os.scandir(mods_dir) as entries:
+            return {entry.name for entry in entries if entry.is_file() and entry.name.lower().endswith(".jar")}
+    except FileNotFoundError:
+        return set()
+
+
+def build_report(db: Session, mods_dir: Path = store.MODS_DIR) -> ReconciliationReport:
+    """Compare the mods folder with the catalog."""
+    on_disk = list_files(mods_dir)
+    expected = set()
+    report = ReconciliationReport()
+    for mod_pk, name, filename, sha256 in db.execute(select(Mod.id, Mod.name, Mod.filename, Mod.sha256)):
+        disk_name = store.disk_name(filename, sha256)
+        expected.add(disk_name)
+        if disk_name not in on_disk:
+            report.missing_mods.append((mod_pk, name))
+    report.orphaned_files = sorted(on_disk - expected, key=str.lower)
+    report.missing_mods.sort(key=lambda mod: mod[1].lower())
+    return report
+
+
+def delete_orphaned_files(names: list[str], mods_dir: Path = store.MODS_DIR) -> list[str]:
+    """Delete orphaned files and return error messages for those that could not be removed."""
+    errors = []
+    for name in names:
+        try:
+            (mods_dir / name).unlink(missing_ok=True)
+        except OSError as e:
+            errors.append(f"{name}: {e}")
+    return errors
+
+
+def delete_mods(db: Session, mod_ids: list[int]) -> dict[str, list[str]]:
+    """Delete mods together with their category links and dependency edges in one transaction.
+
+    Like ``services.delete_mod``, a mod that a kept mod depends on is not
+    deleted; mods that only depend on each other go together. Returns the
+    names of the kept mods with the names of the mods that depend on them.
+    """
+    # Mods that depend on the mods to delete
+    requested = set(mod_ids)
+    dependents: dict[int, set[int]] = {}
+    for chunk_start in range(0, len(mod_ids), QUERY_CHUNK_SIZE):
+        chunk = mod_ids[chunk_start : chunk_start + QUERY_CHUNK_SIZE]
+        edges = select(mod_dependency.c.dependency_id, mod_dependency.c.mod_id).where(
+            mod_dependency.c.dependency_id.in_(chunk)
+        )
+        for dependency_id, mod_pk in db.execute(edges):
+            dependents.setdefault(dependency_id, set()).add(mod_pk)
+
+    # Keeping a mod keeps what it depends on, so repeat until nothing changes
+    deleting = set(requested)
+    changed = True
+    while changed:
+        changed = False
+        for mod_pk in list(deleting):
+            if dependents.get(mod_pk, set()) - deleting:
+                deleting.discard(mod_pk)
+                changed = True
+
+    kept_ids = requested - deleting
+    kept = {}
+    if kept_ids:
+        names = dict(db.execute(select(Mod.id, Mod.name)).all())
+        for mod_pk in kept_ids:
+            kept[names[mod_pk]] = sorted((names[pk] for pk in dependents[mod_pk]), key=str.lower)
+    try:
+        delete_mod_rows(db, [mod_pk for mod_pk in mod_ids if mod_pk in deleting])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return dict(sorted(kept.items(), key=lambda item: item[0].lower()))
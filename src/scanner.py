@@ -0,0 +1,201 @@
+"""Loader metadata scanner for mod jars.
+
+Only the zip central directory and the loader metadata file are read from each
+jar (``fabric.mod.json``, ``quilt.mod.json`` or ``META-INF/mods.toml``).
+Results are cached by the jar's SHA-256, so rescanning a folder only opens jars
+that are new or changed.
+"""
+
+import json
+import os
+import re
+import tomllib
+import zipfile
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+import store
+from database import QUERY_CHUNK_SIZE
+from hashing import HashCache, hash_files
+from models import JarScan, Mod
+
+# Dependencies on the game or the loader itself are not mods in the catalog
+PLATFORM_IDS = {"minecraft", "java", "fabricloader", "quilt_loader", "forge", "neoforge"}
+
+
+@dataclass
+class JarMetadata:
+    """Mod information declared in a jar's loader metadata."""
+
+    mod_id: str
+    name: str | None = None
+    version: str | None = None
+    dependencies: list[str] = field(default_factory=list)
+
+
+def _parse_fabric(data: bytes) -> JarMetadata:
+    info = json.loads(data, strict=False)
+    return JarMetadata(
+        mod_id=info["id"],
+        name=info.get("name"),
+        version=info.get("version"),
+        dependencies=list(info.get("depends", {})),
+    )
+
+
+def _parse_quilt(data: bytes) -> JarMetadata:
+    info = json.loads(data, strict=False)["quilt_loader"]
+    dependencies = []
+    for dependency in info.get("depends", []):
+        if isinstance(dependency, str):
+            dependencies.append(dependency)
+        elif isinstance(dependency, dict) and not dependency.get("optional", False):
+            dependencies.append(dependency["id"])
+    return JarMetadata(
+        mod_id=info["id"],
+        name=info.get("metadata", {}).get("name"),
+        version=info.get("version"),
+        dependencies=dependencies,
+    )
+
+
+def _parse_mods_toml(data: bytes, jar: zipfile.ZipFile) -> JarMetadata:
+    info = tomllib.loads(data.decode("utf-8"))
+    mod = info["mods"][0]
+    mod_id = mod["modId"]
+    version = mod.get("version")
+    if version and version.startswith("${"):
+        # Forge substitutes the jar version from the manifest at runtime
+        version = _manifest_version(jar)
+    dependencies = []
+    for dependency in info.get("dependencies", {}).get(mod_id, []):
+        required = dependency.get("mandatory", dependency.get("type", "required") == "required")
+        if required:
+            dependencies.append(dependency["modId"])
+    return JarMetadata(mod_id=mod_id, name=mod.get("displayName"), version=version, dependencies=dependencies)
+
+
+def _manifest_version(jar: zipfile.ZipFile) -> str | None:
+    try:
+        manifest = jar.read("META-INF/MANIFEST.MF").decode("utf-8", errors="replace")
+    except KeyError:
+        return None
+    match = re.search(r"^Implementation-Version:\s*(\S+)", manifest, re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def read_jar_metadata(path: Path | str) -> JarMetadata | None:
+    """Read loader metadata from a jar, or return None if it declares none."""
+    with zipfile.ZipFile(path) as jar:
+        for member, parse in (
+            ("fabric.mod.json", _parse_fabric),
+            ("quilt.mod.json", _parse_quilt),
+        ):
+            if member in jar.NameToInfo:
+                metadata = parse(jar.read(member))
+                break
+        else:
+            for member in ("META-INF/mods.toml", "META-INF/neoforge.mods.toml"):
+                if member in jar.NameToInfo:
+                    metadata = _parse_mods_toml(jar.read(member), jar)
+                    break
+            else:
+                return None
+    metadata.dependencies = sorted({d for d in metadata.dependencies if d not in PLATFORM_IDS and d != metadata.mod_id})
+    return metadata
+
+
+def _safe_read(path: Path) -> JarMetadata | None:
+    try:
+        return read_jar_metadata(path)
+    except (OSError, zipfile.BadZipFile, ValueError, KeyError, IndexError, TypeError, tomllib.TOMLDecodeError):
+        return None
+
+
+def _load_scans(db: Session, hashes: set[str]) -> dict[str, JarScan]:
+    hash_list = list(hashes)
+    scans = {}
+    for start in range(0, len(hash_list), QUERY_CHUNK_SIZE):
+        chunk = hash_list[start : start + QUERY_CHUNK_SIZE]
+        for scan in db.query(JarScan).filter(JarScan.sha256.in_(chunk)):
+            scans[scan.sha256] = scan
+    return scans
+
+
+def scan_jars(
+    paths: Iterable[Path], db: Session, max_workers: int | None = None
+) -> dict[Path, tuple[str | None, JarMetadata | None]]:
+    """Scan jars in parallel and return their hash and metadata.
+
+    Jars whose hash already has a scan result are not opened again.
+    """
+    # Jars outside the store are usually scanned once, so their hashes are not kept
+    digests = hash_files(paths, HashCache(db, store.MODS_DIR), max_workers=max_workers)
+    scans = _load_scans(db, {sha256 for sha256 in digests.values() if sha256})
+
+    pending: dict[str, Path] = {}
+    for path, sha256 in digests.items():
+        if sha256 and sha256 not in scans:
+            pending.setdefault(sha256, path)
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) + 2)) as executor:
+        for sha256, metadata in zip(pending, executor.map(_safe_read, pending.values()), strict=True):
+            scan = JarScan(sha256=sha256)
+            if metadata:
+                scan.mod_id = metadata.mod_id
+                scan.name = metadata.name
+                scan.version = metadata.version
+                scan.dependencies = metadata.dependencies
+            db.add(scan)
+            scans[sha256] = scan
+    db.commit()
+
+    results: dict[Path, tuple[str | None, JarMetadata | None]] = {}
+    for path, sha256 in digests.items():
+        scan = scans.get(sha256) if sha256 else None
+        if scan is None or scan.mod_id is None:
+            results[path] = (sha256, None)
+        else:
+            metadata = JarMetadata(scan.mod_id, scan.name, scan.version, list(scan.dependencies or []))
+            results[path] = (sha256, metadata)
+    return results
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[\s_\-]", "", name).lower()
+
+
+class DependencyIndex:
+    """Maps declared dependency ids to catalog mods.
+
+    Mods are matched by the id of their scanned jar, falling back to a
+    normalized comparison of the id with the mod name. The index is built from
+    a single query, so resolving many jars does not query per dependency.
+    """
+
+    def __init__(self, db: Session):
+        self.by_mod_id: dict[str, set[tuple[int, str]]] = defaultdict(set)
+        self.by_name: dict[str, set[tuple[int, str]]] = defaultdict(set)
+        rows = db.query(Mod.id, Mod.name, JarScan.mod_id).outerjoin(JarScan, JarScan.sha256 == Mod.sha256)
+        for mod_pk, name, scanned_id in rows:
+            if scanned_id:
+                self.by_mod_id[scanned_id].add((mod_pk, name))
+            self.by_name[_normalize(name)].add((mod_pk, name))
+
+    def resolve(self, dependency_ids: Iterable[str]) -> set[tuple[int, str]]:
+        """Return (id, name) of the catalog mods matching the given dependency ids."""
+        matches: set[tuple[int, str]] = set()
+        for dependency_id in dependency_ids:
+            matches |= self.by_mod_id.get(dependency_id, set())
+            matches |= self.by_name.get(_normalize(dependency_id), set())
+        return matches
+
+
+def resolve_dependencies(db: Session, dependency_ids: Iterable[str]) -> set[int]:
+    """Return the ids of the catalog mods matching declared dependency ids."""
+    return {mod_pk for mod_pk, _ in DependencyIndex(db).resolve(dependency_ids)}
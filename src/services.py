@@ -0,0 +1,517 @@
+"""Catalog operations shared by the GUI and the command line.
+
+Functions here take a session and return plain results. Nothing in this module
+imports Qt or shows messages, so callers decide how to report outcomes and the
+same code paths can run headless or off the GUI thread. Failures the caller is
+expected to explain to the user are raised as the exceptions defined below.
+
+Writes go through Core statements on whole sets of ids, so saving a mod or
+moving many mods between categories costs a fixed number of queries.
+"""
+
+import shutil
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import func
+
+import store
+from database import QUERY_CHUNK_SIZE
+from exchange import delete_mod_rows, sort_category_names
+from integrity import verify_mods
+from models import Category, Mod, mod_category, mod_dependency, mod_table
+from packs import MANIFEST_NAME, build_manifest, load_manifest, save_manifest, write_delta_pack
+from reconcile import build_report
+
+PACK_TYPES = ("client", "server")
+
+
+class NotFoundError(LookupError):
+    """The mod or category no longer exists."""
+
+
+class DuplicateNameError(ValueError):
+    """Another mod or category already uses the name."""
+
+    def __init__(self, field_name: str, value: str):
+        super().__init__(f"{field_name} '{value}' already exists")
+        self.field_name = field_name
+        self.value = value
+
+
+class HasDependentsError(ValueError):
+    """Other mods still depend on the mod."""
+
+    def __init__(self, dependents: list[str]):
+        super().__init__(f"Required by {', '.join(dependents)}")
+        self.dependents = dependents
+
+
+def pack_mods(db: Session, mod_type: str) -> list[Mod]:
+    """Return the mods that belong in a client or server pack."""
+    if mod_type not in PACK_TYPES:
+        raise ValueError(f"Unknown pack type: {mod_type}")
+    column = Mod.client_required if mod_type == "client" else Mod.server_required
+    return db.query(Mod).filter(column.is_(True)).order_by(func.lower(Mod.name)).all()
+
+
+def pack_dir(mod_type: str) -> Path:
+    """Return the default export folder of a pack."""
+    return Path(f"{mod_type}_mods")
+
+
+@dataclass
+class PackExportResult:
+    """Outcome of exporting a pack folder."""
+
+    export_dir: Path
+    # Number of mods selected for the pack
+    total: int = 0
+    exported: list[str] = field(default_factory=list)
+    # Source paths of jars that are not in the mods folder
+    missing: list[str] = field(default_factory=list)
+    # (file name, error message)
+    failed: list[tuple[str, str]] = field(default_factory=list)
+    manifest_error: str | None = None
+
+
+def export_pack(db: Session, mod_type: str, export_dir: Path | None = None) -> PackExportResult:
+    """Copy the jars of a pack into ``export_dir`` and write its manifest.
+
+    Files left from the previous export are removed first. The previous
+    manifest is reused so hashes of unchanged legacy jars are not recomputed.
+    """
+    export_dir = export_dir or pack_dir(mod_type)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    result = PackExportResult(export_dir)
+
+    previous_manifest = None
+    manifest_path = export_dir / MANIFEST_NAME
+    if manifest_path.exists():
+        try:
+            previous_manifest = load_manifest(manifest_path)
+        except Exception:
+            previous_manifest = None
+
+    for item in export_dir.glob("*"):
+        if item.is_file():
+            item.unlink()
+
+    mods = pack_mods(db, mod_type)
+    result.total = len(mods)
+    if not mods:
+        return result
+
+    exported_mods = []
+    for mod in mods:
+        source_path = store.mod_path(mod)
+        if not source_path.exists():
+            result.missing.append(str(source_path))
+            continue
+        try:
+            shutil.copy2(source_path, export_dir / mod.filename)
+        except Exception as e:
+            result.failed.append((mod.filename, str(e)))
+            continue
+        result.exported.append(mod.filename)
+        exported_mods.append(mod)
+
+    # Record the exported state so later releases can be shipped as delta packs
+    try:
+        save_manifest(build_manifest(exported_mods, previous=previous_manifest), manifest_path)
+    except Exception as e:
+        result.manifest_error = str(e)
+    return result
+
+
+def export_delta(
+    db: Session, mod_type: str, previous_manifest_path: Path | str, archive_path: Path | str
+) -> tuple[int, int, int]:
+    """Write a delta archive from a previous pack manifest and return the counts of added, changed and removed jars."""
+    previous_manifest = load_manifest(previous_manifest_path)
+    mods = pack_mods(db, mod_type)
+    current_manifest = build_manifest(mods, previous=previous_manifest)
+    sources = {mod.filename: store.mod_path(mod) for mod in mods}
+    return write_delta_pack(previous_manifest, current_manifest, archive_path, sources)
+
+
+def dependency_graph(db: Session) -> tuple[list[str], dict[str, list[str]]]:
+    """Return all mod names and each mod's dependencies, sorted case-insensitively."""
+    names = list(db.scalars(select(Mod.name).order_by(func.lower(Mod.name))))
+    by_id = dict(db.execute(select(Mod.id, Mod.name)).all())
+    dependencies: dict[str, list[str]] = defaultdict(list)
+    for mod_pk, dependency_pk in db.execute(select(mod_dependency.c.mod_id, mod_dependency.c.dependency_id)):
+        dependencies[by_id[mod_pk]].append(by_id[dependency_pk])
+    for dependency_names in dependencies.values():
+        dependency_names.sort(key=str.lower)
+    return names, dependencies
+
+
+def _branch_prefix(is_last: bool) -> str:
+    return "└── " if is_last else "├── "
+
+
+def _write_subtree(lines: list[str], name: str, dependencies: dict[str, list[str]], visited: list[str], level: int):
+    indent = "  " * (level + 1)
+    if name in visited:
+        lines.append(f"{indent}└── {name} (circular dependency)")
+        return
+    visited = visited + [name]
+    children = dependencies.get(name, [])
+    for i, child in enumerate(children):
+        lines.append(f"{indent}{_branch_prefix(i == len(children) - 1)}{child}")
+        _write_subtree(lines, child, dependencies, visited, level + 1)
+
+
+def dependency_tree(db: Session) -> str:
+    """Render the dependency tree of the catalog, followed by a flat dependency list.
+
+    The graph is loaded with two queries; mods that no other mod depends on are
+    the roots of the tree.
+    """
+    names, dependencies = dependency_graph(db)
+    required = {name for dependency_names in dependencies.values() for name in dependency_names}
+    roots = [name for name in names if name not in required] or names
+
+    lines = ["Dependency Tree:", "=" * 50, "", "# Hierarchical Dependencies"]
+    for root in roots:
+        lines.append(root)
+        children = dependencies.get(root, [])
+        for i, child in enumerate(children):
+            lines.append(f"  {_branch_prefix(i == len(children) - 1)}{child}")
+            _write_subtree(lines, child, dependencies, [root], 1)
+
+    lines.extend(["", "", "# Flat Dependencies List"])
+    for name in names:
+        dependency_names = dependencies.get(name)
+        lines.append(f"{name} (dependencies: {', '.join(dependency_names)})" if dependency_names else name)
+    return "\n".join(lines) + "\n"
+
+
+def find_cycles(dependencies: dict[str, list[str]]) -> list[list[str]]:
+    """Return one path for every dependency cycle, found by an iterative depth-first search."""
+    cycles = []
+    state: dict[str, int] = {}  # 1 = on the current path, 2 = finished
+    for start in sorted(dependencies, key=str.lower):
+        if start in state:
+            continue
+        path = [start]
+        stack = [iter(dependencies.get(start, []))]
+        state[start] = 1
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                state[path.pop()] = 2
+                stack.pop()
+            elif state.get(child) == 1:
+                cycles.append(path[path.index(child) :] + [child])
+            elif child not in state:
+                state[child] = 1
+                path.append(child)
+                stack.append(iter(dependencies.get(child, [])))
+    return cycles
+
+
+@dataclass
+class ValidationReport:
+    """Problems found in the catalog and the mods folder."""
+
+    # Mod names whose jar is not in the mods folder
+    missing_files: list[str] = field(default_factory=list)
+    # Mod names whose jar does not match its recorded SHA-256
+    corrupted_files: list[str] = field(default_factory=list)
+    orphaned_files: list[str] = field(default_factory=list)
+    uncategorized_mods: list[str] = field(default_factory=list)
+    dependency_cycles: list[list[str]] = field(default_factory=list)
+
+    def is_valid(self) -> bool:
+        return not (self.missing_files or self.corrupted_files or self.dependency_cycles)
+
+
+def validate_catalog(db: Session, check_hashes: bool = False, full: bool = False) -> ValidationReport:
+    """Check the catalog for missing or orphaned jars, uncategorized mods and dependency cycles.
+
+    With ``check_hashes`` every stored jar is also hashed (``full`` bypasses the
+    hash cache).
+    """
+    report = ValidationReport()
+    reconciliation = build_report(db)
+    report.missing_files = [name for _, name in reconciliation.missing_mods]
+    report.orphaned_files = reconciliation.orphaned_files
+
+    categorized = select(mod_category.c.mod_id)
+    report.uncategorized_mods = list(
+        db.scalars(select(Mod.name).where(Mod.id.not_in(categorized)).order_by(func.lower(Mod.name)))
+    )
+
+    _, dependencies = dependency_graph(db)
+    report.dependency_cycles = find_cycles(dependencies)
+
+    if check_hashes:
+        report.corrupted_files = verify_mods(db, full=full).corrupted
+    return report
+
+
+@dataclass
+class ModRecord:
+    """Editable fields of a mod, with categories and dependencies by name."""
+
+    name: str
+    filename: str
+    is_translated: bool = False
+    client_required: bool = True
+    server_required: bool = True
+    notes: str = ""
+    categories: list[str] = field(default_factory=list)
+    dependencies: list[str] = field(default_factory=list)
+    # None for a mod that has not been saved yet
+    mod_id: int | None = None
+    sha256: str | None = None
+    # Ids of ``dependencies`` in the same order, filled in by ``get_mod``
+    dependency_ids: list[int] = field(default_factory=list)
+
+
+def find_mod_id(db: Session, name: str) -> int | None:
+    return db.scalar(select(Mod.id).where(Mod.name == name))
+
+
+def get_mod(db: Session, mod_id: int) -> ModRecord | None:
+    """Load a mod with its category and dependency names."""
+    row = db.execute(select(Mod.__table__).where(Mod.id == mod_id)).first()
+    if row is None:
+        return None
+    dependency = aliased(Mod)
+    categories = db.scalars(
+        select(Category.name)
+        .join(mod_category, mod_category.c.category_id == Category.id)
+        .where(mod_category.c.mod_id == mod_id)
+        .order_by(func.lower(Category.name))
+    )
+    dependencies = db.execute(
+        select(dependency.id, dependency.name)
+        .join(mod_dependency, mod_dependency.c.dependency_id == dependency.id)
+        .where(mod_dependency.c.mod_id == mod_id)
+        .order_by(func.lower(dependency.name))
+    ).all()
+    return ModRecord(
+        name=row.name,
+        filename=row.filename,
+        is_translated=row.is_translated,
+        client_required=row.client_required,
+        server_required=row.server_required,
+        notes=row.notes or "",
+        categories=list(categories),
+        dependencies=[name for _, name in dependencies],
+        mod_id=row.id,
+        sha256=row.sha256,
+        dependency_ids=[dependency_pk for dependency_pk, _ in dependencies],
+    )
+
+
+def _ids_by_name(db: Session, column, names: list[str]) -> list[int]:
+    ids: list[int] = []
+    for start in range(0, len(names), QUERY_CHUNK_SIZE):
+        chunk = names[start : start + QUERY_CHUNK_SIZE]
+        ids.extend(db.scalars(select(column.table.c.id).where(column.in_(chunk))))
+    return ids
+
+
+def _set_links(db: Session, table, column, mod_ids: list[int], target_ids: list[int]):
+    """Replace the links of ``mod_ids`` in an association table with ``target_ids``."""
+    for start in range(0, len(mod_ids), QUERY_CHUNK_SIZE):
+        db.execute(delete(table).where(table.c.mod_id.in_(mod_ids[start : start + QUERY_CHUNK_SIZE])))
+    links = [{"mod_id": mod_pk, column.name: target_pk} for mod_pk in mod_ids for target_pk in target_ids]
+    if links:
+        db.execute(insert(table), links)
+
+
+def save_mod(
+    db: Session, record: ModRecord, source_path: Path | str | None = None, source_sha256: str | None = None
+) -> int:
+    """Insert or update a mod and return its id.
+
+    New mods copy ``source_path`` into the content store, reusing
+    ``source_sha256`` if the jar was already hashed, e.g. by ``scan_jars``.
+    Legacy jars of edited mods are moved into the store, so later renames only
+    touch the database.
+    The legacy jar is removed only after the commit, and a blob written for a
+    save that fails is released again.
+    Categories are replaced only when at least one of the given names exists;
+    dependencies are always replaced.
+    """
+    if not record.name or not record.filename:
+        raise ValueError("Name and file name are required")
+
+    editing = record.mod_id is not None
+    clash = select(mod_table.c.id)
+    if editing:
+        clash = clash.where(mod_table.c.id != record.mod_id)
+    # File names are only used when exporting, but they must stay unique
+    if db.scalar(clash.where(mod_table.c.filename == record.filename).limit(1)):
+        raise DuplicateNameError("filename", record.filename)
+    if db.scalar(clash.where(mod_table.c.name == record.name).limit(1)):
+        raise DuplicateNameError("name", record.name)
+
+    values: dict[str, object] = {
+        "name": record.name,
+        "filename": record.filename,
+        "is_translated": record.is_translated,
+        "client_required": record.client_required,
+        "server_required": record.server_required,
+        "notes": record.notes,
+    }
+    legacy_filename = None
+    sha256 = None
+    if editing:
+        current = db.execute(select(mod_table.c.filename, mod_table.c.sha256).where(mod_table.c.id == record.mod_id))
+        row = current.first()
+        if row is None:
+            raise NotFoundError(record.name)
+        if not row.sha256 and (store.MODS_DIR / row.filename).exists():
+            values["sha256"] = sha256 = store.adopt(row.filename)
+            legacy_filename = row.filename
+    else:
+        if not source_path:
+            raise ValueError("A jar file is required for a new mod")
+        # Identical jars are stored only once
+        if source_sha256:
+            store.copy_blob(source_path, source_sha256)
+            values["sha256"] = sha256 = source_sha256
+        else:
+            values["sha256"] = sha256 = store.add_file(source_path)
+
+    try:
+        mod_pk: int
+        if record.mod_id is not None:
+            mod_pk = record.mod_id
+            db.execute(update(mod_table).where(mod_table.c.id == mod_pk).values(values))
+        else:
+            mod_pk = db.execute(insert(mod_table).values(values).returning(mod_table.c.id)).scalar_one()
+
+        category_ids = _ids_by_name(db, Category.name, record.categories)
+        if category_ids:
+            _set_links(db, mod_category, mod_category.c.category_id, [mod_pk], category_ids)
+        dependency_ids = [pk for pk in _ids_by_name(db, Mod.name, record.dependencies) if pk != mod_pk]
+        _set_links(db, mod_dependency, mod_dependency.c.dependency_id, [mod_pk], dependency_ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        # Drop the blob written above unless another mod already used it
+        store.release(db, sha256)
+        raise
+    if legacy_filename:
+        store.drop_legacy(legacy_filename)
+    return mod_pk
+
+
+def dependents(db: Session, mod_id: int) -> list[str]:
+    """Return the names of the mods that depend on a mod."""
+    return list(
+        db.scalars(
+            select(Mod.name)
+            .join(mod_dependency, mod_dependency.c.mod_id == Mod.id)
+            .where(mod_dependency.c.dependency_id == mod_id)
+            .order_by(func.lower(Mod.name))
+        )
+    )
+
+
+def delete_mod(db: Session, mod_id: int):
+    """Delete a mod that no other mod depends on, together with its jar if no other mod shares it."""
+    row = db.execute(select(Mod.filename, Mod.sha256).where(Mod.id == mod_id)).first()
+    if row is None:
+        raise NotFoundError(mod_id)
+    required_by = dependents(db, mod_id)
+    if required_by:
+        raise HasDependentsError(required_by)
+
+    try:
+        if not row.sha256:
+            # Delete legacy file
+            (store.MODS_DIR / row.filename).unlink(missing_ok=True)
+        # Delete from database, then drop the blob if no other mod shares it
+        delete_mod_rows(db, [mod_id])
+        db.flush()
+        store.release(db, row.sha256)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def ensure_category(db: Session, name: str) -> int:
+    """Return the id of a category, creating it if needed."""
+    category_pk = db.scalar(select(Category.id).where(Category.name == name))
+    if category_pk is None:
+        category_pk = db.execute(insert(Category).values(name=name).returning(Category.id)).scalar_one()
+        db.commit()
+    return category_pk
+
+
+def category_names(db: Session, default_name: str) -> list[str]:
+    """Return all category names with the default category, which is created if missing, first."""
+    ensure_category(db, default_name)
+    return sort_category_names(list(db.scalars(select(Category.name))), default_name)
+
+
+def add_category(db: Session, name: str) -> int:
+    """Create a category and return its id."""
+    if db.scalar(select(Category.id).where(Category.name == name)):
+        raise DuplicateNameError("category", name)
+    category_pk = db.execute(insert(Category).values(name=name).returning(Category.id)).scalar_one()
+    db.commit()
+    return category_pk
+
+
+def rename_category(db: Session, old_name: str, new_name: str):
+    if not db.scalar(select(Category.id).where(Category.name == old_name)):
+        raise NotFoundError(old_name)
+    if db.scalar(select(Category.id).where(Category.name == new_name)):
+        raise DuplicateNameError("category", new_name)
+    db.execute(update(Category).where(Category.name == old_name).values(name=new_name))
+    db.commit()
+
+
+def reassign_mods(db: Session, mod_ids: list[int], category_name: str) -> int:
+    """Move mods into a single category, creating it if needed, and return the number moved."""
+    category_pk = ensure_category(db, category_name)
+    try:
+        _set_links(db, mod_category, mod_category.c.category_id, list(mod_ids), [category_pk])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(mod_ids)
+
+
+def delete_category(db: Session, name: str, fallback_name: str) -> int:
+    """Delete a category and return the number of its mods moved to ``fallback_name``.
+
+    Mods that still belong to another category keep only those categories.
+    """
+    if name == fallback_name:
+        raise ValueError("The default category cannot be deleted")
+    category_pk = db.scalar(select(Category.id).where(Category.name == name))
+    if category_pk is None:
+        raise NotFoundError(name)
+    fallback_pk = ensure_category(db, fallback_name)
+
+    try:
+        members = list(db.scalars(select(mod_category.c.mod_id).where(mod_category.c.category_id == category_pk)))
+        db.execute(delete(mod_category).where(mod_category.c.category_id == category_pk))
+        db.execute(delete(Category).where(Category.id == category_pk))
+        still_linked: set[int] = set()
+        for start in range(0, len(members), QUERY_CHUNK_SIZE):
+            chunk = members[start : start + QUERY_CHUNK_SIZE]
+            still_linked.update(db.scalars(select(mod_category.c.mod_id).where(mod_category.c.mod_id.in_(chunk))))
+        orphaned = [mod_pk for mod_pk in members if mod_pk not in still_linked]
+        if orphaned:
+            db.execute(insert(mod_category), [{"mod_id": mod_pk, "category_id": fallback_pk} for mod_pk in orphaned])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(orphaned)
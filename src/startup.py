@@ -0,0 +1,73 @@
+"""Start-up timings for ``--profile-startup``.
+
+The profiler marks the steps between the interpreter starting and the catalog
+being shown: the module imports, the ``QApplication``, the main window, its
+first paint and the background catalog load. The report also counts the
+modules each step imported, so an import that creeps back onto the start-up
+path shows up. ``python -X importtime src/main.py`` breaks the imports down
+per module.
+
+Only the standard library is used, so importing this module costs nothing.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+PROFILE_STARTUP_FLAG = "--profile-startup"
+STARTUP_REPORT = Path("startup-profile.txt")
+
+
+def process_age() -> float | None:
+    """Seconds since this process started, on systems with ``/proc``."""
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name may contain spaces, so fields are counted after its closing parenthesis
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfiler:
+    def __init__(self):
+        # Interpreter start-up and the imports of the main module, measured before the first mark
+        self.before_main = process_age()
+        self.marks: list[tuple[str, float, int]] = [("main", time.perf_counter(), len(sys.modules))]
+        self.finished = False
+
+    def mark(self, name: str):
+        self.marks.append((name, time.perf_counter(), len(sys.modules)))
+
+    def report(self) -> str:
+        lines = ["Startup profile"]
+        if self.before_main is not None:
+            lines.append(f"{'interpreter and imports':<24} {self.before_main * 1000:8.1f} ms")
+        offset = self.before_main or 0.0
+        _, start, modules = self.marks[0]
+        previous = start
+        for name, at, loaded in self.marks[1:]:
+            lines.append(
+                f"{name:<24} {(at - previous) * 1000:8.1f} ms"
+                f"  at {(offset + at - start) * 1000:8.1f} ms  {loaded - modules:+5d} modules"
+            )
+            previous, modules = at, loaded
+        return "\n".join(lines)
+
+    def finish(self, name: str, report_path: Path = STARTUP_REPORT):
+        """Record the last step and print the report; later calls are ignored."""
+        if self.finished:
+            return
+        self.finished = True
+        self.mark(name)
+        report = self.report()
+        # Windowed builds have no stderr
+        if sys.stderr:
+            print(report, file=sys.stderr)
+        try:
+            report_path.write_text(report + "\n", encoding="utf-8")
+        except OSError:
+            pass
@@ -0,0 +1,145 @@
+"""Content-addressed storage for mod jars.
+
+Jars are stored once in the mods folder as ``<sha256>.jar`` and each ``Mod`` row
+points at its blob through ``Mod.sha256``. ``Mod.filename`` only names the jar
+when it is exported, so identical jars imported under different names share a
+single blob and renaming a mod never touches the filesystem.
+
+Rows created before the store existed have no hash and still point at
+``mods/<filename>``; they are moved into the store with ``adopt`` the next time
+they are saved.
+
+Blobs are written before the row that references them is committed. If the
+commit fails, ``release`` removes the blob again unless another mod uses it,
+and a legacy jar is only deleted once its row points at the blob.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from hashing import sha256_file
+
+# The models pull in SQLAlchemy, which the GUI only loads after its window is shown, so modules on
+# the start-up path (this one and hashing.py) import them for annotations only
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from models import Mod
+
+MODS_DIR = Path("mods")
+CHUNK_SIZE = 1024 * 1024
+
+
+def blob_name(sha256: str) -> str:
+    """Return the file name of a blob."""
+    return f"{sha256}.jar"
+
+
+def blob_path(sha256: str, mods_dir: Path = MODS_DIR) -> Path:
+    """Return the path of a blob."""
+    return mods_dir / blob_name(sha256)
+
+
+def disk_name(filename: str, sha256: str | None) -> str:
+    """Return the name a mod's jar has inside the mods folder."""
+    return blob_name(sha256) if sha256 else filename
+
+
+def mod_path(mod: "Mod", mods_dir: Path = MODS_DIR) -> Path:
+    """Return the path of a mod's jar inside the mods folder."""
+    return mods_dir / disk_name(mod.filename, mod.sha256)
+
+
+def add_file(source_path: Path | str, mods_dir: Path = MODS_DIR) -> str:
+    """Copy a jar into the store and return its SHA-256.
+
+    The file is hashed while it is copied, so it is read only once. If a blob
+    with the same content already exists the copy is discarded.
+    """
+    mods_dir.mkdir(exist_ok=True)
+    digest = hashlib.sha256()
+    fd, temp_name = tempfile.mkstemp(prefix=".incoming-", dir=mods_dir)
+    try:
+        with open(source_path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+                dst.write(chunk)
+        shutil.copystat(source_path, temp_name)
+        sha256 = digest.hexdigest()
+        target_path = blob_path(sha256, mods_dir)
+        if target_path.exists():
+            os.unlink(temp_name)
+        else:
+            os.replace(temp_name, target_path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+    return sha256
+
+
+def copy_blob(source_path: Path | str, sha256: str, mods_dir: Path = MODS_DIR) -> bool:
+    """Copy a jar whose SHA-256 is already known into the store.
+
+    Returns False without copying if the blob already exists.
+    """
+    target_path = blob_path(sha256, mods_dir)
+    if target_path.exists():
+        return False
+    mods_dir.mkdir(exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=".incoming-", dir=mods_dir)
+    os.close(fd)
+    try:
+        shutil.copy2(source_path, temp_name)
+        os.replace(temp_name, target_path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+    return True
+
+
+def adopt(filename: str, mods_dir: Path = MODS_DIR) -> str:
+    """Copy a legacy ``mods/<filename>`` jar into the store and return its SHA-256.
+
+    The legacy jar is left in place; delete it with ``drop_legacy`` after the
+    row that points at the blob has been committed.
+    """
+    legacy_path = mods_dir / filename
+    sha256 = sha256_file(legacy_path)
+    copy_blob(legacy_path, sha256, mods_dir)
+    return sha256
+
+
+def drop_legacy(filename: str, mods_dir: Path = MODS_DIR):
+    """Delete a legacy jar that has been adopted into the store."""
+    (mods_dir / filename).unlink(missing_ok=True)
+
+
+def release(db: "Session", sha256: str | None, mods_dir: Path = MODS_DIR) -> bool:
+    """Delete a blob once no mod references it any more.
+
+    Must be called after the referencing row has been deleted and flushed.
+    Returns True if the blob was removed.
+    """
+    if not sha256:
+        return False
+    from models import Mod
+
+    if db.query(Mod.id).filter(Mod.sha256 == sha256).first():
+        return False
+    path = blob_path(sha256, mods_dir)
+    if path.exists():
+        path.unlink()
+        return True
+    return False
+
+
+def verify(sha256: str, mods_dir: Path = MODS_DIR) -> bool:
+    """Check that a blob exists and its content still matches its key."""
+    path = blob_path(sha256, mods_dir)
+    return path.exists() and sha256_file(path) == sha256
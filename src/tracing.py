@@ -0,0 +1,181 @@
+"""Timing spans for user actions.
+
+``span`` times a block of code. Spans opened inside another span on the same
+thread become its children, and when an outermost span ends the whole tree is
+written as one JSON line to a rotating log and handed to the listeners, so the
+main window can summarize it in the status bar.
+
+Work timed on another thread is handed back with ``record_span``, which adds it
+to the span open on the calling thread, so listeners only ever run on the
+thread that opened the outermost span.
+
+Tracing is off unless ``MMDM_TRACE=1`` is set or ``"trace"`` is true in the
+config; ``span`` then returns a shared no-op context manager.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+TRACE_LOG = Path("logs") / "mmdm-trace.jsonl"
+MAX_LOG_BYTES = 1 << 20
+LOG_BACKUPS = 5
+
+
+@dataclass
+class Span:
+    """One timed block and the spans opened inside it."""
+
+    name: str
+    attrs: dict = field(default_factory=dict)
+    start: float = 0.0
+    duration_ms: float = 0.0
+    children: list["Span"] = field(default_factory=list)
+    error: str | None = None
+
+    def set(self, **attrs):
+        """Attach values such as row counts to the span."""
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        data = {"name": self.name, "duration_ms": round(self.duration_ms, 3)}
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.error:
+            data["error"] = self.error
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+    def __enter__(self) -> "Span":
+        tracer._push(self)
+        for hook in tracer.hooks:
+            hook.on_span_enter(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Hooks run outside the measured time
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        for hook in reversed(tracer.hooks):
+            hook.on_span_exit(self)
+        tracer._pop(self)
+        return False
+
+
+class _NullSpan:
+    """Stands in for ``Span`` while tracing is disabled."""
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.listeners: list[Callable[[Span], None]] = []
+        # Objects with on_span_enter(span) and on_span_exit(span), such as the memory profiler
+        self.hooks: list = []
+        self._local = threading.local()
+        self._logger: logging.Logger | None = None
+
+    def enable(self, log_path: Path = TRACE_LOG, max_bytes: int = MAX_LOG_BYTES, backups: int = LOG_BACKUPS):
+        if self.enabled:
+            return
+        logger = logging.getLogger("mmdm.trace")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if log_path:
+            try:
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            except OSError:
+                pass  # Spans still reach the listeners without a log file
+            else:
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+        self._logger = logger
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self._logger:
+            for handler in list(self._logger.handlers):
+                self._logger.removeHandler(handler)
+                handler.close()
+            self._logger = None
+
+    def span(self, name: str, **attrs) -> Span | _NullSpan:
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(name, attrs)
+
+    def record(self, name: str, duration_ms: float, **attrs):
+        """Add an already measured step as a child of the span open on this thread."""
+        stack = self._local.__dict__.get("stack")
+        if self.enabled and stack:
+            stack[-1].children.append(Span(name, attrs, duration_ms=duration_ms))
+
+    def _push(self, span: Span):
+        stack = self._local.__dict__.setdefault("stack", [])
+        if stack:
+            stack[-1].children.append(span)
+        stack.append(span)
+
+    def _pop(self, span: Span):
+        stack = self._local.stack
+        stack.pop()
+        if stack:
+            return
+        if self._logger:
+            entry = {"time": datetime.now().isoformat(timespec="milliseconds"), **span.to_dict()}
+            self._logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+        for listener in self.listeners:
+            listener(span)
+
+
+tracer = Tracer()
+
+
+def span(name: str, **attrs) -> Span | _NullSpan:
+    """Time the enclosed block as ``name``; a no-op while tracing is disabled."""
+    return tracer.span(name, **attrs)
+
+
+def record_span(name: str, duration_ms: float, **attrs):
+    """Record a step timed elsewhere, such as on a worker thread, in the current span."""
+    tracer.record(name, duration_ms, **attrs)
+
+
+def enable_tracing(log_path: Path = TRACE_LOG) -> Tracer:
+    """Start recording spans to the rotating log at ``log_path``."""
+    tracer.enable(log_path)
+    return tracer
+
+
+def format_summary(root: Span, limit: int = 3) -> str:
+    """One line naming a span and its slowest children, e.g. for a status bar."""
+    slowest = sorted(root.children, key=lambda child: child.duration_ms, reverse=True)[:limit]
+    summary = f"{root.name} {root.duration_ms:.0f} ms"
+    if "retained_kb" in root.attrs:
+        summary += f", {root.attrs['retained_kb']:+} KB retained"
+    if slowest:
+        summary += " (" + ", ".join(f"{child.name} {child.duration_ms:.0f} ms" for child in slowest) + ")"
+    return summary
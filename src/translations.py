@@ -8,6 +8,7 @@ TRANSLATIONS = {
         "add_category_title": "Add Category",
         "edit_category_title": "Edit Category",
         "manage_categories_title": "Manage Categories",
+        "reconcile_title": "Reconcile Mods Folder",
         # Menu items
         "menu_file": "File",
         "menu_manage": "Manage",
@@ -15,26 +16,49 @@ TRANSLATIONS = {
         "menu_add_mod": "Add Mod",
         "menu_edit_mod": "Edit Mod",
         "menu_delete_mod": "Delete Mod",
+        "menu_import_folder": "Import Mods Folder",
+        "menu_create_snapshot": "Create Snapshot",
+        "menu_restore_snapshot": "Restore Snapshot...",
+        "menu_compress_snapshots": "Compress Snapshots",
         "menu_exit": "Exit",
         "menu_add_category": "Add Category",
         "menu_manage_categories": "Manage Categories",
+        "menu_verify_files": "Verify Mod Files",
+        "menu_reconcile": "Reconcile Mods Folder",
+        "menu_sql_profile": "SQL Profile",
+        "menu_memory_report": "Memory Report",
         "menu_export": "Export",
         "menu_export_client": "Export Client Mods",
         "menu_export_server": "Export Server Mods",
+        "menu_export_client_delta": "Export Client Delta Pack",
+        "menu_export_server_delta": "Export Server Delta Pack",
         "menu_export_json": "Export to JSON",
         "menu_export_dep_tree": "Export Dependency Tree",
         "menu_import_json": "Import from JSON",
+        "menu_compare_catalogs": "Compare Catalogs...",
         "menu_about": "About",
         # Buttons
         "button_browse": "Browse...",
         "button_save": "Save",
         "button_cancel": "Cancel",
         "button_close": "Close",
+        "button_refresh": "Refresh",
+        "button_reset": "Reset",
+        "button_save_report": "Save Report...",
+        "title_sql_profile": "SQL Profile",
+        "msg_sql_profile_empty": "No statements recorded yet.",
+        "msg_last_action": "Last action: {}",
+        "title_memory_report": "Memory Report",
+        "msg_memory_report_empty": "No operations measured yet.",
+        "msg_memory_report_note": "Retained memory is measured after garbage collection; Qt widgets only show in RSS.",
+        "msg_slow_query_log": "Statements slower than {} ms are logged with their query plan to {}",
         "button_add": "Add",
         "button_edit": "Edit",
         "button_delete": "Delete",
         "button_expand_deps": "Expand Dependencies",
         "button_collapse_deps": "Collapse Dependencies",
+        "button_delete_orphans": "Delete Orphaned Files",
+        "button_remove_missing": "Remove Mods Without Files",
         # Labels
         "label_module_name": "Mod Name:",
         "label_module_file": "Mod File:",
@@ -48,6 +72,8 @@ TRANSLATIONS = {
         "label_uncategorized": "Default",
         "label_filter_category": "Filter by Category:",
         "label_all_categories": "All Categories",
+        "label_orphaned_files": "Files not used by any mod:",
+        "label_missing_mods": "Mods whose file is missing:",
         "msg_cannot_delete_uncategorized": "Cannot delete the Default category",
         "msg_cannot_edit_uncategorized": "Cannot edit the Default category",
         "msg_category_exists": "Category '{}' already exists",
@@ -67,10 +93,10 @@ TRANSLATIONS = {
         # Messages
         "msg_ready": "Ready",
         "msg_total_mods": "Total {} mods",
+        "msg_loading_catalog": "Loading mods...",
         "msg_filtered_mods": "Showing {} mods",
         "msg_select_module": "Please select a mod",
         "msg_select_category": "Please select a category",
-        "msg_unable_get_name": "Unable to get mod name",
         "msg_name_empty": "Mod name is empty",
         "msg_module_not_found": "Mod not found",
         "msg_unable_delete": 'Unable to delete mod "{}", because the following mods depend on it:\n{}',
@@ -81,6 +107,7 @@ TRANSLATIONS = {
         "msg_error_delete_file": "Error deleting file: {}",
         "msg_name_file_empty": "Mod name and file name cannot be empty",
         "msg_file_exists": "File {} already exists",
+        "msg_mod_exists": "Mod '{}' already exists",
         "msg_error_rename_file": "Error renaming file: {}",
         "msg_choose_module_file": "Please choose mod file",
         "msg_error_copy_file": "Error copying file: {}",
@@ -88,12 +115,56 @@ TRANSLATIONS = {
         "msg_export_failed": "Failed to export mods: {}",
         "msg_no_mods_found": "No {} mods found.",
         "msg_json_export_success": "Successfully exported data to {}",
+        "msg_manifest_failed": "Failed to write pack manifest: {}",
+        "msg_delta_export_success": "Exported delta pack to {}\nAdded: {}, Changed: {}, Removed: {}",
+        "msg_delta_export_failed": "Failed to export delta pack: {}",
+        "msg_verifying_files": "Verifying mod files...",
+        "msg_verify_summary": "OK: {}, Corrupted: {}, Missing: {}, Without checksum: {}",
+        "msg_verify_corrupted": "Corrupted files: {}",
+        "msg_verify_missing": "Missing files: {}",
+        "msg_verify_failed": "Failed to verify mod files: {}",
+        "msg_folder_import_summary": "Imported: {}, Skipped (already in catalog): {}, Failed: {}",
+        "msg_folder_import_errors": "Failed files: {}",
+        "msg_folder_import_failed": "Failed to import mods folder: {}",
+        "msg_file_missing": "File is missing from the mods folder",
+        "msg_file_modified": "File was modified outside the application",
+        "msg_mods_folder_changed": "Mods folder changed: {} added, {} removed, {} modified ({} untracked)",
+        "msg_confirm_delete_orphans": "Are you sure you want to delete {} orphaned files?",
+        "msg_confirm_remove_missing": "Are you sure you want to remove {} mods whose file is missing?\n"
+        + "Note: Mods that other mods still depend on are kept.",
+        "msg_missing_kept": "{} mods were kept because other mods depend on them:\n{}",
         "msg_json_export_failed": "Failed to export data: {}",
         "msg_dep_tree_export_success": "Successfully exported dependency tree to {}",
         "msg_dep_tree_export_failed": "Failed to export dependency tree: {}",
         "msg_json_import_success": "Successfully imported {} categories and {} mods",
         "msg_json_import_failed": "Failed to import data: {}",
-        "msg_json_import_confirm": "Importing will replace all existing data. Continue?",
+        "msg_json_import_confirm": "Replace all existing data, or merge only the differences into the catalog?",
+        "msg_importing_json": "Importing catalog...",
+        "title_snapshot": "Database Snapshot",
+        "dialog_choose_catalogs": "Choose One or Two Catalogs to Compare",
+        "msg_choose_one_or_two_catalogs": "Please choose exactly one or two catalogs to compare",
+        "dialog_catalog_filter": "Catalogs (*.json *.jsonl *.db *.db.gz);;All Files (*.*)",
+        "label_current_catalog": "the current catalog",
+        "msg_compare_summary": "{} → {}:\n{} added, {} removed, {} changed, {} recategorized, {} dependency changes",
+        "msg_catalogs_identical": "The catalogs are identical",
+        "msg_compare_failed": "Failed to compare catalogs: {}",
+        "msg_creating_snapshot": "Creating snapshot...",
+        "msg_restoring_snapshot": "Restoring snapshot...",
+        "msg_snapshot_created": "Snapshot saved to {}",
+        "msg_snapshot_failed": "Failed to create snapshot: {}",
+        "msg_snapshot_restored": "Snapshot restored",
+        "msg_restore_failed": "Failed to restore snapshot: {}",
+        "msg_confirm_restore_snapshot": "Restoring replaces all data. The current data is snapshotted first. Continue?",
+        "dialog_choose_snapshot": "Choose Snapshot",
+        "dialog_snapshot_filter": "Snapshots (*.db *.db.gz);;All Files (*.*)",
+        "button_replace": "Replace",
+        "button_merge": "Merge",
+        "msg_merge_summary": "Merge complete: {} added, {} updated, {} removed, {} unchanged",
+        "label_merge_added": "Added mods:",
+        "label_merge_updated": "Updated mods:",
+        "label_merge_removed": "Removed mods:",
+        "label_merge_added_categories": "Added categories:",
+        "label_merge_removed_categories": "Removed categories:",
         "msg_yes": "Yes",
         "msg_no": "No",
         # Dialog titles
@@ -106,12 +177,18 @@ TRANSLATIONS = {
         "title_confirm_import": "Confirm Import",
         # File dialog
         "dialog_choose_mod": "Choose Mod File",
+        "dialog_choose_mods_folder": "Choose Mods Folder",
         "dialog_mod_filter": "Minecraft Mod Files (*.jar);;All Files (*.*)",
         "dialog_json_export": "Export Data to JSON",
         "dialog_json_import": "Import Data from JSON",
         "dialog_json_filter": "JSON Files (*.json);;All Files (*.*)",
+        "dialog_json_import_filter": "JSON Files (*.json *.jsonl);;All Files (*.*)",
+        "dialog_json_export_filter": "JSON Files (*.json);;Compact JSON Files (*.json);;JSON Lines Files (*.jsonl)",
         "dialog_dep_tree_export": "Export Dependency Tree",
         "dialog_txt_filter": "Text Files (*.txt);;All Files (*.*)",
+        "dialog_choose_manifest": "Choose Previous Pack Manifest",
+        "dialog_delta_export": "Export Delta Pack",
+        "dialog_zip_filter": "ZIP Archives (*.zip);;All Files (*.*)",
         "about_title": "About Manual MMDM",
         "about_content": """<h3>Manual Minecraft Dependency Manager (MMDM)</h3>
 
@@ -129,6 +206,7 @@ Version: 1.1.1<br><br>
         "add_category_title": "新增分類",
         "edit_category_title": "編輯分類",
         "manage_categories_title": "管理分類",
+        "reconcile_title": "核對模組資料夾",
         # Menu items
         "menu_file": "檔案",
         "menu_manage": "管理",
@@ -136,26 +214,49 @@ Version: 1.1.1<br><br>
         "menu_add_mod": "新增模組",
         "menu_edit_mod": "編輯模組",
         "menu_delete_mod": "刪除模組",
+        "menu_import_folder": "匯入模組資料夾",
+        "menu_create_snapshot": "建立快照",
+        "menu_restore_snapshot": "還原快照...",
+        "menu_compress_snapshots": "壓縮快照",
         "menu_exit": "結束",
         "menu_add_category": "新增分類",
         "menu_manage_categories": "管理分類",
+        "menu_verify_files": "驗證模組檔案",
+        "menu_reconcile": "核對模組資料夾",
+        "menu_sql_profile": "SQL 分析",
+        "menu_memory_report": "記憶體報告",
         "menu_export": "匯出",
         "menu_export_client": "匯出客戶端模組",
         "menu_export_server": "匯出伺服端模組",
+        "menu_export_client_delta": "匯出客戶端差異更新包",
+        "menu_export_server_delta": "匯出伺服端差異更新包",
         "menu_export_json": "匯出至JSON",
         "menu_export_dep_tree": "匯出依賴樹",
         "menu_import_json": "從JSON匯入",
+        "menu_compare_catalogs": "比較目錄...",
         "menu_about": "關於",
         # Buttons
         "button_browse": "瀏覽...",
         "button_save": "儲存",
         "button_cancel": "取消",
         "button_close": "關閉",
+        "button_refresh": "重新整理",
+        "button_reset": "重設",
+        "button_save_report": "儲存報告...",
+        "title_sql_profile": "SQL 分析",
+        "msg_sql_profile_empty": "尚未記錄任何陳述式。",
+        "msg_last_action": "上次操作：{}",
+        "title_memory_report": "記憶體報告",
+        "msg_memory_report_empty": "尚未量測任何操作。",
+        "msg_memory_report_note": "保留的記憶體於垃圾回收後量測；Qt 元件只會反映在 RSS。",
+        "msg_slow_query_log": "超過 {} 毫秒的陳述式會連同查詢計畫記錄到 {}",
         "button_add": "新增",
         "button_edit": "編輯",
         "button_delete": "刪除",
         "button_expand_deps": "展開依賴項",
         "button_collapse_deps": "折疊依賴項",
+        "button_delete_orphans": "刪除孤立檔案",
+        "button_remove_missing": "移除無檔案的模組",
         # Labels
         "label_module_name": "模組名稱:",
         "label_module_file": "模組檔案:",
@@ -169,6 +270,8 @@ Version: 1.1.1<br><br>
         "label_uncategorized": "Default",
         "label_filter_category": "依分類篩選:",
         "label_all_categories": "所有分類",
+        "label_orphaned_files": "未被任何模組使用的檔案:",
+        "label_missing_mods": "檔案遺失的模組:",
         "msg_cannot_delete_uncategorized": "無法刪除「Default」分類",
         "msg_cannot_edit_uncategorized": "無法編輯「Default」分類",
         "msg_category_exists": "分類「{}」已經存在",
@@ -188,10 +291,10 @@ Version: 1.1.1<br><br>
         # Messages
         "msg_ready": "就緒",
         "msg_total_mods": "共 {} 個模組",
+        "msg_loading_catalog": "正在載入模組...",
         "msg_filtered_mods": "顯示 {} 個模組",
         "msg_select_module": "請先選擇一個模組",
         "msg_select_category": "請先選擇一個分類",
-        "msg_unable_get_name": "無法獲取模組名稱",
         "msg_name_empty": "模組名稱為空",
         "msg_module_not_found": "找不到選擇的模組",
         "msg_unable_delete": "無法刪除模組「{}」，因為以下模組依賴它：\n{}",
@@ -200,6 +303,7 @@ Version: 1.1.1<br><br>
         "msg_error_delete_file": "刪除檔案時發生錯誤：{}",
         "msg_name_file_empty": "模組名稱和檔案名稱不能為空",
         "msg_file_exists": "檔案 {} 已經存在",
+        "msg_mod_exists": "模組「{}」已經存在",
         "msg_error_rename_file": "重新命名檔案時發生錯誤：{}",
         "msg_choose_module_file": "請選擇模組檔案",
         "msg_error_copy_file": "複製檔案時發生錯誤：{}",
@@ -207,12 +311,55 @@ Version: 1.1.1<br><br>
         "msg_export_failed": "匯出模組失敗：{}",
         "msg_no_mods_found": "找不到 {} 模組。",
         "msg_json_export_success": "成功匯出資料至 {}",
+        "msg_manifest_failed": "寫入更新包清單失敗：{}",
+        "msg_delta_export_success": "成功匯出差異更新包至 {}\n新增：{}，變更：{}，移除：{}",
+        "msg_delta_export_failed": "匯出差異更新包失敗：{}",
+        "msg_verifying_files": "正在驗證模組檔案...",
+        "msg_verify_summary": "正常：{}，損毀：{}，遺失：{}，無校驗碼：{}",
+        "msg_verify_corrupted": "損毀的檔案：{}",
+        "msg_verify_missing": "遺失的檔案：{}",
+        "msg_verify_failed": "驗證模組檔案失敗：{}",
+        "msg_folder_import_summary": "已匯入：{}，已略過（已存在）：{}，失敗：{}",
+        "msg_folder_import_errors": "失敗的檔案：{}",
+        "msg_folder_import_failed": "匯入模組資料夾失敗：{}",
+        "msg_file_missing": "模組資料夾中找不到此檔案",
+        "msg_file_modified": "檔案已在程式外被修改",
+        "msg_mods_folder_changed": "模組資料夾已變更：新增 {}，移除 {}，修改 {}（{} 個未追蹤）",
+        "msg_confirm_delete_orphans": "確定要刪除 {} 個孤立檔案嗎？",
+        "msg_confirm_remove_missing": "確定要移除 {} 個檔案遺失的模組嗎？\n注意：仍被其他模組依賴的模組會保留。",
+        "msg_missing_kept": "有 {} 個模組因仍被其他模組依賴而保留：\n{}",
         "msg_json_export_failed": "匯出資料失敗：{}",
         "msg_dep_tree_export_success": "成功匯出依賴樹至 {}",
         "msg_dep_tree_export_failed": "匯出依賴樹失敗：{}",
         "msg_json_import_success": "成功匯入 {} 個分類和 {} 個模組",
         "msg_json_import_failed": "匯入資料失敗：{}",
-        "msg_json_import_confirm": "匯入將會取代所有現有資料。是否繼續？",
+        "msg_json_import_confirm": "要以檔案取代所有現有資料，還是只將差異合併到目錄中？",
+        "msg_importing_json": "正在匯入目錄...",
+        "title_snapshot": "資料庫快照",
+        "dialog_choose_catalogs": "選擇一或兩個要比較的目錄",
+        "msg_choose_one_or_two_catalogs": "請選擇一或兩個要比較的目錄",
+        "dialog_catalog_filter": "目錄 (*.json *.jsonl *.db *.db.gz);;所有檔案 (*.*)",
+        "label_current_catalog": "目前的目錄",
+        "msg_compare_summary": "從 {} 到 {}：\n新增 {} 個模組、移除 {} 個、變更 {} 個、{} 個變更分類、{} 項依賴變更",
+        "msg_catalogs_identical": "兩個目錄完全相同",
+        "msg_compare_failed": "比較目錄失敗：{}",
+        "msg_creating_snapshot": "正在建立快照...",
+        "msg_restoring_snapshot": "正在還原快照...",
+        "msg_snapshot_created": "快照已儲存至 {}",
+        "msg_snapshot_failed": "建立快照失敗：{}",
+        "msg_snapshot_restored": "快照已還原",
+        "msg_restore_failed": "還原快照失敗：{}",
+        "msg_confirm_restore_snapshot": "還原將會取代所有現有資料，並會先為現有資料建立快照。是否繼續？",
+        "dialog_choose_snapshot": "選擇快照",
+        "dialog_snapshot_filter": "快照 (*.db *.db.gz);;所有檔案 (*.*)",
+        "button_replace": "取代",
+        "button_merge": "合併",
+        "msg_merge_summary": "合併完成：新增 {} 個、更新 {} 個、移除 {} 個、未變更 {} 個",
+        "label_merge_added": "新增的模組：",
+        "label_merge_updated": "更新的模組：",
+        "label_merge_removed": "移除的模組：",
+        "label_merge_added_categories": "新增的分類：",
+        "label_merge_removed_categories": "移除的分類：",
         "msg_yes": "是",
         "msg_no": "否",
         # Dialog titles
@@ -225,12 +372,18 @@ Version: 1.1.1<br><br>
         "title_confirm_import": "確認匯入",
         # File dialog
         "dialog_choose_mod": "選擇模組檔案",
+        "dialog_choose_mods_folder": "選擇模組資料夾",
         "dialog_mod_filter": "Minecraft 模組檔案 (*.jar);;所有檔案 (*.*)",
         "dialog_json_export": "匯出資料至JSON",
         "dialog_json_import": "從JSON匯入資料",
         "dialog_json_filter": "JSON檔案 (*.json);;所有檔案 (*.*)",
+        "dialog_json_import_filter": "JSON檔案 (*.json *.jsonl);;所有檔案 (*.*)",
+        "dialog_json_export_filter": "JSON檔案 (*.json);;精簡 JSON檔案 (*.json);;JSON Lines 檔案 (*.jsonl)",
         "dialog_dep_tree_export": "匯出依賴樹",
         "dialog_txt_filter": "文字檔案 (*.txt);;所有檔案 (*.*)",
+        "dialog_choose_manifest": "選擇上一版更新包清單",
+        "dialog_delta_export": "匯出差異更新包",
+        "dialog_zip_filter": "ZIP 壓縮檔 (*.zip);;所有檔案 (*.*)",
         "about_title": "關於 Manual MMDM",
         "about_content": """<h3>Manual Minecraft Dependency Manager (MMDM)</h3>
 
@@ -0,0 +1,95 @@
+"""Watch the mods folder for changes made outside the application.
+
+QFileSystemWatcher (inotify on Linux) only reports that the directory or a
+file changed, so each notification is turned into added/removed/modified jar
+names by diffing a ``stat`` snapshot of the folder. No file content is read.
+The directory watch sees jars being added, removed or renamed; writes to an
+existing jar only reach the watch on that jar, so every jar is watched too. If
+the platform watcher cannot take the folder or some of its jars, for example
+past the inotify watch limit, the same diff also runs on a polling timer.
+"""
+
+import os
+from pathlib import Path
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+import store
+
+DEBOUNCE_MS = 200
+POLL_INTERVAL_MS = 5000
+# Jars put under watch per event loop turn; adding a watch costs tens of microseconds
+WATCH_BATCH = 1000
+
+
+def snapshot(mods_dir: Path = store.MODS_DIR) -> dict[str, tuple[int, int]]:
+    """Return {jar name: (size, mtime_ns)} for the jars in the mods folder."""
+    jars = {}
+    try:
+        with os.scandir(mods_dir) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(".jar") and entry.is_file():
+                    stat = entry.stat()
+                    jars[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return jars
+
+
+class ModsWatcher(QObject):
+    """Emits the jar names that were added, removed or modified in the mods folder."""
+
+    changed = pyqtSignal(list, list, list)
+
+    def __init__(self, mods_dir: Path = store.MODS_DIR, parent: QObject | None = None):
+        super().__init__(parent)
+        self.mods_dir = mods_dir
+        self.mods_dir.mkdir(exist_ok=True)
+        self.jars = snapshot(self.mods_dir)
+
+        # Coalesce bursts of notifications, e.g. while a jar is being copied
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.rescan)
+
+        # Fall back to polling when the platform watcher is unavailable
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.rescan)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(lambda _: self.debounce_timer.start())
+        self.watcher.fileChanged.connect(lambda _: self.debounce_timer.start())
+        if not self.watcher.addPath(str(self.mods_dir)):
+            self.poll_timer.start()
+        # The jars are watched from the first refresh or rescan, off the start-up path
+
+    def watch_jars(self):
+        """Watch the jars that are not watched yet, such as new or replaced ones."""
+        # A jar that was replaced drops out of files() and is watched again here
+        watched = set(self.watcher.files())
+        prefix = os.path.join(self.mods_dir, "")
+        paths = [prefix + name for name in self.jars if prefix + name not in watched]
+        if paths and self.watcher.addPaths(paths[:WATCH_BATCH]):
+            self.poll_timer.start()
+        elif len(paths) > WATCH_BATCH:
+            # Leave the event loop a turn between batches so a large folder does not freeze the window
+            QTimer.singleShot(0, self.watch_jars)
+
+    def refresh(self) -> set[str]:
+        """Take a new snapshot without emitting changes and return the jar names."""
+        self.jars = snapshot(self.mods_dir)
+        self.watch_jars()
+        return set(self.jars)
+
+    def rescan(self):
+        """Diff the folder against the last snapshot and emit any changes."""
+        current = snapshot(self.mods_dir)
+        added = [name for name in current if name not in self.jars]
+        removed = [name for name in self.jars if name not in current]
+        modified = [name for name, state in current.items() if name in self.jars and self.jars[name] != state]
+        self.jars = current
+        self.watch_jars()
+        if added or removed or modified:
+            self.changed.emit(added, removed, modified)
@@ -0,0 +1,135 @@
+import io
+import json
+
+import pytest
+
+from catalog_reader import CatalogFormatError, read_catalog
+
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1 << 16]
+
+CATALOG: dict[str, list[dict]] = {
+    "categories": [{"name": "Library"}, {"name": "圖書館"}, {"name": 'Quote " and \\ backslash'}],
+    "mods": [
+        {
+            "name": "Fabric API",
+            "filename": "fabric-api.jar",
+            "is_translated": False,
+            "client_required": True,
+            "server_required": True,
+            "sha256": "0" * 64,
+            "notes": None,
+            "categories": ["Library"],
+            "dependencies": [],
+        },
+        {
+            "name": "中文模組 🧱",
+            "filename": "chinese-mod.jar",
+            "is_translated": True,
+            "notes": "Line one\nLine two\ttabbed, é and \U0001f600",
+            "categories": ["圖書館", "Library"],
+            "dependencies": ["Fabric API"],
+        },
+    ],
+}
+
+
+def document(indent: int | None = 4, ensure_ascii: bool = False) -> bytes:
+    return json.dumps(CATALOG, indent=indent, ensure_ascii=ensure_ascii).encode()
+
+
+def json_lines(ensure_ascii: bool = False) -> bytes:
+    lines = [json.dumps({"type": "category", **record}, ensure_ascii=ensure_ascii) for record in CATALOG["categories"]]
+    lines += [json.dumps({"type": "mod", **record}, ensure_ascii=ensure_ascii) for record in CATALOG["mods"]]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def read(data: bytes, chunk_size: int) -> dict:
+    return read_catalog(io.BytesIO(data), chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("indent", [4, None])
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_document_matches_json_load(chunk_size, indent, ensure_ascii):
+    data = document(indent, ensure_ascii)
+    assert read(data, chunk_size) == json.load(io.BytesIO(data))
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_json_lines_match_document(chunk_size, ensure_ascii):
+    assert read(json_lines(ensure_ascii), chunk_size) == CATALOG
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_byte_order_mark_is_skipped(chunk_size):
+    assert read(b"\xef\xbb\xbf" + document(), chunk_size) == CATALOG
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_unknown_keys_are_skipped(chunk_size):
+    data = {"version": 1234567890, "exported": {"by": ["manual-mmdm", 1.5e10, None]}, **CATALOG, "extra": -0.25}
+    assert read(json.dumps(data).encode(), chunk_size) == CATALOG
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_empty_catalogs(chunk_size):
+    expected: dict[str, list[dict]] = {"categories": [], "mods": []}
+    assert read(b"{}", chunk_size) == expected
+    assert read(b' { "categories" : [ ] , "mods" : [] } \n', chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+@pytest.mark.parametrize("data", [document(), document(None), document(ensure_ascii=True)])
+def test_truncated_document_is_rejected(chunk_size, data):
+    # Every strict prefix, including cuts inside escapes, numbers and multi-byte characters
+    for end in range(len(data)):
+        with pytest.raises(CatalogFormatError):
+            read(data[:end], chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_truncated_json_line_is_rejected(chunk_size):
+    data = json_lines()
+    last_line = data.rstrip(b"\n").rfind(b"\n") + 1
+    for end in range(last_line + 1, len(data) - 1):
+        with pytest.raises(CatalogFormatError):
+            read(data[:end], chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b" \n",
+        b"[]",
+        b'{"mods": {}}',
+        b'{"mods": [] "categories": []}',
+        b'{"mods": [],}',
+        b'{"mods": [1]}',
+        b'{"mods": []} {}',
+        b'{"categories": [{"name": ""}]}',
+        b'{"categories": [{"name": "A"}, {"title": "B"}]}',
+        b'{"mods": [{"name": "A"}]}',
+        b'{"mods": [{"name": "A", "filename": "a.jar", "client_required": "yes"}]}',
+        b'{"mods": [{"name": "A", "filename": "a.jar", "dependencies": "B"}]}',
+        b'{"mods": [{"name": "A", "filename": "a.jar", "categories": [1]}]}',
+        b'{"mods": [{"name": "A", "filename": "a.jar", "notes": 1}]}',
+        b'{"categories": [{"name": "bad \\x escape"}]}',
+        b'{"categories": [{"name": "A"}], "mods": [NaN1]}',
+        b'{"type": "category", "name": "A"}\n{"type": "pack", "name": "B"}\n',
+        b'{"type": "category", "name": "A"}\n[1]\n',
+        b'{"type": "mod", "name": "A"}\n',
+        b'{"type": "category", "name": "A"}\n{"type": "category", "name": "B"\n',
+    ],
+)
+def test_invalid_catalog_is_rejected(chunk_size, data):
+    with pytest.raises(CatalogFormatError):
+        read(data, chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64])
+def test_invalid_utf8_is_rejected(chunk_size):
+    with pytest.raises(CatalogFormatError):
+        read(b'{"categories": [{"name": "\xff"}]}', chunk_size)